@@ -0,0 +1,359 @@
+"""읽기 전용 JSON 조회 API (사이드카)
+
+pages/03-finally.py가 보여 주는 값(유형별 상위 k개 나라, 전 세계 평균, 나라별 프로필)을
+웹소켓 세션과 스크립트 rerun 없이 HTTP로 내려줍니다. 페이지와 같은 RankingIndex
+(mbti_data.IndexStore)를 읽으므로 데이터 파일이 바뀌면 API 응답도 함께 바뀝니다.
+
+- 응답은 (데이터 체크섬, 요청 경로+쿼리)별로 JSON과 gzip 본문을 한 번만 만들어 보관합니다.
+- ETag는 데이터 체크섬에서 만든 강한 ETag이고, If-None-Match가 맞으면 본문 없이 304를 돌려줍니다.
+- Accept-Encoding에 gzip이 있으면 미리 압축해 둔 본문을 보냅니다. (Vary: Accept-Encoding)
+- 유형/나라를 여러 개 받는 배치 조회를 지원합니다. HTTP/1.1 keep-alive를 씁니다.
+
+엔드포인트 (GET)
+    /v1/meta                                  체크섬, 컬럼(유형 + 성향 축/기질 그룹), 나라 수
+    /v1/top?types=INTJ,ENFP&k=5               유형별 상위 k개 나라와 전 세계 평균 (type=INTJ&type=ENFP도 가능)
+    /v1/mean?types=INTJ,E                     유형별 전 세계 평균 (types를 빼면 전체 컬럼)
+    /v1/profile?country=KOR&country=Japan    나라별 16개 유형 비율/순위/백분위/평균 대비 차이/표준점수
+                                              (나라 이름, ISO-3 코드, country_codes.ALIASES의 이름)
+    /healthz
+
+사용법 (저장소 루트에서):
+    python api_server.py                    # 0.0.0.0:8600에서 단독 실행 (데이터 파일 변경 감시 포함)
+    python api_server.py --port 8700 --host 127.0.0.1
+    MBTI_API_PORT=8600 streamlit run main.py  # Streamlit 프로세스 안에서 페이지와 같은 인덱스로 실행
+"""
+import argparse
+import gzip
+import json
+import logging
+import os
+import sys
+import threading
+from collections import OrderedDict, namedtuple
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlsplit
+
+import numpy as np
+
+import country_codes
+import metrics
+
+API_PORT = os.environ.get("MBTI_API_PORT")
+DEFAULT_PORT = 8600
+DEFAULT_K = 5
+# 보관할 응답 수 (체크섬이 바뀌면 모두 버립니다)
+RESPONSE_CACHE_SIZE = 4096
+# 이보다 작은 본문은 압축하지 않습니다. (gzip 헤더가 더 큼)
+GZIP_MIN_BYTES = 256
+# 데이터 파일 변경 확인 주기와 같은 시간만 캐시하고, 이후에는 ETag로 다시 확인합니다.
+MAX_AGE = 5
+# 비율은 float32로 저장되어 있으므로 이 자릿수로 반올림해 내보냅니다. (0.0896 -> 0.08959999680519104 방지)
+RATIO_DIGITS = 6
+
+logger = logging.getLogger(__name__)
+
+# body: JSON 본문, gzipped: gzip 본문 (작으면 None), etag: 강한 ETag (gzip 본문은 "-gz"를 붙임)
+Response = namedtuple("Response", ["status", "body", "gzipped", "etag"])
+
+
+class QueryError(ValueError):
+    """잘못된 질의 (400으로 응답)."""
+
+
+def _split(values) -> list:
+    """type=A&type=B 와 types=A,B 를 모두 받습니다."""
+    items = []
+    for value in values:
+        items.extend(v.strip() for v in value.split(",") if v.strip())
+    return items
+
+
+class Queries:
+    """RankingIndex 하나에 대한 조회 함수들. 결과는 JSON으로 바꿀 수 있는 dict입니다."""
+
+    def __init__(self, index):
+        self.index = index
+        self.checksum = index.checksum
+        self._countries = {}
+        for i, (name, code) in enumerate(zip(index.countries, index.iso3)):
+            self._countries[str(name).casefold()] = i
+            if code:
+                self._countries.setdefault(str(code).casefold(), i)
+
+    def _types(self, params, default=None) -> list:
+        types = _split(params.get("types", []) + params.get("type", []))
+        if not types:
+            if default is None:
+                raise QueryError("types 파라미터가 필요합니다.")
+            return list(default)
+        unknown = [t for t in types if t not in self.index.columns]
+        if unknown:
+            raise QueryError(f"알 수 없는 유형: {', '.join(unknown)}")
+        return types
+
+    def _row(self, country: str) -> int:
+        row = self._countries.get(country.strip().casefold())
+        if row is None:
+            code = country_codes.to_iso3(country)
+            row = self._countries.get(code.casefold()) if code else None
+        if row is None:
+            raise QueryError(f"알 수 없는 나라: {country}")
+        return row
+
+    def _k(self, params) -> int:
+        raw = params.get("k", [str(DEFAULT_K)])[-1]
+        try:
+            k = int(raw)
+        except ValueError:
+            raise QueryError(f"k는 정수여야 합니다: {raw}") from None
+        if k < 1:
+            raise QueryError("k는 1 이상이어야 합니다.")
+        return min(k, len(self.index.countries))
+
+    def meta(self, params) -> dict:
+        return {
+            "checksum": self.checksum,
+            "types": self.index.types,
+            "columns": self.index.columns,
+            "countries": len(self.index.countries),
+        }
+
+    def top(self, params) -> dict:
+        """유형별 상위 k개 나라. 미리 정렬해 둔 order 행렬의 앞 k행만 읽습니다."""
+        index = self.index
+        k = self._k(params)
+        results = {}
+        for mbti in self._types(params):
+            j = index.column(mbti)
+            rows = index.order[:k, j]
+            ratios = np.asarray(index.values[rows, j], dtype=np.float64)
+            results[mbti] = {
+                "mean": round(index.mean(mbti), RATIO_DIGITS),
+                "top": [
+                    {"rank": r + 1, "country": str(index.countries[i]), "iso3": str(index.iso3[i]), "ratio": round(float(v), RATIO_DIGITS)}
+                    for r, (i, v) in enumerate(zip(rows, ratios))
+                ],
+            }
+        return {"checksum": self.checksum, "k": k, "results": results}
+
+    def mean(self, params) -> dict:
+        types = self._types(params, default=self.index.columns)
+        return {"checksum": self.checksum, "means": {t: round(self.index.mean(t), RATIO_DIGITS) for t in types}}
+
+    def profile(self, params) -> dict:
+        """나라별 16개 유형 프로필 (RankingIndex.profile과 같은 값, 미리 계산한 행렬의 한 행)."""
+        index = self.index
+        countries = params.get("country", []) + params.get("countries", [])
+        if not countries:
+            raise QueryError("country 파라미터가 필요합니다.")
+        profiles = {}
+        for country in countries:
+            i = self._row(country)
+            values = np.asarray(index.type_values[i], dtype=np.float64)
+            deviation = values - index.type_means
+            profiles[str(index.countries[i])] = {
+                "iso3": str(index.iso3[i]),
+                "types": [
+                    {
+                        "type": mbti,
+                        "ratio": round(float(values[j]), RATIO_DIGITS),
+                        "rank": int(index.rank[i, j]),
+                        "percentile": float(index.percentile[i, j]),
+                        "deviation": round(float(deviation[j]), RATIO_DIGITS),
+                        "zscore": float(index.zscore[i, j]),
+                    }
+                    for j, mbti in enumerate(index.types)
+                ],
+            }
+        return {"checksum": self.checksum, "profiles": profiles}
+
+
+ROUTES = {
+    "/v1/meta": Queries.meta,
+    "/v1/top": Queries.top,
+    "/v1/mean": Queries.mean,
+    "/v1/profile": Queries.profile,
+}
+
+
+def _encode(status: int, payload: dict, etag: str) -> Response:
+    body = json.dumps(payload, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+    gzipped = gzip.compress(body, compresslevel=6, mtime=0) if len(body) >= GZIP_MIN_BYTES else None
+    return Response(status, body, gzipped, etag)
+
+
+class ApiApp:
+    """경로+쿼리를 응답으로 바꾸고, (체크섬, 경로+쿼리)별로 보관합니다."""
+
+    def __init__(self, current, cache_size: int = RESPONSE_CACHE_SIZE):
+        self.current = current  # 지금의 RankingIndex를 돌려주는 함수 (IndexStore.current)
+        self.cache_size = cache_size
+        self._queries = None
+        self._responses = OrderedDict()
+        self._lock = threading.Lock()
+
+    def queries(self) -> Queries:
+        index = self.current()
+        queries = self._queries
+        if queries is None or queries.index is not index:
+            with self._lock:
+                if self._queries is None or self._queries.index is not index:
+                    self._queries = Queries(index)
+                    self._responses.clear()  # 데이터가 바뀌면 이전 응답은 쓰지 않습니다.
+                queries = self._queries
+        return queries
+
+    def respond(self, target: str) -> Response:
+        queries = self.queries()
+        key = (queries.checksum, target)
+        with self._lock:
+            response = self._responses.get(key)
+            if response is not None:
+                self._responses.move_to_end(key)
+                return response
+        response = self._build(queries, target)
+        if response.status == 200:
+            with self._lock:
+                self._responses[key] = response
+                if len(self._responses) > self.cache_size:
+                    self._responses.popitem(last=False)
+        return response
+
+    def _build(self, queries: Queries, target: str) -> Response:
+        parts = urlsplit(target)
+        route = ROUTES.get(parts.path.rstrip("/") or "/")
+        if route is None:
+            return _encode(404, {"error": f"없는 경로입니다: {parts.path}", "routes": sorted(ROUTES)}, None)
+        try:
+            payload = route(queries, parse_qs(parts.query))
+        except QueryError as e:
+            return _encode(400, {"error": str(e)}, None)
+        # 같은 경로+쿼리의 응답은 데이터 체크섬에만 달려 있으므로 체크섬이 곧 강한 검증자입니다.
+        return _encode(200, payload, f'"{queries.checksum[:32]}"')
+
+
+def _etag_matches(header: str, etag: str) -> bool:
+    if not header or not etag:
+        return False
+    if header.strip() == "*":
+        return True
+    # If-None-Match는 약한 비교를 씁니다. (W/ 접두어 무시)
+    tags = [t.strip().removeprefix("W/") for t in header.split(",")]
+    return etag in tags
+
+
+class _ApiHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"  # keep-alive로 연결당 여러 요청을 받습니다.
+    disable_nagle_algorithm = True  # 헤더와 본문을 따로 쓰므로, 켜 두면 keep-alive 요청마다 ~40ms 지연(Nagle + delayed ACK)
+    app = None  # make_server가 채웁니다.
+
+    def do_GET(self):
+        self._handle(head=False)
+
+    def do_HEAD(self):
+        self._handle(head=True)
+
+    def _handle(self, head: bool):
+        if self.path.split("?")[0] == "/healthz":
+            self._send(200, b"ok", content_type="text/plain; charset=utf-8", head=head)
+            return
+        endpoint = self.path.split("?")[0].rstrip("/")
+        if endpoint not in ROUTES:
+            endpoint = "other"  # 지표 라벨 수가 늘지 않도록 모르는 경로는 하나로 셉니다.
+        try:
+            response = self.app.respond(self.path)
+        except Exception:
+            logger.exception("API 요청 처리 중 오류: %s", self.path)
+            metrics.API_REQUESTS.inc(endpoint=endpoint, status="500")
+            self._send(500, b'{"error":"internal error"}', head=head)
+            return
+        if response.status != 200:
+            metrics.API_REQUESTS.inc(endpoint=endpoint, status=str(response.status))
+            self._send(response.status, response.body, head=head)
+            return
+
+        gzip_ok = response.gzipped is not None and "gzip" in self.headers.get("Accept-Encoding", "")
+        etag = response.etag[:-1] + '-gz"' if gzip_ok else response.etag
+        headers = {
+            "ETag": etag,
+            "Cache-Control": f"public, max-age={MAX_AGE}",
+            "Vary": "Accept-Encoding",
+        }
+        if _etag_matches(self.headers.get("If-None-Match"), etag):
+            metrics.API_REQUESTS.inc(endpoint=endpoint, status="304")
+            self._send(304, b"", headers=headers, head=True)
+            return
+        metrics.API_REQUESTS.inc(endpoint=endpoint, status="200")
+        if gzip_ok:
+            headers["Content-Encoding"] = "gzip"
+        self._send(200, response.gzipped if gzip_ok else response.body, headers=headers, head=head)
+
+    def _send(self, status: int, body: bytes, content_type: str = "application/json; charset=utf-8",
+              headers: dict = None, head: bool = False):
+        self.send_response(status)
+        if status != 304:
+            self.send_header("Content-Type", content_type)
+            self.send_header("Content-Length", str(len(body)))
+        for name, value in (headers or {}).items():
+            self.send_header(name, value)
+        self.end_headers()
+        if not head:
+            self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        pass  # 요청마다 로그를 남기지 않습니다. (metrics.API_REQUESTS로 셉니다)
+
+
+def make_server(current, port: int = DEFAULT_PORT, host: str = "0.0.0.0") -> ThreadingHTTPServer:
+    """current()가 돌려주는 인덱스를 조회하는 API 서버를 만듭니다. (serve_forever는 호출하는 쪽에서)"""
+    handler = type("ApiHandler", (_ApiHandler,), {"app": ApiApp(current)})
+    server = ThreadingHTTPServer((host, int(port)), handler)
+    server.daemon_threads = True
+    return server
+
+
+_server = None
+_server_lock = threading.Lock()
+
+
+def serve(current, port: int, host: str = "0.0.0.0"):
+    """백그라운드 스레드에서 API를 엽니다. 이미 열려 있으면 그 서버를 돌려줍니다. (metrics.serve와 같은 방식)"""
+    global _server
+    with _server_lock:
+        if _server is None:
+            try:
+                _server = make_server(current, port, host)
+            except OSError as e:
+                # 같은 포트를 다른 워커 프로세스가 이미 쓰는 경우 등
+                logger.warning("API 서버를 열지 못했습니다 (포트 %s): %s", port, e)
+                return None
+            threading.Thread(target=_server.serve_forever, name="api-server", daemon=True).start()
+        return _server
+
+
+def main(argv=None) -> int:
+    import mbti_data
+
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--host", default="0.0.0.0")
+    parser.add_argument("--port", type=int, default=int(API_PORT or DEFAULT_PORT))
+    parser.add_argument("--data", default=mbti_data.DATA_PATH, help="CSV 경로")
+    parser.add_argument("--bin", default=mbti_data.BIN_PATH, help="바이너리 데이터셋 경로")
+    args = parser.parse_args(argv)
+
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s %(levelname)s %(name)s: %(message)s")
+    store = mbti_data.IndexStore(args.data, args.bin).start()
+    server = make_server(store.current, args.port, args.host)
+    print(f"MBTI API: http://{args.host}:{args.port}/v1/meta (checksum {store.current().checksum[:12]})")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+        store.stop()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,142 @@
+"""페이지별 import 시간 / 첫 rerun 지연 보고서
+
+워커가 새로 뜬 직후(autoscaling, 재시작)를 흉내 내기 위해 페이지마다 새 파이썬 프로세스를
+`-X importtime`으로 띄워 첫 화면(선택 전)을 한 번 그리고, 그동안 import된 모듈별 누적 시간과
+첫 rerun 시간을 기록합니다. 무거운 의존성(HEAVY_MODULES)이 첫 화면에서 로드되었는지도 표시합니다.
+외부 API는 rerun_bench와 같은 로컬 스텁 서버로 대신합니다.
+
+사용법 (저장소 루트에서):
+    python -m bench.import_report                   # 측정 후 bench/import_baseline.json과 비교
+    python -m bench.import_report --update-baseline # 현재 결과를 기준값으로 저장
+    python -m bench.import_report --pages pages/03-finally.py --top 15
+"""
+import argparse
+import json
+import os
+import re
+import subprocess
+import sys
+import time
+
+from bench.rerun_bench import PAGES, TIMEOUT
+from bench.stubs import ROOT
+
+BASELINE_PATH = os.path.join(ROOT, "bench", "import_baseline.json")
+HEAVY_MODULES = ("pandas", "pyarrow", "plotly.express", "plotly.graph_objects", "streamlit_lottie")
+IMPORT_LINE = re.compile(r"^import time:\s+(\d+) \|\s+(\d+) \| (\s*)(\S+)$")
+
+
+def _child(page: str) -> dict:
+    """(새 프로세스 안에서) streamlit import와 페이지 첫 rerun 시간을 잽니다."""
+    if ROOT not in sys.path:
+        sys.path.insert(0, ROOT)
+    os.chdir(ROOT)
+    start = time.perf_counter()
+    import streamlit  # noqa: F401
+    from streamlit.testing.v1 import AppTest
+
+    from bench.stubs import StubServer, route_http_client
+
+    streamlit_seconds = time.perf_counter() - start
+    with StubServer() as stub:
+        route_http_client(stub)
+        before = set(sys.modules)
+        start = time.perf_counter()
+        at = AppTest.from_file(os.path.join(ROOT, page), default_timeout=TIMEOUT).run()
+        rerun_seconds = time.perf_counter() - start
+        if at.exception:
+            raise RuntimeError(f"스크립트 예외: {at.exception[0].message}")
+        loaded = sorted(m for m in set(sys.modules) - before if m in HEAVY_MODULES)
+    return {
+        "streamlit_ms": round(streamlit_seconds * 1000, 1),
+        "first_rerun_ms": round(rerun_seconds * 1000, 1),
+        "heavy": loaded,
+    }
+
+
+def _parse_importtime(stderr: str) -> dict:
+    """`-X importtime` 출력에서 최상위 import(들여쓰기 없음)의 누적 시간(ms)."""
+    totals = {}
+    for line in stderr.splitlines():
+        match = IMPORT_LINE.match(line)
+        if match and not match.group(3):
+            name = match.group(4).split(".")[0]
+            totals[name] = totals.get(name, 0) + int(match.group(2)) / 1000
+    return totals
+
+
+def measure(page: str) -> dict:
+    """페이지 하나를 새 프로세스에서 측정합니다."""
+    proc = subprocess.run(
+        [sys.executable, "-X", "importtime", "-m", "bench.import_report", "--child", page],
+        cwd=ROOT,
+        capture_output=True,
+        text=True,
+        timeout=TIMEOUT * 4,
+    )
+    if proc.returncode != 0:
+        raise RuntimeError(f"{page} 측정 실패:\n{proc.stderr[-2000:]}")
+    result = json.loads(proc.stdout.strip().splitlines()[-1])
+    imports = _parse_importtime(proc.stderr)
+    result["import_ms"] = round(sum(imports.values()), 1)
+    result["imports"] = {k: round(v, 1) for k, v in sorted(imports.items(), key=lambda kv: -kv[1])}
+    return result
+
+
+def compare(results: dict, baseline: dict, tolerance: float) -> list:
+    """기준값보다 (1 + tolerance)배 넘게 느려지거나 첫 화면에서 새로 로드되는 무거운 모듈을 돌려줍니다."""
+    regressions = []
+    for page, current in results.items():
+        base = baseline.get(page)
+        if not base:
+            continue
+        for key in ("import_ms", "first_rerun_ms"):
+            if current[key] > base[key] * (1 + tolerance):
+                regressions.append(f"{page}: {key} {base[key]} -> {current[key]}")
+        added = sorted(set(current["heavy"]) - set(base["heavy"]))
+        if added:
+            regressions.append(f"{page}: 첫 화면에서 새로 로드됨 {', '.join(added)}")
+    return regressions
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--pages", nargs="+", default=PAGES)
+    parser.add_argument("--top", type=int, default=8, help="페이지별로 보여줄 import 수")
+    parser.add_argument("--tolerance", type=float, default=0.5, help="허용하는 성능 저하 비율")
+    parser.add_argument("--baseline", default=BASELINE_PATH)
+    parser.add_argument("--update-baseline", action="store_true")
+    parser.add_argument("--child", help=argparse.SUPPRESS)
+    args = parser.parse_args(argv)
+
+    if args.child:
+        print(json.dumps(_child(args.child)))
+        return 0
+
+    results = {page: measure(page) for page in args.pages}
+    print(f"{'page':<22}{'imports':>10}{'first rerun':>13}  heavy")
+    for page, r in results.items():
+        print(f"{page:<22}{r['import_ms']:>10}{r['first_rerun_ms']:>13}  {', '.join(r['heavy']) or '-'}")
+    for page, r in results.items():
+        top = list(r["imports"].items())[: args.top]
+        print(f"\n{page}: " + ", ".join(f"{name} {ms}ms" for name, ms in top))
+
+    if args.update_baseline:
+        with open(args.baseline, "w", encoding="utf-8") as f:
+            json.dump(results, f, indent=2, ensure_ascii=False)
+        print(f"\n기준값 저장: {args.baseline}")
+        return 0
+
+    if not os.path.exists(args.baseline):
+        print("\n기준값 파일이 없습니다. --update-baseline으로 먼저 만드세요.")
+        return 0
+    with open(args.baseline, encoding="utf-8") as f:
+        baseline = json.load(f)
+    regressions = compare(results, baseline, args.tolerance)
+    for line in regressions:
+        print("성능 저하:", line)
+    return 1 if regressions else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,259 @@
+"""동시 세션 부하 테스트
+
+로컬에서 `streamlit run main.py` 서버를 띄우고, 웹소켓 프로토콜(/_stcore/stream)로
+브라우저 세션 N개를 흉내 냅니다. 세션 종류는 두 가지입니다.
+
+- idle: main.py를 열어 두기만 하는 탭. 서버가 보내는 auto_rerun 주기대로
+  배경 이미지 fragment를 다시 실행합니다. (브라우저와 같은 동작)
+- clicker: pages/03-finally.py에서 사이드바의 MBTI를 무작위로 계속 바꾸는 사용자
+
+동시 세션 수를 단계별로 늘리면서 rerun 지연 시간 p50/p95/p99, 서버 CPU, RSS를 보고합니다.
+외부 API는 bench/stubs.py의 로컬 스텁 서버로 대신합니다. (MBTI_UPSTREAM_OVERRIDE)
+서버 CPU/RSS는 /proc에서 읽으므로 Linux에서만 측정됩니다.
+
+사용법 (저장소 루트에서):
+    python -m bench.loadtest --levels 10 50 100 --clicker-ratio 0.3 --duration 30
+"""
+import argparse
+import asyncio
+import os
+import random
+import socket
+import subprocess
+import sys
+import time
+import urllib.request
+
+from bench.stubs import ROOT, StubServer
+
+CLICK_PAGE = "finally"  # pages/03-finally.py의 URL 경로
+LANDING = "선택해주세요"
+THINK_TIME = (1.0, 4.0)  # clicker가 다음 선택까지 기다리는 시간(초)
+RUN_TIMEOUT = 60
+
+
+def _free_port() -> int:
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        return s.getsockname()[1]
+
+
+def _percentile(values, q: float) -> float:
+    values = sorted(values)
+    if not values:
+        return 0.0
+    return values[min(len(values) - 1, int(round(q * (len(values) - 1))))]
+
+
+class ServerProcess:
+    """streamlit run 서브프로세스와 그 CPU/RSS 측정."""
+
+    def __init__(self, script: str, port: int, upstream: str):
+        env = dict(os.environ, MBTI_UPSTREAM_OVERRIDE=upstream)
+        self.port = port
+        self.proc = subprocess.Popen(
+            [
+                sys.executable, "-m", "streamlit", "run", script,
+                "--server.headless", "true",
+                "--server.port", str(port),
+                "--server.address", "127.0.0.1",
+                "--server.enableXsrfProtection", "false",
+                "--server.enableCORS", "false",
+                "--browser.gatherUsageStats", "false",
+            ],
+            cwd=ROOT,
+            env=env,
+            stdout=subprocess.DEVNULL,
+            stderr=subprocess.DEVNULL,
+        )
+        self._clock = os.sysconf("SC_CLK_TCK")
+        self._page = os.sysconf("SC_PAGE_SIZE")
+
+    def wait_ready(self, timeout: float = 60):
+        deadline = time.time() + timeout
+        while time.time() < deadline:
+            try:
+                with urllib.request.urlopen(f"http://127.0.0.1:{self.port}/_stcore/health", timeout=1) as r:
+                    if r.status == 200:
+                        return
+            except OSError:
+                time.sleep(0.3)
+        raise RuntimeError("Streamlit 서버가 시작되지 않았습니다.")
+
+    def cpu_seconds(self) -> float:
+        with open(f"/proc/{self.proc.pid}/stat") as f:
+            fields = f.read().rsplit(")", 1)[1].split()
+        return (int(fields[11]) + int(fields[12])) / self._clock  # utime + stime
+
+    def rss_mb(self) -> float:
+        with open(f"/proc/{self.proc.pid}/statm") as f:
+            return int(f.read().split()[1]) * self._page / 1024 / 1024
+
+    def stop(self):
+        self.proc.terminate()
+        try:
+            self.proc.wait(10)
+        except subprocess.TimeoutExpired:
+            self.proc.kill()
+
+
+class Session:
+    """브라우저 탭 하나를 흉내 내는 웹소켓 클라이언트입니다."""
+
+    def __init__(self, url: str, stats: dict):
+        self.url = url
+        self.stats = stats
+        self.ws = None
+        self.pages = {}
+        self.page_hash = ""
+        self.selectbox = None  # (widget id, options)
+        self.auto_rerun = None  # (interval, fragment id)
+
+    async def connect(self):
+        import websockets
+
+        self.ws = await websockets.connect(self.url, subprotocols=["streamlit"], max_size=None)
+
+    async def close(self):
+        if self.ws is not None:
+            await self.ws.close()
+
+    async def rerun(self, widget_value: str = None, fragment_id: str = "", record: bool = True):
+        """rerun 요청을 보내고 script_finished가 올 때까지의 시간을 기록합니다."""
+        from streamlit.proto.BackMsg_pb2 import BackMsg
+        from streamlit.proto.ForwardMsg_pb2 import ForwardMsg
+
+        msg = BackMsg()
+        state = msg.rerun_script
+        state.page_script_hash = self.page_hash
+        state.fragment_id = fragment_id
+        state.is_auto_rerun = bool(fragment_id)
+        if widget_value is not None and self.selectbox:
+            ws = state.widget_states.widgets.add()
+            ws.id = self.selectbox[0]
+            ws.string_value = widget_value
+
+        start = time.perf_counter()
+        await self.ws.send(msg.SerializeToString())
+        while True:
+            raw = await asyncio.wait_for(self.ws.recv(), RUN_TIMEOUT)
+            fwd = ForwardMsg()
+            fwd.ParseFromString(raw)
+            kind = fwd.WhichOneof("type")
+            if kind in ("new_session", "navigation"):
+                # 멀티페이지 목록은 버전에 따라 new_session 또는 navigation 메시지로 옵니다.
+                pages = getattr(fwd, kind).app_pages
+                self.pages.update({p.url_pathname: p.page_script_hash for p in pages})
+            elif kind == "delta" and fwd.delta.WhichOneof("type") == "new_element":
+                element = fwd.delta.new_element
+                if element.WhichOneof("type") == "selectbox":
+                    self.selectbox = (element.selectbox.id, list(element.selectbox.options))
+            elif kind == "auto_rerun":
+                self.auto_rerun = (fwd.auto_rerun.interval, fwd.auto_rerun.fragment_id)
+            elif kind == "script_finished":
+                break
+        if record:
+            self.stats["latencies"].append(time.perf_counter() - start)
+
+    async def run_idle(self, stop_at: float):
+        await self.connect()
+        await self.rerun(record=False)
+        while time.time() < stop_at:
+            if not self.auto_rerun:
+                await asyncio.sleep(1)
+                continue
+            interval, fragment_id = self.auto_rerun
+            await asyncio.sleep(interval)
+            await self.rerun(fragment_id=fragment_id)
+
+    async def run_clicker(self, stop_at: float):
+        await self.connect()
+        await self.rerun(record=False)  # 기본 페이지로 접속해 페이지 목록을 받습니다.
+        self.page_hash = self.pages.get(CLICK_PAGE, "")
+        await self.rerun(record=False)
+        while time.time() < stop_at:
+            await asyncio.sleep(random.uniform(*THINK_TIME))
+            options = [o for o in self.selectbox[1] if o != LANDING] if self.selectbox else []
+            await self.rerun(widget_value=random.choice(options) if options else None)
+
+
+async def _session_task(kind: str, url: str, stop_at: float, stats: dict):
+    session = Session(url, stats)
+    try:
+        if kind == "idle":
+            await session.run_idle(stop_at)
+        else:
+            await session.run_clicker(stop_at)
+    except Exception as e:
+        stats["errors"] += 1
+        stats["last_error"] = repr(e)
+    finally:
+        await session.close()
+
+
+async def run_level(server: ServerProcess, sessions: int, clicker_ratio: float, duration: float, ramp: float) -> dict:
+    url = f"ws://127.0.0.1:{server.port}/_stcore/stream"
+    stats = {"latencies": [], "errors": 0, "last_error": ""}
+    clickers = int(round(sessions * clicker_ratio))
+    kinds = ["clicker"] * clickers + ["idle"] * (sessions - clickers)
+    random.shuffle(kinds)
+
+    stop_at = time.time() + ramp + duration
+    tasks = []
+    for kind in kinds:
+        tasks.append(asyncio.create_task(_session_task(kind, url, stop_at, stats)))
+        await asyncio.sleep(ramp / max(1, sessions))  # 접속을 ramp초에 걸쳐 나눕니다.
+
+    # 모든 세션이 붙은 뒤부터 CPU/RSS를 잽니다.
+    cpu_start, wall_start = server.cpu_seconds(), time.time()
+    rss_peak = server.rss_mb()
+    while time.time() < stop_at:
+        await asyncio.sleep(0.5)
+        rss_peak = max(rss_peak, server.rss_mb())
+    cpu_percent = (server.cpu_seconds() - cpu_start) / max(1e-6, time.time() - wall_start) * 100
+    await asyncio.gather(*tasks)
+
+    latencies = stats["latencies"]
+    return {
+        "sessions": sessions,
+        "clickers": clickers,
+        "reruns": len(latencies),
+        "p50_ms": round(_percentile(latencies, 0.50) * 1000, 1),
+        "p95_ms": round(_percentile(latencies, 0.95) * 1000, 1),
+        "p99_ms": round(_percentile(latencies, 0.99) * 1000, 1),
+        "cpu_percent": round(cpu_percent, 1),
+        "rss_mb": round(rss_peak, 1),
+        "errors": stats["errors"],
+        "last_error": stats["last_error"],
+    }
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--levels", type=int, nargs="+", default=[10, 50, 100], help="단계별 동시 세션 수")
+    parser.add_argument("--clicker-ratio", type=float, default=0.3, help="clicker 세션 비율 (나머지는 idle)")
+    parser.add_argument("--duration", type=float, default=30, help="단계별 측정 시간(초)")
+    parser.add_argument("--ramp", type=float, default=5, help="세션 접속을 나누어 여는 시간(초)")
+    parser.add_argument("--latency", type=float, default=0.0, help="스텁 서버 응답 지연(초)")
+    parser.add_argument("--script", default="main.py")
+    args = parser.parse_args(argv)
+
+    with StubServer(latency=args.latency) as stub:
+        server = ServerProcess(args.script, _free_port(), stub.base_url)
+        try:
+            server.wait_ready()
+            print(f"{'sessions':>9}{'clickers':>9}{'reruns':>8}{'p50':>9}{'p95':>9}{'p99':>9}{'cpu%':>8}{'rss MB':>9}{'errors':>7}")
+            for level in args.levels:
+                r = asyncio.run(run_level(server, level, args.clicker_ratio, args.duration, args.ramp))
+                print(f"{r['sessions']:>9}{r['clickers']:>9}{r['reruns']:>8}{r['p50_ms']:>9}{r['p95_ms']:>9}"
+                      f"{r['p99_ms']:>9}{r['cpu_percent']:>8}{r['rss_mb']:>9}{r['errors']:>7}")
+                if r["last_error"]:
+                    print("  마지막 오류:", r["last_error"])
+            print("업스트림 호출:", dict(stub.calls))
+        finally:
+            server.stop()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
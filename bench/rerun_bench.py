@@ -0,0 +1,148 @@
+"""페이지별 rerun 지연 시간 벤치마크
+
+Streamlit의 헤드리스 테스트 도구(AppTest)로 각 페이지를 실행하면서
+첫 화면(선택 전)과 16개 MBTI 선택을 차례로 돌리고, rerun마다
+실행 시간, 최대 메모리(tracemalloc), 외부 호출 횟수를 기록합니다.
+외부 API(Dog API, 이미지, Lottie)는 로컬 스텁 서버로 대신합니다.
+
+사용법 (저장소 루트에서):
+    python -m bench.rerun_bench                   # 측정 후 bench/baseline.json과 비교
+    python -m bench.rerun_bench --update-baseline # 현재 결과를 기준값으로 저장
+    python -m bench.rerun_bench --pages mbti.py --rounds 3
+"""
+import argparse
+import json
+import os
+import statistics
+import sys
+import time
+import tracemalloc
+
+from bench.stubs import ROOT, StubServer, route_http_client
+
+PAGES = ["main.py", "mbti.py", "pages/01-first.py", "pages/02-second.py", "pages/03-finally.py", "pages/04-country.py"]
+LANDING = "선택해주세요"
+BASELINE_PATH = os.path.join(ROOT, "bench", "baseline.json")
+TIMEOUT = 60
+
+
+def _percentile(values, q: float) -> float:
+    values = sorted(values)
+    return values[min(len(values) - 1, int(round(q * (len(values) - 1))))]
+
+
+def _summary(samples) -> dict:
+    times = [s["seconds"] for s in samples]
+    return {
+        "reruns": len(samples),
+        "p50_ms": round(statistics.median(times) * 1000, 2),
+        "p95_ms": round(_percentile(times, 0.95) * 1000, 2),
+        "max_ms": round(max(times) * 1000, 2),
+        "peak_kb": round(max(s["peak_kb"] for s in samples), 1),
+        "calls": sum(s["calls"] for s in samples),
+    }
+
+
+def _timed(stub, step):
+    """rerun 한 번을 실행하고 (걸린 시간, 최대 메모리, 외부 호출 수)를 잽니다."""
+    calls_before = stub.total_calls()
+    tracemalloc.reset_peak()
+    start = time.perf_counter()
+    at = step()
+    seconds = time.perf_counter() - start
+    _, peak = tracemalloc.get_traced_memory()
+    if at.exception:
+        raise RuntimeError(f"스크립트 예외: {at.exception[0].message}")
+    return {"seconds": seconds, "peak_kb": peak / 1024, "calls": stub.total_calls() - calls_before}
+
+
+def bench_page(page: str, stub, rounds: int = 1) -> dict:
+    """페이지 하나를 측정합니다. 첫 실행(cold)은 따로 기록합니다."""
+    from streamlit.testing.v1 import AppTest
+
+    at = AppTest.from_file(os.path.join(ROOT, page), default_timeout=TIMEOUT)
+    cold = _timed(stub, at.run)
+
+    samples = []
+    for _ in range(rounds):
+        if at.selectbox:
+            # 선택지(16개 유형 등)를 차례로 고르고, 첫 화면이 있는 페이지는 마지막에 돌아갑니다.
+            options = at.selectbox[0].options
+            if LANDING in options:
+                options = [o for o in options if o != LANDING] + [LANDING]
+            for option in options:
+                samples.append(_timed(stub, lambda: at.selectbox[0].set_value(option).run()))
+        else:
+            # 선택지가 없는 페이지(main.py)는 같은 화면을 다시 실행합니다.
+            for _ in range(17):
+                samples.append(_timed(stub, at.run))
+
+    result = _summary(samples)
+    result["cold_ms"] = round(cold["seconds"] * 1000, 2)
+    result["cold_calls"] = cold["calls"]
+    return result
+
+
+def run(pages, rounds: int = 1, latency: float = 0.0) -> dict:
+    if ROOT not in sys.path:
+        sys.path.insert(0, ROOT)
+    os.chdir(ROOT)  # 페이지들은 데이터 파일을 상대 경로로 엽니다.
+    results = {}
+    tracemalloc.start()
+    with StubServer(latency=latency) as stub:
+        route_http_client(stub)
+        for page in pages:
+            results[page] = bench_page(page, stub, rounds)
+    tracemalloc.stop()
+    return results
+
+
+def compare(results: dict, baseline: dict, tolerance: float) -> list:
+    """기준값보다 (1 + tolerance)배 넘게 느려지거나 외부 호출이 늘어난 항목을 돌려줍니다."""
+    regressions = []
+    for page, current in results.items():
+        base = baseline.get(page)
+        if not base:
+            continue
+        for key in ("p50_ms", "p95_ms", "peak_kb"):
+            if current[key] > base[key] * (1 + tolerance):
+                regressions.append(f"{page}: {key} {base[key]} -> {current[key]}")
+        if current["calls"] > base["calls"]:
+            regressions.append(f"{page}: calls {base['calls']} -> {current['calls']}")
+    return regressions
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--pages", nargs="+", default=PAGES)
+    parser.add_argument("--rounds", type=int, default=1, help="16개 유형을 몇 바퀴 돌지")
+    parser.add_argument("--latency", type=float, default=0.0, help="스텁 서버 응답 지연(초)")
+    parser.add_argument("--tolerance", type=float, default=0.5, help="허용하는 성능 저하 비율")
+    parser.add_argument("--baseline", default=BASELINE_PATH)
+    parser.add_argument("--update-baseline", action="store_true")
+    args = parser.parse_args(argv)
+
+    results = run(args.pages, args.rounds, args.latency)
+    print(f"{'page':<22}{'cold':>10}{'p50':>10}{'p95':>10}{'max':>10}{'peak KB':>10}{'calls':>7}")
+    for page, r in results.items():
+        print(f"{page:<22}{r['cold_ms']:>10}{r['p50_ms']:>10}{r['p95_ms']:>10}{r['max_ms']:>10}{r['peak_kb']:>10}{r['calls']:>7}")
+
+    if args.update_baseline:
+        with open(args.baseline, "w", encoding="utf-8") as f:
+            json.dump(results, f, indent=2, ensure_ascii=False)
+        print(f"기준값 저장: {args.baseline}")
+        return 0
+
+    if not os.path.exists(args.baseline):
+        print("기준값 파일이 없습니다. --update-baseline으로 먼저 만드세요.")
+        return 0
+    with open(args.baseline, encoding="utf-8") as f:
+        baseline = json.load(f)
+    regressions = compare(results, baseline, args.tolerance)
+    for line in regressions:
+        print("성능 저하:", line)
+    return 1 if regressions else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,108 @@
+import io
+import itertools
+import json
+import os
+import threading
+import time
+from collections import Counter
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import urlsplit
+
+# 벤치마크/부하 테스트용 로컬 스텁 서버
+# Dog API, 강아지 이미지, Lottie JSON을 흉내 내고 경로별 호출 횟수를 셉니다.
+# latency를 주면 모든 응답을 그만큼 늦게 보냅니다. (타임아웃/서킷 브레이커 확인용)
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+LOTTIE_PATH = os.path.join(ROOT, "assets", "lottie_fallback.json")
+
+
+def _jpeg(n: int, size=(1600, 1200)) -> bytes:
+    from PIL import Image
+
+    buf = io.BytesIO()
+    Image.new("RGB", size, (n * 47 % 255, 120, 180)).save(buf, "JPEG", quality=85)
+    return buf.getvalue()
+
+
+class StubServer:
+    """127.0.0.1의 빈 포트에서 도는 스텁 서버입니다. with 문으로 쓰면 자동으로 종료됩니다."""
+
+    def __init__(self, latency: float = 0.0, images: int = 5):
+        self.latency = latency
+        self.calls = Counter()
+        self._images = [_jpeg(i) for i in range(images)]
+        self._counter = itertools.count()
+        with open(LOTTIE_PATH, "rb") as f:
+            self._lottie = f.read()
+        stub = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+
+            def do_GET(self):
+                stub._handle(self)
+
+            def log_message(self, *args):
+                pass
+
+        self.server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+        self.server.daemon_threads = True
+        self.base_url = f"http://127.0.0.1:{self.server.server_port}"
+        self._thread = None
+
+    def _handle(self, handler):
+        path = urlsplit(handler.path).path
+        if self.latency:
+            time.sleep(self.latency)
+        if path.startswith("/img/"):
+            self.calls["image"] += 1
+            n = int(os.path.splitext(path.rsplit("/", 1)[1])[0]) % len(self._images)
+            body, content_type = self._images[n], "image/jpeg"
+        elif path.endswith(".json"):
+            self.calls["lottie"] += 1
+            body, content_type = self._lottie, "application/json"
+        elif "image/random" in path:
+            self.calls["dog_api"] += 1
+            n = next(self._counter) % len(self._images)
+            body = json.dumps({"message": f"{self.base_url}/img/{n}.jpg", "status": "success"}).encode()
+            content_type = "application/json"
+        else:
+            self.calls["other"] += 1
+            body, content_type = b"not found", "text/plain"
+            handler.send_response(404)
+            handler.send_header("Content-Length", str(len(body)))
+            handler.end_headers()
+            handler.wfile.write(body)
+            return
+        handler.send_response(200)
+        handler.send_header("Content-Type", content_type)
+        handler.send_header("Content-Length", str(len(body)))
+        handler.end_headers()
+        handler.wfile.write(body)
+
+    def start(self):
+        self._thread = threading.Thread(target=self.server.serve_forever, name="stub-server", daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self.server.shutdown()
+        self.server.server_close()
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, *exc):
+        self.stop()
+
+    def total_calls(self) -> int:
+        return sum(self.calls.values())
+
+
+def route_http_client(stub: StubServer):
+    """같은 프로세스의 공용 HTTP 클라이언트(http_client.client)가 모든 외부 호출을 스텁 서버로 보내게 합니다.
+
+    다른 프로세스(streamlit run)라면 MBTI_UPSTREAM_OVERRIDE 환경 변수에 stub.base_url을 넣습니다.
+    """
+    import http_client
+
+    http_client.client.redirect_to(stub.base_url)
@@ -0,0 +1,172 @@
+import glob
+import logging
+import os
+import threading
+from typing import NamedTuple
+
+import numpy as np
+
+# 나라 성향 군집 (k-means)
+# 16개 유형 비율 전체로 나라를 k개 군집으로 묶습니다. 계산은 모두 NumPy 벡터 연산이고
+# 결과는 (데이터 체크섬, k)별로 디스크에 저장해 rerun이나 재시작 때 다시 계산하지 않습니다.
+# 데이터가 바뀌면(체크섬이 다르면) 같은 k의 가장 최근 결과의 중심점에서 출발해
+# 몇 번만 반복하면 되도록 합니다. (warm start)
+CACHE_DIR = os.path.join(".cache", "clusters")
+K_RANGE = (2, 8)
+MAX_ITER = 100
+TOL = 1e-7
+SEED = 0
+
+logger = logging.getLogger(__name__)
+
+
+class Clustering(NamedTuple):
+    """k-means 결과. labels는 행별 군집 번호, centroids는 (k x 유형 수)."""
+
+    k: int
+    labels: np.ndarray
+    centroids: np.ndarray
+    inertia: float
+    iterations: int
+    checksum: str
+    columns: tuple
+
+    def sizes(self) -> np.ndarray:
+        return np.bincount(self.labels, minlength=self.k)
+
+    def names(self, means: np.ndarray, top: int = 2) -> list:
+        """군집마다 전체 평균보다 비율이 가장 높은 유형 top개로 이름을 붙입니다. 예) "ESFJ·ESTJ 우세" """
+        lift = self.centroids - np.asarray(means)[None, :]
+        best = np.argsort(-lift, axis=1, kind="stable")[:, :top]
+        return [f"{i + 1}. " + "·".join(self.columns[j] for j in row) + " 우세" for i, row in enumerate(best)]
+
+
+def _sq_distances(x: np.ndarray, centroids: np.ndarray, x_sq: np.ndarray) -> np.ndarray:
+    d2 = x_sq[:, None] + np.einsum("ij,ij->i", centroids, centroids)[None, :] - 2 * (x @ centroids.T)
+    return np.clip(d2, 0, None)
+
+
+def kmeans_plus_plus(x: np.ndarray, k: int, rng: np.random.Generator) -> np.ndarray:
+    """k-means++ 초기 중심점. 반복은 k번뿐이고 거리 계산은 전체 행에 대해 한 번에 합니다."""
+    centroids = np.empty((k, x.shape[1]))
+    centroids[0] = x[rng.integers(len(x))]
+    closest = np.sum((x - centroids[0]) ** 2, axis=1)
+    for c in range(1, k):
+        total = closest.sum()
+        i = rng.choice(len(x), p=closest / total) if total > 0 else rng.integers(len(x))
+        centroids[c] = x[i]
+        closest = np.minimum(closest, np.sum((x - centroids[c]) ** 2, axis=1))
+    return centroids
+
+
+def kmeans(values, k: int, init=None, max_iter: int = MAX_ITER, tol: float = TOL, seed: int = SEED):
+    """Lloyd k-means. (labels, centroids, inertia, 반복 횟수)를 돌려줍니다.
+
+    init을 주면 그 중심점에서 출발합니다. (warm start)
+    """
+    x = np.asarray(values, dtype=np.float64)
+    rng = np.random.default_rng(seed)
+    centroids = np.array(init, dtype=np.float64) if init is not None else kmeans_plus_plus(x, k, rng)
+    x_sq = np.einsum("ij,ij->i", x, x)
+
+    for iteration in range(1, max_iter + 1):
+        d2 = _sq_distances(x, centroids, x_sq)
+        labels = d2.argmin(axis=1)
+        counts = np.bincount(labels, minlength=k)
+        # 군집별 합: 반복은 유형 수(16)만큼이고 행 단위 반복은 없습니다.
+        sums = np.stack([np.bincount(labels, weights=x[:, j], minlength=k) for j in range(x.shape[1])], axis=1)
+        new = sums / np.maximum(counts, 1)[:, None]
+        empty = counts == 0
+        if empty.any():
+            # 빈 군집은 지금 중심점에서 가장 먼 나라들로 다시 채웁니다.
+            far = np.argsort(-d2[np.arange(len(x)), labels])[: empty.sum()]
+            new[empty] = x[far]
+        shift = np.sum((new - centroids) ** 2)
+        centroids = new
+        if shift <= tol:
+            break
+
+    d2 = _sq_distances(x, centroids, x_sq)
+    labels = d2.argmin(axis=1)
+    inertia = float(d2[np.arange(len(x)), labels].sum())
+    return labels, centroids, inertia, iteration
+
+
+def _order_by_size(labels: np.ndarray, centroids: np.ndarray):
+    """군집 번호를 큰 군집부터 0, 1, ... 순서로 바꿉니다. (색과 이름이 매번 같도록)"""
+    order = np.argsort(-np.bincount(labels, minlength=len(centroids)), kind="stable")
+    remap = np.empty_like(order)
+    remap[order] = np.arange(len(order))
+    return remap[labels], centroids[order]
+
+
+class ClusterStore:
+    """(체크섬, k)별 k-means 결과의 메모리 + 디스크 캐시입니다."""
+
+    def __init__(self, cache_dir: str = CACHE_DIR):
+        self.cache_dir = cache_dir
+        self._memory = {}
+        self._lock = threading.Lock()
+        os.makedirs(cache_dir, exist_ok=True)
+
+    def path(self, checksum: str, k: int) -> str:
+        return os.path.join(self.cache_dir, f"k{k}-{checksum[:16]}.npz")
+
+    def _load(self, path: str):
+        try:
+            with np.load(path, allow_pickle=False) as f:
+                return Clustering(
+                    k=int(f["k"]),
+                    labels=f["labels"],
+                    centroids=f["centroids"],
+                    inertia=float(f["inertia"]),
+                    iterations=int(f["iterations"]),
+                    checksum=str(f["checksum"]),
+                    columns=tuple(str(c) for c in f["columns"]),
+                )
+        except (OSError, KeyError, ValueError) as e:
+            logger.warning("군집 캐시를 읽지 못했습니다 (%s): %s", path, e)
+            return None
+
+    def _save(self, result: Clustering):
+        path = self.path(result.checksum, result.k)
+        tmp_path = path + ".tmp.npz"
+        np.savez(
+            tmp_path,
+            k=result.k,
+            labels=result.labels,
+            centroids=result.centroids,
+            inertia=result.inertia,
+            iterations=result.iterations,
+            checksum=result.checksum,
+            columns=np.array(result.columns),
+        )
+        os.replace(tmp_path, path)
+
+    def _previous(self, k: int, columns: tuple):
+        """같은 k와 같은 유형 컬럼으로 저장된 가장 최근 결과 (warm start용)."""
+        paths = [p for p in glob.glob(os.path.join(self.cache_dir, f"k{k}-*.npz")) if not p.endswith(".tmp.npz")]
+        paths.sort(key=os.path.getmtime, reverse=True)
+        for path in paths:
+            result = self._load(path)
+            if result is not None and result.columns == columns:
+                return result
+        return None
+
+    def get(self, values, checksum: str, k: int, columns) -> Clustering:
+        """저장된 결과가 있으면 읽고, 없으면 계산해서 저장합니다."""
+        columns = tuple(columns)
+        key = (checksum, k)
+        with self._lock:
+            result = self._memory.get(key)
+            if result is None:
+                result = self._load(self.path(checksum, k)) if os.path.exists(self.path(checksum, k)) else None
+                if result is None or result.columns != columns or len(result.labels) != len(values):
+                    previous = self._previous(k, columns)
+                    init = previous.centroids if previous is not None else None
+                    labels, centroids, inertia, iterations = kmeans(values, k, init=init)
+                    labels, centroids = _order_by_size(labels, centroids)
+                    result = Clustering(k, labels, centroids, inertia, iterations, checksum, columns)
+                    self._save(result)
+                self._memory[key] = result
+            return result
@@ -0,0 +1,223 @@
+import sys
+
+# 나라 이름 -> ISO 3166-1 alpha-3 코드
+# 지도(choropleth)가 렌더링할 때마다 나라 이름을 매칭하지 않도록, 데이터 빌드 시점에
+# Country 컬럼을 ISO-3 코드로 한 번만 바꿔 둡니다. (dataset_bin.py, mbti_data.py)
+# CSV에 새 나라 이름이 생기면 여기에 추가하고 `python country_codes.py`로 확인하세요.
+COUNTRY_ISO3 = {
+    "Afghanistan": "AFG",
+    "Albania": "ALB",
+    "Algeria": "DZA",
+    "Andorra": "AND",
+    "Angola": "AGO",
+    "Antigua and Barbuda": "ATG",
+    "Argentina": "ARG",
+    "Armenia": "ARM",
+    "Australia": "AUS",
+    "Austria": "AUT",
+    "Azerbaijan": "AZE",
+    "Bahamas": "BHS",
+    "Bahrain": "BHR",
+    "Bangladesh": "BGD",
+    "Barbados": "BRB",
+    "Belarus": "BLR",
+    "Belgium": "BEL",
+    "Belize": "BLZ",
+    "Bhutan": "BTN",
+    "Bosnia and Herzegovina": "BIH",
+    "Botswana": "BWA",
+    "Brazil": "BRA",
+    "Brunei": "BRN",
+    "Bulgaria": "BGR",
+    "Burkina Faso": "BFA",
+    "Cambodia": "KHM",
+    "Cameroon": "CMR",
+    "Canada": "CAN",
+    "Chile": "CHL",
+    "China": "CHN",
+    "Colombia": "COL",
+    "Congo": "COG",
+    "Congo (Kinshasa)": "COD",
+    "Costa Rica": "CRI",
+    "Croatia": "HRV",
+    "Cuba": "CUB",
+    "Cyprus": "CYP",
+    "Czech Republic": "CZE",
+    "Denmark": "DNK",
+    "Djibouti": "DJI",
+    "Dominica": "DMA",
+    "Dominican Republic": "DOM",
+    "Ecuador": "ECU",
+    "Egypt": "EGY",
+    "El Salvador": "SLV",
+    "Estonia": "EST",
+    "Ethiopia": "ETH",
+    "Faroe Islands": "FRO",
+    "Fiji": "FJI",
+    "Finland": "FIN",
+    "France": "FRA",
+    "Georgia": "GEO",
+    "Germany": "DEU",
+    "Ghana": "GHA",
+    "Greece": "GRC",
+    "Grenada": "GRD",
+    "Guatemala": "GTM",
+    "Guinea": "GIN",
+    "Guyana": "GUY",
+    "Haiti": "HTI",
+    "Honduras": "HND",
+    "Hungary": "HUN",
+    "Iceland": "ISL",
+    "India": "IND",
+    "Indonesia": "IDN",
+    "Iraq": "IRQ",
+    "Ireland": "IRL",
+    "Israel": "ISR",
+    "Italy": "ITA",
+    "Jamaica": "JAM",
+    "Japan": "JPN",
+    "Jordan": "JOR",
+    "Kazakhstan": "KAZ",
+    "Kenya": "KEN",
+    "Kuwait": "KWT",
+    "Kyrgyzstan": "KGZ",
+    "Laos": "LAO",
+    "Latvia": "LVA",
+    "Lebanon": "LBN",
+    "Lesotho": "LSO",
+    "Libya": "LBY",
+    "Lithuania": "LTU",
+    "Luxembourg": "LUX",
+    "Macedonia": "MKD",
+    "Madagascar": "MDG",
+    "Malawi": "MWI",
+    "Malaysia": "MYS",
+    "Maldives": "MDV",
+    "Mali": "MLI",
+    "Malta": "MLT",
+    "Mauritius": "MUS",
+    "Mexico": "MEX",
+    "Moldova": "MDA",
+    "Monaco": "MCO",
+    "Mongolia": "MNG",
+    "Montenegro": "MNE",
+    "Morocco": "MAR",
+    "Mozambique": "MOZ",
+    "Myanmar": "MMR",
+    "Namibia": "NAM",
+    "Nepal": "NPL",
+    "Netherlands": "NLD",
+    "New Zealand": "NZL",
+    "Nicaragua": "NIC",
+    "Niger": "NER",
+    "Nigeria": "NGA",
+    "Norway": "NOR",
+    "Oman": "OMN",
+    "Pakistan": "PAK",
+    "Panama": "PAN",
+    "Papua New Guinea": "PNG",
+    "Paraguay": "PRY",
+    "Peru": "PER",
+    "Philippines": "PHL",
+    "Poland": "POL",
+    "Portugal": "PRT",
+    "Qatar": "QAT",
+    "Romania": "ROU",
+    "Russia": "RUS",
+    "Rwanda": "RWA",
+    "Saint Kitts and Nevis": "KNA",
+    "Saint Lucia": "LCA",
+    "Saint Vincent and the Grenadines": "VCT",
+    "Saudi Arabia": "SAU",
+    "Senegal": "SEN",
+    "Serbia": "SRB",
+    "Seychelles": "SYC",
+    "Singapore": "SGP",
+    "Slovakia": "SVK",
+    "Slovenia": "SVN",
+    "Somalia": "SOM",
+    "South Africa": "ZAF",
+    "South Korea": "KOR",
+    "Spain": "ESP",
+    "Sri Lanka": "LKA",
+    "Sudan": "SDN",
+    "Suriname": "SUR",
+    "Sweden": "SWE",
+    "Switzerland": "CHE",
+    "Syria": "SYR",
+    "Tajikistan": "TJK",
+    "Tanzania": "TZA",
+    "Thailand": "THA",
+    "Trinidad and Tobago": "TTO",
+    "Tunisia": "TUN",
+    "Turkey": "TUR",
+    "Uganda": "UGA",
+    "Ukraine": "UKR",
+    "United Arab Emirates": "ARE",
+    "United Kingdom": "GBR",
+    "United States": "USA",
+    "Uruguay": "URY",
+    "Uzbekistan": "UZB",
+    "Vanuatu": "VUT",
+    "Vietnam": "VNM",
+    "Yemen": "YEM",
+    "Zambia": "ZMB",
+    "Zimbabwe": "ZWE",
+}
+
+# 다른 데이터 출처에서 자주 쓰는 이름
+ALIASES = {
+    "Czechia": "CZE",
+    "Democratic Republic of the Congo": "COD",
+    "DR Congo": "COD",
+    "Republic of the Congo": "COG",
+    "Congo (Brazzaville)": "COG",
+    "Korea, South": "KOR",
+    "Republic of Korea": "KOR",
+    "North Macedonia": "MKD",
+    "Russian Federation": "RUS",
+    "Türkiye": "TUR",
+    "Turkiye": "TUR",
+    "Viet Nam": "VNM",
+    "United States of America": "USA",
+    "USA": "USA",
+    "UK": "GBR",
+    "Brunei Darussalam": "BRN",
+    "Lao PDR": "LAO",
+    "Syrian Arab Republic": "SYR",
+    "Republic of Moldova": "MDA",
+    "United Republic of Tanzania": "TZA",
+}
+
+
+def to_iso3(name: str):
+    """나라 이름에 해당하는 ISO-3 코드. 모르는 이름이면 None."""
+    name = name.strip()
+    return COUNTRY_ISO3.get(name) or ALIASES.get(name)
+
+
+def resolve(names):
+    """이름 목록을 ISO-3 코드 목록(모르는 이름은 "")과 매칭되지 않은 이름 목록으로 바꿉니다."""
+    codes = []
+    unmatched = []
+    for name in names:
+        code = to_iso3(name)
+        if code is None:
+            unmatched.append(name)
+        codes.append(code or "")
+    return codes, unmatched
+
+
+def report(unmatched) -> str:
+    if not unmatched:
+        return "모든 나라 이름이 ISO-3 코드로 매칭되었습니다."
+    return f"ISO-3 코드로 매칭되지 않은 나라 {len(unmatched)}개: " + ", ".join(unmatched)
+
+
+if __name__ == "__main__":
+    import pandas as pd
+
+    path = sys.argv[1] if len(sys.argv) > 1 else "countriesMBTI_16types.csv"
+    _, missing = resolve(pd.read_csv(path)["Country"])
+    print(report(missing))
+    sys.exit(1 if missing else 0)
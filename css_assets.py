@@ -0,0 +1,310 @@
+"""Semantic UI 스타일시트 빌드 단계 (필요한 규칙만 추출)
+
+mbti.py와 pages/02-second.py(결과 화면 HTML은 result_views.py), 정적 내보내기(static_export.py)는
+Semantic UI의 header, card, statistic, segment, message, divider, table, icon 정도만 씁니다.
+semantic.min.css 전체(600KB 가까이)를 CDN에서 받는 대신 이 스크립트로 페이지의 HTML에
+실제로 나오는 클래스만으로 이루어진 선택자를 골라 static/css/ 아래에 작은 파일로 저장하면,
+페이지는 같은 서버(app/static/css/...)에서 그 파일을 받습니다.
+
+- 선택자 목록 중 쓰는 선택자만 남깁니다. 클래스가 없는 전역 규칙(body, h1 등 reset)은
+  Streamlit 화면을 바꾸므로 넣지 않습니다.
+- @media 안의 규칙도 같은 기준으로 고르고, @font-face/@keyframes는 남은 규칙이 참조할 때만 남깁니다.
+  (Lato 웹폰트 @import는 빼고 시스템 글꼴을 씁니다)
+- 아이콘 폰트는 woff2/woff만 static/css/fonts/로 복사(또는 다운로드)합니다.
+- 파일 이름에 내용 해시를 붙이므로(semantic-<해시>.css) 브라우저와 프록시가 오래 캐시해도 안전하고,
+  페이지는 세션마다 한 번만 <head>에 링크를 넣습니다. (load_semantic_ui)
+
+사용법:
+    python css_assets.py                          # CDN의 semantic.min.css를 받아 빌드
+    python css_assets.py semantic.min.css [출력 폴더]  # 받아 둔 파일로 빌드 (themes/ 폴더가 옆에 있으면 폰트도 복사)
+"""
+import glob
+import hashlib
+import os
+import re
+import shutil
+import sys
+import urllib.parse
+import urllib.request
+
+SEMANTIC_URL = "https://cdnjs.cloudflare.com/ajax/libs/semantic-ui/2.4.1/semantic.min.css"
+CSS_DIR = os.path.join("static", "css")
+CSS_URL = "app/static/css"
+# 클래스를 모을 페이지 (Semantic UI 마크업을 쓰는 곳)
+SOURCES = ("mbti.py", os.path.join("pages", "02-second.py"), "result_views.py", "static_export.py")
+FONT_FORMATS = ("woff2", "woff")
+# 페이지 공통 보정 스타일 (빌드 결과 뒤에 붙입니다)
+PAGE_CSS = (
+    # Streamlit 기본 패딩 조정
+    ".main .block-container{padding-top:2rem}"
+    # 폰트 등 기본 스타일 조정
+    "body{font-family:'Lato','Helvetica Neue',Arial,Helvetica,sans-serif}"
+)
+SESSION_KEY = "_semantic_css"
+
+CLASS_ATTR = re.compile(r"""class\s*=\s*(["'])(.*?)\1""", re.S)
+CLASS_NAME = re.compile(r"\.(-?[_a-zA-Z][\w-]*)")
+CLASS_MATCH = re.compile(r"""\[class[*~^|$]?=\s*["']?([^"'\]]+)["']?\s*\]""")
+NOT_GROUP = re.compile(r":not\([^()]*\)")
+URL = re.compile(r"""url\(\s*(["']?)([^"')]+)\1\s*\)""")
+
+
+# --- CSS 파싱 ---
+def _skip(css: str, i: int, stop_chars: str) -> int:
+    """문자열, 주석, 괄호를 건너뛰며 stop_chars 중 하나가 나오는 위치를 찾습니다."""
+    depth = 0
+    while i < len(css):
+        c = css[i]
+        if c in "\"'":
+            end = i + 1
+            while end < len(css) and css[end] != c:
+                end += 2 if css[end] == "\\" else 1
+            i = end + 1
+            continue
+        if css.startswith("/*", i):
+            end = css.find("*/", i + 2)
+            i = len(css) if end < 0 else end + 2
+            continue
+        if c == "(":
+            depth += 1
+        elif c == ")":
+            depth -= 1
+        elif depth == 0 and c in stop_chars:
+            return i
+        i += 1
+    return i
+
+
+def _block_end(css: str, i: int) -> int:
+    """i가 '{' 바로 다음일 때 짝이 맞는 '}'의 위치."""
+    depth = 1
+    while i < len(css):
+        i = _skip(css, i, "{}")
+        if i >= len(css):
+            break
+        depth += 1 if css[i] == "{" else -1
+        if depth == 0:
+            return i
+        i += 1
+    return i
+
+
+def parse(css: str, i: int = 0, end: int = None) -> list:
+    """CSS를 (머리, 본문) 목록으로 나눕니다. @media/@supports의 본문은 다시 목록입니다.
+
+    본문이 None이면 @import 같은 한 줄 at-rule입니다.
+    """
+    end = len(css) if end is None else end
+    nodes = []
+    while i < end:
+        j = _skip(css, i, "{};")
+        j = min(j, end)
+        prelude = re.sub(r"/\*.*?\*/", "", css[i:j], flags=re.S).strip()
+        if j >= end or css[j] == "}":
+            break
+        if css[j] == ";":
+            if prelude:
+                nodes.append((prelude, None))
+            i = j + 1
+            continue
+        close = _block_end(css, j + 1)
+        if prelude.startswith(("@media", "@supports")):
+            nodes.append((prelude, parse(css, j + 1, close)))
+        else:
+            nodes.append((prelude, css[j + 1:close].strip()))
+        i = close + 1
+    return nodes
+
+
+# --- 선택자 고르기 ---
+def used_classes(paths=SOURCES) -> set:
+    """페이지 소스의 class="..." 속성에 나오는 클래스 이름 전체."""
+    classes = set()
+    for path in paths:
+        with open(path, encoding="utf-8") as f:
+            for _, value in CLASS_ATTR.findall(f.read()):
+                classes.update(value.split())
+    return classes
+
+
+def selector_used(selector: str, classes: set) -> bool:
+    """선택자에 나오는 클래스가 모두 쓰이는 클래스이면 True. (:not() 안은 조건이 아님)"""
+    selector = NOT_GROUP.sub("", selector)
+    needed = set(CLASS_NAME.findall(selector))
+    for value in CLASS_MATCH.findall(selector):
+        needed.update(value.split())
+    return bool(needed) and needed <= classes
+
+
+def _split_selectors(prelude: str) -> list:
+    parts, i = [], 0
+    while i <= len(prelude):
+        j = _skip(prelude, i, ",")
+        parts.append(prelude[i:j].strip())
+        i = j + 1
+    return [p for p in parts if p]
+
+
+def _select(nodes, classes: set) -> list:
+    """쓰는 선택자만 남긴 규칙 목록. at-rule(@font-face, @keyframes)은 나중에 따로 고릅니다."""
+    kept = []
+    for prelude, body in nodes:
+        if isinstance(body, list):
+            inner = _select(body, classes)
+            if inner:
+                kept.append((prelude, inner))
+        elif body is not None and not prelude.startswith("@"):
+            selectors = [s for s in _split_selectors(prelude) if selector_used(s, classes)]
+            if selectors and body:
+                kept.append((",".join(selectors), body))
+    return kept
+
+
+def _declarations(nodes) -> str:
+    return " ".join(body if isinstance(body, str) else _declarations(body) for _, body in nodes)
+
+
+def _at_rules(nodes, declarations: str) -> list:
+    """남은 규칙이 참조하는 @font-face와 @keyframes."""
+    kept = []
+    for prelude, body in nodes:
+        if not isinstance(body, str):
+            continue
+        if prelude == "@font-face":
+            family = re.search(r"font-family\s*:\s*([^;]+)", body)
+            name = family.group(1).strip().strip("\"'") if family else ""
+            if name and re.search(r"font-family\s*:[^;]*\b" + re.escape(name) + r"\b", declarations):
+                kept.append((prelude, body))
+        elif re.match(r"@(-\w+-)?keyframes\s", prelude):
+            name = prelude.split()[-1]
+            if re.search(r"animation(-name)?\s*:[^;]*\b" + re.escape(name) + r"\b", declarations):
+                kept.append((prelude, body))
+    return kept
+
+
+def render(nodes) -> str:
+    out = []
+    for prelude, body in nodes:
+        if isinstance(body, list):
+            out.append(f"{prelude}{{{render(body)}}}")
+        else:
+            out.append(f"{prelude}{{{body}}}")
+    return "".join(out)
+
+
+# --- 폰트 ---
+def _font_src(body: str, base: str, out_dir: str) -> str:
+    """@font-face의 src를 woff2/woff만 남기고 로컬 파일(없으면 원래 위치의 절대 URL)로 바꿉니다."""
+    sources = []
+    for ref in re.findall(r"url\([^)]*\)\s*format\([^)]*\)", body):
+        fmt = re.search(r"format\(\s*[\"']?([\w-]+)", ref).group(1)
+        if fmt not in FONT_FORMATS:
+            continue
+        url = URL.search(ref).group(2)
+        sources.append((FONT_FORMATS.index(fmt), fmt, url))
+    if not sources:
+        return body
+    rewritten = []
+    for _, fmt, url in sorted(sources):
+        clean = url.split("?")[0].split("#")[0]
+        rewritten.append(f'url("{_copy_font(clean, base, out_dir)}") format("{fmt}")')
+    body = re.sub(r"src\s*:[^;}]*;?", "", body).strip(";")
+    return "src:" + ",".join(rewritten) + ";" + body
+
+
+def _copy_font(url: str, base: str, out_dir: str) -> str:
+    """폰트 파일을 out_dir/fonts/로 가져오고 스타일시트 기준 상대 경로를 돌려줍니다. 실패하면 절대 URL."""
+    name = os.path.basename(url)
+    target = os.path.join(out_dir, "fonts", name)
+    source = urllib.parse.urljoin(base, url)
+    os.makedirs(os.path.dirname(target), exist_ok=True)
+    try:
+        if source.startswith(("http://", "https://")):
+            with urllib.request.urlopen(source, timeout=30) as resp, open(target, "wb") as f:
+                shutil.copyfileobj(resp, f)
+        else:
+            shutil.copyfile(urllib.parse.unquote(source.removeprefix("file://")), target)
+    except OSError as e:
+        print(f"폰트를 가져오지 못해 원래 주소를 씁니다 ({name}): {e}")
+        return source if source.startswith(("http://", "https://")) else url
+    return f"fonts/{name}"
+
+
+# --- 빌드 ---
+def build_stylesheet(source: str = SEMANTIC_URL, out_dir: str = CSS_DIR, sources=SOURCES):
+    """필요한 규칙만 담은 스타일시트를 만들고 (경로, 원본 크기, 결과 크기)를 돌려줍니다."""
+    if source.startswith(("http://", "https://")):
+        with urllib.request.urlopen(source, timeout=30) as resp:
+            css = resp.read().decode("utf-8")
+        base = source
+    else:
+        with open(source, encoding="utf-8") as f:
+            css = f.read()
+        base = "file://" + urllib.request.pathname2url(os.path.abspath(source))
+
+    os.makedirs(out_dir, exist_ok=True)
+    nodes = parse(css)
+    rules = _select(nodes, used_classes(sources))
+    at_rules = _at_rules(nodes, _declarations(rules))
+    at_rules = [(p, _font_src(b, base, out_dir) if p == "@font-face" else b) for p, b in at_rules]
+    text = render(at_rules + rules) + PAGE_CSS + "\n"
+
+    data = text.encode("utf-8")
+    path = os.path.join(out_dir, f"semantic-{hashlib.sha256(data).hexdigest()[:12]}.css")
+    tmp_path = f"{path}.{os.getpid()}.tmp"
+    with open(tmp_path, "wb") as f:
+        f.write(data)
+    os.replace(tmp_path, path)
+    for old in glob.glob(os.path.join(out_dir, "semantic-*.css")):
+        if old != path:
+            os.remove(old)
+    return path, len(css.encode("utf-8")), len(data)
+
+
+# --- 페이지에서 쓰기 ---
+def stylesheet_url(css_dir: str = CSS_DIR, url_prefix: str = CSS_URL):
+    """빌드된 스타일시트가 있으면 브라우저가 받을 URL을, 없으면 None을 돌려줍니다."""
+    paths = glob.glob(os.path.join(css_dir, "semantic-*.css"))
+    if not paths:
+        return None
+    return f"{url_prefix}/{os.path.basename(max(paths, key=os.path.getmtime))}"
+
+
+def load_semantic_ui():
+    """Semantic UI 스타일을 적용합니다.
+
+    빌드된 스타일시트가 있으면 세션마다 한 번만 <head>에 <link>를 넣습니다. (rerun마다 다시 보내지 않음)
+    <head>는 Streamlit 화면 밖이라 이후 rerun이나 페이지 이동에도 남아 있습니다.
+    없으면 예전처럼 CDN의 전체 스타일시트를 씁니다.
+    """
+    import streamlit as st
+
+    url = stylesheet_url()
+    if url is None:
+        st.markdown(f'<link rel="stylesheet" href="{SEMANTIC_URL}"><style>{PAGE_CSS}</style>', unsafe_allow_html=True)
+        return
+    if st.session_state.get(SESSION_KEY) == url:
+        return
+    st.session_state[SESSION_KEY] = url
+    st.html(f"""
+        <script>
+        (function () {{
+            var href = new URL("{url}", document.baseURI).href;
+            var link = document.getElementById("semantic-ui-css");
+            if (!link) {{
+                link = document.createElement("link");
+                link.id = "semantic-ui-css";
+                link.rel = "stylesheet";
+                document.head.appendChild(link);
+            }}
+            if (link.href !== href) link.href = href;
+        }})();
+        </script>
+    """, unsafe_allow_javascript=True)
+
+
+if __name__ == "__main__":
+    src = sys.argv[1] if len(sys.argv) > 1 else SEMANTIC_URL
+    out = sys.argv[2] if len(sys.argv) > 2 else CSS_DIR
+    path, before, after = build_stylesheet(src, out)
+    print(f"{src} ({before / 1024:.0f} KB) -> {path} ({after / 1024:.1f} KB)")
@@ -0,0 +1,275 @@
+"""MBTI 데이터셋 바이너리 포맷 (빌드 단계 + 읽기)
+
+CSV를 한 번 컴파일해 두면 각 Streamlit 워커 프로세스가 np.memmap으로 같은 파일을
+열어 OS 페이지 캐시를 공유합니다. (프로세스마다 pd.read_csv + 복사본을 만들지 않음)
+유형 행렬뿐 아니라 성향 축/기질 파생 컬럼, 정렬 순서, 순위, 백분위, 표준점수도 빌드 시점에
+계산해 넣어 두므로, 워커는 파일을 열 때 아무것도 다시 계산하거나 복사하지 않습니다.
+
+파일 구조 (리틀 엔디언)
+    [헤더 104바이트]
+        magic       8s   b"MBTIBIN\\0"
+        version     u32
+        rows        u32  나라 수
+        cols        u32  유형 컬럼 수
+        reserved    u32
+        names_len   u64  이름 블록 길이 (UTF-8 JSON)
+        sha256      32s  데이터 체크섬 (dataset_checksum: 유형/나라/ISO-3 이름 + 유형 행렬, CSV 경로와 같은 정의)
+        csv_size    u64  빌드에 쓴 CSV 파일의 크기
+        csv_sha256  32s  빌드에 쓴 CSV 파일 내용(바이트)의 sha256
+    [이름 블록]   {"columns": [...], "countries": [...], "iso3": [...], "derived": [...], "arrays": {...}, "size": n}
+    [패딩]        배열이 64바이트 경계에서 시작하도록 0으로 채움
+    [배열들]      ARRAYS 순서, 각각 64바이트 경계에서 시작 (arrays는 데이터 시작점 기준 오프셋)
+        values      float32 (전체 컬럼 x rows) - 유형 컬럼 + 파생 컬럼, 컬럼 하나가 연속된 메모리
+        order       int32   (전체 컬럼 x rows) - 컬럼별 내림차순 정렬 순서 (stable)
+        rank        int32   (전체 컬럼 x rows) - 나라별 순위 (1위부터, 동률이면 같은 순위)
+        percentile  float64 (전체 컬럼 x rows) - 자기보다 값이 작은 나라의 비율 (0~100)
+        zscore      float64 (전체 컬럼 x rows)
+        means/stds  float64 (전체 컬럼)
+
+파일을 열 때는 헤더와 파일 크기만 확인하고, 체크섬은 헤더에 저장된 값을 그대로 씁니다.
+바이너리 파일이 CSV와 맞는지(is_fresh)는 수정 시각이 아니라 헤더의 CSV 크기와 sha256으로 판단합니다.
+(rsync -a, tar, git checkout처럼 더 오래된 수정 시각으로 CSV가 바뀌어도 다시 빌드됩니다)
+
+사용법:
+    python dataset_bin.py [입력 CSV] [출력 BIN]
+"""
+import hashlib
+import io
+import json
+import os
+import struct
+import sys
+
+import numpy as np
+
+import country_codes
+import dichotomy
+
+MAGIC = b"MBTIBIN\0"
+VERSION = 4
+HEADER = struct.Struct("<8sIIIIQ32sQ32s")
+ALIGN = 64
+# (이름, dtype, 컬럼별 행렬이면 True / 컬럼별 값 하나면 False)
+ARRAYS = (
+    ("values", np.float32, True),
+    ("order", np.int32, True),
+    ("rank", np.int32, True),
+    ("percentile", np.float64, True),
+    ("zscore", np.float64, True),
+    ("means", np.float64, False),
+    ("stds", np.float64, False),
+)
+
+CSV_PATH = "countriesMBTI_16types.csv"
+BIN_PATH = "countriesMBTI_16types.bin"
+
+
+class DatasetFormatError(ValueError):
+    """바이너리 파일이 손상되었거나 포맷이 맞지 않을 때 발생합니다."""
+
+
+def _align(n: int) -> int:
+    return (n + ALIGN - 1) // ALIGN * ALIGN
+
+
+def _data_offset(names_len: int) -> int:
+    return _align(HEADER.size + names_len)
+
+
+# --- 데이터 정의 (CSV 경로와 바이너리 경로가 같이 씀) ---
+def read_csv(csv_path: str = CSV_PATH):
+    """CSV를 읽어 (countries, columns, values, iso3, unmatched)를 돌려줍니다. values는 (rows x cols) float32.
+
+    csv_path 대신 파일 객체(이미 읽은 바이트의 io.BytesIO 등)를 줄 수도 있습니다.
+    """
+    import pandas as pd  # 빌드 단계와 CSV 대체 경로에서만 필요 (앱은 memmap으로 읽으므로 pandas 없이 엽니다)
+
+    df = pd.read_csv(csv_path)
+    columns = [c for c in df.columns if c != "Country"]
+    countries = df["Country"].tolist()
+    # 지도가 렌더링마다 이름을 매칭하지 않도록 ISO-3 코드를 한 번만 계산합니다.
+    iso3, unmatched = country_codes.resolve(countries)
+    values = np.ascontiguousarray(df[columns].to_numpy(dtype=np.float32))
+    return countries, columns, values, iso3, unmatched
+
+
+def csv_fingerprint(csv_path: str = CSV_PATH):
+    """CSV 파일의 (크기, 내용 sha256 32바이트). 바이너리 파일이 이 CSV로 빌드되었는지 확인할 때 씁니다."""
+    digest = hashlib.sha256()
+    size = 0
+    with open(csv_path, "rb") as f:
+        for block in iter(lambda: f.read(1 << 20), b""):
+            digest.update(block)
+            size += len(block)
+    return size, digest.digest()
+
+
+def _names(columns, countries, iso3) -> bytes:
+    return json.dumps({"columns": list(columns), "countries": list(countries), "iso3": list(iso3)},
+                      ensure_ascii=False).encode("utf-8")
+
+
+def dataset_checksum(countries, columns, values, iso3) -> str:
+    """데이터 체크섬: 이름 블록(유형, 나라, ISO-3) + float32 유형 행렬(컬럼 우선)의 sha256.
+
+    CSV를 직접 읽든 바이너리 파일을 열든 같은 데이터면 같은 값이 나오므로
+    데이터 변경 감지(mbti_data.IndexStore)와 체크섬 키 캐시가 경로에 상관없이 맞습니다.
+    """
+    matrix = np.ascontiguousarray(np.asarray(values, dtype=np.float32).T)
+    return hashlib.sha256(_names(columns, countries, iso3) + matrix.tobytes()).hexdigest()
+
+
+def derive_arrays(values, types) -> dict:
+    """유형 행렬(rows x 유형)에서 인덱스가 쓰는 배열을 모두 계산합니다. 행렬은 (rows x 전체 컬럼) 모양입니다.
+
+    - columns / derived: 전체 컬럼 이름과 그중 파생 컬럼 이름 (dichotomy.py)
+    - values: 유형 컬럼 + 파생 컬럼 (파생 컬럼은 소속 행렬과의 행렬곱 한 번)
+    - order: 컬럼별 내림차순 정렬 순서 (동률이면 원래 순서, stable 정렬)
+    - rank: 나라별 순위 (동률이면 같은 순위, 다음 순위는 건너뜀: 1, 2, 2, 4)
+    - percentile: 그 컬럼 값이 자기보다 작은 나라의 비율 (동률이면 같은 값)
+    - zscore / means / stds
+    """
+    values = np.asarray(values, dtype=np.float32)
+    derived_columns, derived = dichotomy.derive(values, list(types))
+    full = np.hstack([values, derived]) if derived_columns else values
+    n, cols = full.shape
+    order = np.argsort(-full, axis=0, kind="stable").astype(np.int32)
+    # 순위와 백분위는 동률이면 같은 값입니다. 오름차순 정렬한 컬럼에서 이진 탐색으로
+    # 자기보다 작은 값의 수(lower)와 큰 값의 수(n - upper)를 셉니다.
+    ascending = np.sort(full, axis=0)
+    rank = np.empty((n, cols), dtype=np.int32)
+    lower = np.empty((n, cols), dtype=np.int32)
+    for j in range(cols):
+        lower[:, j] = np.searchsorted(ascending[:, j], full[:, j], side="left")
+        rank[:, j] = n - np.searchsorted(ascending[:, j], full[:, j], side="right") + 1
+    means = full.mean(axis=0, dtype=np.float64)
+    stds = full.std(axis=0, dtype=np.float64)
+    return {
+        "columns": list(types) + derived_columns,
+        "derived": derived_columns,
+        "values": full,
+        "order": order,
+        "rank": rank,
+        "percentile": lower / max(1, n - 1) * 100,
+        "zscore": (full - means) / np.where(stds > 0, stds, 1),
+        "means": means,
+        "stds": stds,
+    }
+
+
+# --- 빌드 ---
+def write_dataset(csv_path: str = CSV_PATH, out_path: str = BIN_PATH):
+    """CSV를 읽어 바이너리 파일로 저장하고 (체크섬 hex, ISO-3 매칭 실패한 나라 목록)을 돌려줍니다."""
+    # 파일을 한 번만 읽어, 헤더의 CSV 크기/sha256과 행렬이 같은 바이트에서 나오게 합니다.
+    with open(csv_path, "rb") as f:
+        raw = f.read()
+    countries, columns, values, iso3, unmatched = read_csv(io.BytesIO(raw))
+    checksum = dataset_checksum(countries, columns, values, iso3)
+    arrays = derive_arrays(values, columns)
+
+    # 배열은 모두 컬럼 우선(전체 컬럼 x rows)으로 저장해, 읽을 때 .T 뷰 하나로 (rows x 컬럼)이 됩니다.
+    blobs, offsets, size = [], {}, 0
+    for name, dtype, per_row in ARRAYS:
+        array = np.asarray(arrays[name], dtype=dtype)
+        data = np.ascontiguousarray(array.T if per_row else array).tobytes()
+        size = _align(size)
+        offsets[name] = size
+        blobs.append((size, data))
+        size += len(data)
+    meta = json.loads(_names(columns, countries, iso3))
+    meta.update(derived=arrays["derived"], arrays=offsets, size=size)
+    names = json.dumps(meta, ensure_ascii=False).encode("utf-8")
+    start = _data_offset(len(names))
+    header = HEADER.pack(MAGIC, VERSION, len(countries), len(columns), 0, len(names), bytes.fromhex(checksum),
+                         len(raw), hashlib.sha256(raw).digest())
+
+    # 다른 프로세스가 반쯤 쓴 파일을 열지 않도록 임시 파일에 쓴 뒤 교체합니다.
+    # (여러 워커가 동시에 다시 빌드해도 임시 파일이 겹치지 않도록 pid를 붙입니다)
+    tmp_path = f"{out_path}.{os.getpid()}.tmp"
+    with open(tmp_path, "wb") as f:
+        f.write(header)
+        f.write(names)
+        for offset, data in blobs:
+            f.write(b"\0" * (start + offset - f.tell()))
+            f.write(data)
+    os.replace(tmp_path, out_path)
+    return checksum, unmatched
+
+
+# --- 읽기 ---
+def _read_header(f):
+    raw = f.read(HEADER.size)
+    if len(raw) < HEADER.size:
+        raise DatasetFormatError("헤더가 잘렸습니다.")
+    magic, version, rows, cols, _, names_len, digest, csv_size, csv_digest = HEADER.unpack(raw)
+    if magic != MAGIC or version != VERSION:
+        raise DatasetFormatError("지원하지 않는 파일 포맷입니다.")
+    return rows, cols, names_len, digest, csv_size, csv_digest
+
+
+def open_dataset(path: str = BIN_PATH) -> dict:
+    """바이너리 파일을 열어 인덱스가 쓰는 값을 돌려줍니다. (행렬은 복사하지 않는 읽기 전용 memmap 뷰)
+
+    돌려주는 dict: countries, types, columns, derived, iso3, checksum과 derive_arrays의 배열들.
+    행렬 배열은 (rows x 전체 컬럼) 모양의 .T 뷰입니다. 헤더와 파일 크기만 확인하고 내용은 해시하지 않습니다.
+    """
+    with open(path, "rb") as f:
+        rows, cols, names_len, digest, _, _ = _read_header(f)
+        try:
+            meta = json.loads(f.read(names_len).decode("utf-8"))
+        except ValueError as e:
+            raise DatasetFormatError(f"이름 블록을 읽지 못했습니다: {e}") from None
+        size = os.fstat(f.fileno()).st_size
+    start = _data_offset(names_len)
+    if size != start + meta.get("size", -1):
+        raise DatasetFormatError("파일 크기가 맞지 않습니다. (쓰다 만 파일)")
+
+    buffer = np.memmap(path, dtype=np.uint8, mode="r")
+    total = len(meta["columns"]) + len(meta["derived"])
+    dataset = {
+        "countries": meta["countries"],
+        "types": meta["columns"],
+        "columns": meta["columns"] + meta["derived"],
+        "derived": meta["derived"],
+        "iso3": meta["iso3"],
+        "checksum": digest.hex(),
+    }
+    for name, dtype, per_row in ARRAYS:
+        offset = start + meta["arrays"][name]
+        count = total * rows if per_row else total
+        array = buffer[offset:offset + count * np.dtype(dtype).itemsize].view(dtype)
+        dataset[name] = array.reshape(total, rows).T if per_row else array
+    return dataset
+
+
+def read_checksum(path: str = BIN_PATH) -> str:
+    """헤더만 읽어 체크섬 hex를 돌려줍니다. (행렬은 읽지 않음)"""
+    with open(path, "rb") as f:
+        return _read_header(f)[3].hex()
+
+
+def is_fresh(bin_path: str = BIN_PATH, csv_path: str = CSV_PATH) -> bool:
+    """바이너리 파일이 있고, 지금 포맷이며, 지금의 CSV로 빌드되었으면 True.
+
+    바이너리 파일은 헤더만 읽고, 헤더의 CSV 크기가 같을 때만 CSV 내용의 sha256을 비교합니다.
+    수정 시각은 보지 않습니다. (CSV가 없으면 바이너리 파일을 그대로 씁니다)
+    """
+    try:
+        with open(bin_path, "rb") as f:
+            _, _, _, _, csv_size, csv_digest = _read_header(f)
+    except (OSError, DatasetFormatError):
+        return False
+    try:
+        if os.path.getsize(csv_path) != csv_size:
+            return False
+        return csv_fingerprint(csv_path) == (csv_size, csv_digest)
+    except OSError:
+        return not os.path.exists(csv_path)
+
+
+if __name__ == "__main__":
+    src = sys.argv[1] if len(sys.argv) > 1 else CSV_PATH
+    dst = sys.argv[2] if len(sys.argv) > 2 else BIN_PATH
+    checksum, unmatched = write_dataset(src, dst)
+    print(f"{src} -> {dst} (sha256 {checksum})")
+    print(country_codes.report(unmatched))
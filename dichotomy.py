@@ -0,0 +1,73 @@
+import numpy as np
+
+# 성향 축(E/I, S/N, T/F, J/P)과 기질 그룹(NT, NF, SJ, SP) 파생 컬럼
+# "가장 내향적인 나라"처럼 여러 유형을 더해야 하는 질문을 위해, 16개 유형 행렬에
+# (유형 x 파생 컬럼) 0/1 소속 행렬을 한 번 곱해 12개 파생 비율을 데이터 로드 시 만들어 둡니다.
+# 파생 컬럼은 일반 유형 컬럼과 똑같이 정렬/선택할 수 있습니다. (mbti_data.RankingIndex)
+AXES = (("E", "I"), ("S", "N"), ("T", "F"), ("J", "P"))
+TEMPERAMENTS = {
+    "NT": ("N", "T"),
+    "NF": ("N", "F"),
+    "SJ": ("S", "J"),
+    "SP": ("S", "P"),
+}
+FEATURES = [letter for axis in AXES for letter in axis] + list(TEMPERAMENTS)
+
+LABELS = {
+    "E": "E (외향형 전체)",
+    "I": "I (내향형 전체)",
+    "S": "S (감각형 전체)",
+    "N": "N (직관형 전체)",
+    "T": "T (사고형 전체)",
+    "F": "F (감정형 전체)",
+    "J": "J (판단형 전체)",
+    "P": "P (인식형 전체)",
+    "NT": "NT (분석가형)",
+    "NF": "NF (외교관형)",
+    "SJ": "SJ (관리자형)",
+    "SP": "SP (탐험가형)",
+}
+
+DESCRIPTIONS = {
+    "E": "외향형 - 사람들과 어울리며 에너지를 얻는 E로 시작하는 8개 유형의 합입니다.",
+    "I": "내향형 - 혼자만의 시간에서 에너지를 얻는 I로 시작하는 8개 유형의 합입니다.",
+    "S": "감각형 - 오감과 경험, 현재의 사실에 집중하는 S 유형 8개의 합입니다.",
+    "N": "직관형 - 가능성과 의미, 미래를 먼저 보는 N 유형 8개의 합입니다.",
+    "T": "사고형 - 논리와 원칙으로 판단하는 T 유형 8개의 합입니다.",
+    "F": "감정형 - 사람과 관계, 가치를 기준으로 판단하는 F 유형 8개의 합입니다.",
+    "J": "판단형 - 계획적이고 체계적인 생활을 선호하는 J 유형 8개의 합입니다.",
+    "P": "인식형 - 유연하고 즉흥적인 생활을 선호하는 P 유형 8개의 합입니다.",
+    "NT": "분석가형 - INTJ, INTP, ENTJ, ENTP. 지적 호기심과 전략적 사고가 강한 그룹입니다.",
+    "NF": "외교관형 - INFJ, INFP, ENFJ, ENFP. 공감과 이상을 중시하는 그룹입니다.",
+    "SJ": "관리자형 - ISTJ, ISFJ, ESTJ, ESFJ. 책임감 있고 질서를 중시하는 그룹입니다.",
+    "SP": "탐험가형 - ISTP, ISFP, ESTP, ESFP. 현실적이고 즉흥적인 행동파 그룹입니다.",
+}
+
+ICONS = {
+    "E": "📣", "I": "🤫", "S": "🔍", "N": "💭",
+    "T": "🧠", "F": "💗", "J": "📅", "P": "🎈",
+    "NT": "🧪", "NF": "🕊️", "SJ": "🏛️", "SP": "🧭",
+}
+
+
+def label(column: str) -> str:
+    """선택지에 보여줄 이름 (유형 컬럼은 그대로)."""
+    return LABELS.get(column, column)
+
+
+def membership(types):
+    """(유형 수 x 파생 컬럼 수) 0/1 행렬과 파생 컬럼 이름. 속한 유형이 없는 파생 컬럼은 뺍니다."""
+    groups = [{letter} for axis in AXES for letter in axis] + [set(pair) for pair in TEMPERAMENTS.values()]
+    weights = np.zeros((len(types), len(FEATURES)), dtype=np.float32)
+    for j, mbti in enumerate(types):
+        letters = set(mbti.upper()) if len(mbti) == 4 else set()
+        weights[j] = [group <= letters for group in groups]
+    keep = weights.any(axis=0)
+    return weights[:, keep], [name for name, k in zip(FEATURES, keep) if k]
+
+
+def derive(values, types):
+    """유형 행렬(rows x 유형)에서 파생 컬럼 행렬(rows x 파생)을 행렬곱 한 번으로 만듭니다."""
+    weights, names = membership(types)
+    values = np.asarray(values)
+    return names, values @ weights.astype(values.dtype)
@@ -0,0 +1,107 @@
+import logging
+import threading
+import time
+from collections import deque
+
+import http_client
+import metrics
+
+# 프로세스 전체가 공유하는 강아지 이미지 피드
+# 세션마다 10초에 한 번씩 Dog API를 부르던 것을, 프로세스당 백그라운드 스레드 하나가
+# 다음 이미지 URL들을 미리 받아 두고 정해진 주기로 돌려 주는 방식으로 바꿉니다.
+# 각 세션은 current()로 현재 URL만 읽으므로 외부 API 호출을 기다리지 않습니다.
+DOG_API_URL = "https://dog.ceo/api/breeds/image/random"
+
+logger = logging.getLogger(__name__)
+
+
+@metrics.timed("fetch_dog_image_url")
+def fetch_dog_image_url(api_url: str = DOG_API_URL):
+    """Dog API에서 랜덤 강아지 이미지 URL을 가져옵니다. 실패하면 None."""
+    try:
+        data = http_client.get_json(api_url)
+        return data.get("message")
+    except Exception as e:
+        logger.warning("강아지 이미지 API 호출 중 오류 발생: %s", e)
+        return None
+
+
+class DogImageFeed:
+    """interval초마다 다음 이미지로 넘어가는 공유 피드입니다.
+
+    - prefetch: 미리 받아 둘 URL 개수
+    - fetch: URL을 가져오는 함수 (테스트에서는 로컬 스텁 서버를 가리키도록 바꿔 끼웁니다)
+    - resolve: 받은 이미지 URL을 브라우저에 줄 URL로 바꾸는 함수 (예: ImageCache.local_url)
+    """
+
+    def __init__(self, api_url: str = DOG_API_URL, interval: float = 10, prefetch: int = 3, fetch=None, resolve=None):
+        self.api_url = api_url
+        self.interval = interval
+        self.prefetch = prefetch
+        self._fetch = fetch or fetch_dog_image_url
+        self._resolve = resolve
+        self._upcoming = deque()
+        self._current = None
+        self._version = 0
+        self._updated_at = 0.0
+        self._lock = threading.Lock()
+        self._ready = threading.Event()
+        self._stop = threading.Event()
+        self._thread = None
+
+    # --- 세션에서 읽는 부분 ---
+    def current(self):
+        """현재 이미지 URL (아직 없으면 None)."""
+        return self._current
+
+    def version(self) -> int:
+        """이미지가 바뀔 때마다 1씩 증가하는 번호."""
+        return self._version
+
+    def seconds_until_next(self) -> float:
+        return max(0.0, self._updated_at + self.interval - time.time())
+
+    def wait_ready(self, timeout: float = None) -> bool:
+        return self._ready.wait(timeout)
+
+    # --- 백그라운드 스레드 ---
+    def start(self):
+        if self._thread is None:
+            self._thread = threading.Thread(target=self._run, name="dog-image-feed", daemon=True)
+            self._thread.start()
+        return self
+
+    def stop(self):
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+
+    def _fill(self):
+        """미리 받아 둔 URL이 prefetch개가 될 때까지 채웁니다."""
+        while len(self._upcoming) < self.prefetch and not self._stop.is_set():
+            url = self._fetch(self.api_url)
+            if not url:
+                break  # API 오류 시 다음 주기에 다시 시도
+            if self._resolve:
+                url = self._resolve(url)
+            self._upcoming.append(url)
+
+    def _advance(self):
+        with self._lock:
+            if self._upcoming:
+                self._current = self._upcoming.popleft()
+                self._version += 1
+            self._updated_at = time.time()
+        if self._current:
+            self._ready.set()
+
+    def _run(self):
+        self._fill()
+        self._advance()
+        while not self._stop.is_set():
+            # 다음 교체 시각 전에 미리 채워 두고, 남은 시간만큼 기다립니다.
+            self._fill()
+            if self._stop.wait(self.seconds_until_next()):
+                break
+            self._advance()
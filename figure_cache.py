@@ -0,0 +1,161 @@
+import threading
+
+import plotly.express as px
+import plotly.graph_objects as go
+
+import metrics
+
+# 유형별 Plotly 그림 캐시 (pages/03-finally.py)
+# 데이터는 고정이고 선택지는 16개뿐이므로, 세계 지도는 기본 그림을 한 번만 만들고
+# 유형마다 색상 배열(z)과 제목만 바꿔 끼웁니다. 만든 그림은 유형별로 보관합니다.
+# 직렬화한 JSON은 따로 보관하지 않습니다. st.plotly_chart는 Figure만 받아 rerun마다 직접
+# 다시 검사하고 직렬화하므로 보관본을 넘길 방법이 없고, 그 비용도 작습니다.
+# (158개 나라 기준 한 번에 지도 to_json 3.8ms + 검사 1.7ms, 막대 2.1ms + 1.3ms.
+#  캐시 없이 그림을 새로 만들 때는 지도 68ms, 막대 50ms로, 보관할 가치가 있는 쪽은 Figure입니다)
+# 나라 위치는 미리 계산된 ISO-3 코드로 지정하고, 로컬 geometry(geo_assets.py)가 있으면
+# CDN의 world topojson 대신 그 파일을 씁니다.
+MAP_LAYOUT = dict(
+    paper_bgcolor="#0e1117",  # 스트림릿 다크모드 배경색 일치
+    geo=dict(bgcolor="#0e1117"),
+    font=dict(color="white"),
+    margin={"r": 0, "t": 40, "l": 0, "b": 0},
+)
+BAR_LAYOUT = dict(
+    paper_bgcolor="rgba(0,0,0,0)",
+    plot_bgcolor="rgba(0,0,0,0)",
+    font=dict(color="white"),
+    xaxis_title="",
+    yaxis_title="비율",
+    showlegend=False,
+)
+
+
+def map_title(mbti: str) -> str:
+    return f"전 세계 {mbti} 분포도"
+
+
+def cluster_title(k: int) -> str:
+    return f"MBTI 분포로 나눈 {k}개 나라 군집"
+
+
+class FigureCache:
+    """RankingIndex 하나에 대한 유형별 지도/막대 그림 캐시입니다."""
+
+    def __init__(self, index, top_k: int = 5, geometry_url: str = None):
+        self.index = index
+        self.top_k = top_k
+        self.geometry_url = geometry_url
+        self._base_map = None
+        self._base_column = None
+        self._maps = {}
+        self._bars = {}
+        self._clusters = {}
+        self._lock = threading.Lock()
+
+    def _location(self) -> dict:
+        if self.geometry_url:
+            # 로컬 geometry: feature id가 ISO-3 코드, 기본 지도 레이어는 숨깁니다.
+            return dict(geojson=self.geometry_url, featureidkey="id")
+        return dict(locationmode="ISO-3")
+
+    def _build_base_map(self):
+        """기본 지도: 나라 위치와 지도 설정은 모든 유형이 같으므로 한 번만 만듭니다."""
+        column = self.index.columns[0]
+        location = self._location()
+        fig = px.choropleth(
+            self.index.frame,
+            locations="ISO3",
+            color=column,
+            hover_name="Country",
+            hover_data={"ISO3": False},
+            color_continuous_scale=px.colors.sequential.Plasma,  # 화려한 컬러 스케일
+            title=map_title(column),
+            projection="natural earth",
+            **location,
+        )
+        fig.update_layout(**MAP_LAYOUT)
+        if self.geometry_url:
+            fig.update_geos(visible=False)
+        self._base_map = fig
+        self._base_column = column
+
+    @metrics.timed("map_figure")
+    def map_figure(self, mbti: str) -> go.Figure:
+        """유형별 지도: 기본 지도를 복사해 색상 배열과 라벨만 바꿉니다."""
+        fig = self._maps.get(mbti)
+        if fig is not None:
+            return fig
+        with self._lock:
+            if mbti in self._maps:
+                return self._maps[mbti]
+            if self._base_map is None:
+                self._build_base_map()
+            j = self.index.column(mbti)
+            base_trace = self._base_map.data[0]
+            fig = go.Figure(self._base_map)
+            fig.update_traces(
+                z=self.index.values[:, j].astype(float),
+                hovertemplate=base_trace.hovertemplate.replace(f"{self._base_column}=", f"{mbti}="),
+            )
+            fig.update_layout(title_text=map_title(mbti), coloraxis_colorbar_title_text=mbti)
+            self._maps[mbti] = fig
+            return fig
+
+    @metrics.timed("bar_figure")
+    def bar_figure(self, mbti: str) -> go.Figure:
+        """유형별 상위 k개 나라 막대 그림."""
+        fig = self._bars.get(mbti)
+        if fig is not None:
+            return fig
+        fig = px.bar(
+            self.index.top_k(mbti, self.top_k),
+            x='Country',
+            y=mbti,
+            color=mbti,
+            color_continuous_scale='Viridis',
+            text_auto='.2%',
+        )
+        fig.update_layout(**BAR_LAYOUT)
+        self._bars[mbti] = fig
+        return fig
+
+    @metrics.timed("cluster_figure")
+    def cluster_figure(self, clustering) -> go.Figure:
+        """군집 번호로 나라를 칠한 지도. (체크섬, k)별로 한 번만 만듭니다."""
+        key = (clustering.checksum, clustering.k)
+        fig = self._clusters.get(key)
+        if fig is not None:
+            return fig
+        names = clustering.names(self.index.type_means)
+        frame = self.index.frame[["Country", "ISO3"]].assign(Cluster=[names[c] for c in clustering.labels])
+        fig = px.choropleth(
+            frame,
+            locations="ISO3",
+            color="Cluster",
+            hover_name="Country",
+            hover_data={"ISO3": False},
+            category_orders={"Cluster": names},
+            color_discrete_sequence=px.colors.qualitative.Bold,
+            title=cluster_title(clustering.k),
+            projection="natural earth",
+            **self._location(),
+        )
+        fig.update_layout(**MAP_LAYOUT, legend_title_text="")
+        if self.geometry_url:
+            fig.update_geos(visible=False)
+        self._clusters[key] = fig
+        return fig
+
+    def warm_up(self, background: bool = True):
+        """모든 유형의 그림을 미리 만들어 둡니다. background=True면 별도 스레드에서 실행합니다."""
+        def run():
+            for mbti in self.index.columns:
+                self.map_figure(mbti)
+                self.bar_figure(mbti)
+
+        if not background:
+            run()
+            return None
+        thread = threading.Thread(target=run, name="figure-warm-up", daemon=True)
+        thread.start()
+        return thread
@@ -0,0 +1,143 @@
+"""세계 지도 geometry 빌드 단계
+
+Plotly 기본 지도는 브라우저가 CDN에서 world topojson을 받아야 해서 느리고,
+인터넷이 막힌 환경에서는 지도가 뜨지 않습니다. Natural Earth 같은 나라 경계 GeoJSON을
+한 번 받아 두고 이 스크립트로 단순화(Douglas-Peucker)해서 static/geo/ 아래에 두면,
+지도는 Streamlit 정적 서빙(app/static/geo/...)으로 같은 서버에서 geometry를 받습니다.
+
+사용법:
+    python geo_assets.py ne_110m_admin_0_countries.geojson [출력 폴더]
+
+단순화 단계(GEOMETRY_LEVELS)마다 world_<단계>.geojson 파일이 만들어지고,
+각 feature의 id는 ISO-3 코드입니다. (country_codes.py와 같은 코드)
+"""
+import json
+import os
+import sys
+
+import numpy as np
+
+from country_codes import to_iso3
+
+GEO_DIR = os.path.join("static", "geo")
+GEO_URL = "app/static/geo"
+# 단계별 허용 오차 (경위도 단위). 값이 클수록 꼭짓점이 적습니다.
+GEOMETRY_LEVELS = {"low": 0.5, "medium": 0.1, "high": 0.02}
+COORD_DECIMALS = 3
+ISO3_PROPERTIES = ("ISO_A3", "ADM0_A3", "ISO_A3_EH", "iso_a3", "ISO3")
+NAME_PROPERTIES = ("NAME", "ADMIN", "NAME_LONG", "name")
+
+
+def simplify_ring(coords, tolerance: float) -> np.ndarray:
+    """Douglas-Peucker 단순화. 구간마다 모든 점까지의 거리를 NumPy로 한 번에 계산합니다."""
+    points = np.asarray(coords, dtype=np.float64)[:, :2]
+    n = len(points)
+    if n <= 4 or tolerance <= 0:
+        return points
+    keep = np.zeros(n, dtype=bool)
+    keep[0] = keep[-1] = True
+    stack = [(0, n - 1)]
+    while stack:
+        start, end = stack.pop()
+        if end - start < 2:
+            continue
+        segment = points[start + 1:end]
+        a, b = points[start], points[end]
+        ab = b - a
+        length = np.hypot(ab[0], ab[1])
+        if length == 0:
+            dist = np.hypot(segment[:, 0] - a[0], segment[:, 1] - a[1])
+        else:
+            dist = np.abs(ab[0] * (segment[:, 1] - a[1]) - ab[1] * (segment[:, 0] - a[0])) / length
+        i = int(np.argmax(dist))
+        if dist[i] > tolerance:
+            mid = start + 1 + i
+            keep[mid] = True
+            stack.append((start, mid))
+            stack.append((mid, end))
+    return points[keep]
+
+
+def _simplify_polygon(rings, tolerance: float):
+    result = []
+    for ring in rings:
+        simplified = simplify_ring(ring, tolerance)
+        if len(simplified) < 4:
+            if not result:
+                return None  # 바깥 경계가 사라지면 폴리곤 전체를 버립니다.
+            continue  # 너무 작아진 구멍은 버립니다.
+        result.append(np.round(simplified, COORD_DECIMALS).tolist())
+    return result
+
+
+def simplify_geometry(geometry: dict, tolerance: float):
+    if geometry["type"] == "Polygon":
+        polygons = [geometry["coordinates"]]
+    elif geometry["type"] == "MultiPolygon":
+        polygons = geometry["coordinates"]
+    else:
+        return None
+    simplified = [p for p in (_simplify_polygon(rings, tolerance) for rings in polygons) if p]
+    if not simplified:
+        # 작은 섬나라가 통째로 사라지지 않도록 가장 큰 폴리곤은 원본 그대로 남깁니다.
+        largest = max(polygons, key=lambda rings: len(rings[0]))
+        simplified = [[np.round(np.asarray(largest[0])[:, :2], COORD_DECIMALS).tolist()]]
+    return {"type": "MultiPolygon", "coordinates": simplified}
+
+
+def _feature_iso3(properties: dict):
+    for key in ISO3_PROPERTIES:
+        code = properties.get(key)
+        if code and code != "-99":
+            return code
+    for key in NAME_PROPERTIES:
+        if properties.get(key):
+            code = to_iso3(properties[key])
+            if code:
+                return code
+    return None
+
+
+def build_geometry(source_path: str, out_dir: str = GEO_DIR, levels: dict = GEOMETRY_LEVELS) -> dict:
+    """원본 GeoJSON에서 단계별 단순화 파일을 만들고 {단계: (파일 경로, 꼭짓점 수)}를 돌려줍니다."""
+    with open(source_path, encoding="utf-8") as f:
+        source = json.load(f)
+    os.makedirs(out_dir, exist_ok=True)
+
+    result = {}
+    for level, tolerance in levels.items():
+        features = []
+        vertices = 0
+        for feature in source["features"]:
+            properties = feature.get("properties") or {}
+            code = _feature_iso3(properties)
+            geometry = simplify_geometry(feature["geometry"], tolerance) if code and feature.get("geometry") else None
+            if geometry is None:
+                continue
+            vertices += sum(len(ring) for polygon in geometry["coordinates"] for ring in polygon)
+            name = next((properties[k] for k in NAME_PROPERTIES if properties.get(k)), code)
+            features.append({"type": "Feature", "id": code, "properties": {"name": name}, "geometry": geometry})
+
+        path = os.path.join(out_dir, f"world_{level}.geojson")
+        tmp_path = path + ".tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump({"type": "FeatureCollection", "features": features}, f, separators=(",", ":"))
+        os.replace(tmp_path, path)
+        result[level] = (path, vertices)
+    return result
+
+
+def geometry_url(level: str = "medium", geo_dir: str = GEO_DIR, url_prefix: str = GEO_URL):
+    """로컬 geometry 파일이 있으면 브라우저가 받을 URL을, 없으면 None을 돌려줍니다."""
+    if os.path.exists(os.path.join(geo_dir, f"world_{level}.geojson")):
+        return f"{url_prefix}/world_{level}.geojson"
+    return None
+
+
+if __name__ == "__main__":
+    if len(sys.argv) < 2:
+        print(__doc__)
+        sys.exit(1)
+    out = sys.argv[2] if len(sys.argv) > 2 else GEO_DIR
+    for level, (path, vertices) in build_geometry(sys.argv[1], out).items():
+        print(f"{level}: {path} ({vertices} vertices, {os.path.getsize(path) / 1024:.0f} KB)")
@@ -0,0 +1,186 @@
+import logging
+import os
+import threading
+import time
+from urllib.parse import urlsplit
+
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+import metrics
+
+# 공용 HTTP 클라이언트
+# 모든 페이지의 외부 호출(Dog API, 강아지 이미지, Lottie)이 이 모듈을 거칩니다.
+# - 커넥션 풀(keep-alive): 호출마다 TCP+TLS 핸드셰이크를 다시 하지 않습니다.
+# - 연결/읽기 타임아웃: 느린 서버 때문에 스크립트 스레드가 무한정 멈추지 않습니다.
+# - 재시도 + 백오프: 일시적인 5xx/연결 오류는 제한된 횟수만 다시 시도합니다.
+# - 서킷 브레이커: 호스트가 계속 실패하면 한동안 호출하지 않고 마지막 정상 값을 돌려줍니다.
+# MBTI_UPSTREAM_OVERRIDE 환경 변수를 주면 모든 외부 호출을 그 주소로 보냅니다.
+# (부하 테스트의 로컬 스텁 서버, 폐쇄망의 내부 미러 등. 경로와 쿼리는 그대로 유지)
+CONNECT_TIMEOUT = 3.05
+READ_TIMEOUT = 5
+RETRIES = 2
+BACKOFF = 0.3
+POOL_SIZE = 10
+FAILURE_THRESHOLD = 3
+RESET_TIMEOUT = 30
+UPSTREAM_OVERRIDE = os.environ.get("MBTI_UPSTREAM_OVERRIDE")
+
+logger = logging.getLogger(__name__)
+
+
+class CircuitOpenError(requests.RequestException):
+    """서킷 브레이커가 열려 있어 호출하지 않았을 때 발생합니다."""
+
+
+class CircuitBreaker:
+    """연속 실패가 threshold번 쌓이면 reset_timeout초 동안 호출을 막습니다.
+
+    시간이 지나면 한 번만 시험 호출을 허용하고(half-open), 성공하면 다시 닫힙니다.
+    """
+
+    def __init__(self, threshold: int = FAILURE_THRESHOLD, reset_timeout: float = RESET_TIMEOUT):
+        self.threshold = threshold
+        self.reset_timeout = reset_timeout
+        self.failures = 0
+        self.opened_at = None
+        self._trial = False
+        self._lock = threading.Lock()
+
+    @property
+    def state(self) -> str:
+        if self.opened_at is None:
+            return "closed"
+        if time.monotonic() - self.opened_at >= self.reset_timeout:
+            return "half-open"
+        return "open"
+
+    def allow(self) -> bool:
+        with self._lock:
+            state = self.state
+            if state == "closed":
+                return True
+            if state == "half-open" and not self._trial:
+                self._trial = True
+                return True
+            return False
+
+    def record_success(self):
+        with self._lock:
+            self.failures = 0
+            self.opened_at = None
+            self._trial = False
+
+    def record_failure(self):
+        with self._lock:
+            self.failures += 1
+            self._trial = False
+            if self.failures >= self.threshold:
+                self.opened_at = time.monotonic()
+
+
+class RedirectAdapter(HTTPAdapter):
+    """요청의 스킴과 호스트를 base_url로 바꿔 보내는 어댑터입니다."""
+
+    def __init__(self, base_url: str, **kwargs):
+        self.base_url = base_url.rstrip("/")
+        super().__init__(**kwargs)
+
+    def send(self, request, **kwargs):
+        parts = urlsplit(request.url)
+        request.url = self.base_url + parts.path + (f"?{parts.query}" if parts.query else "")
+        return super().send(request, **kwargs)
+
+
+class HttpClient:
+    """커넥션 풀, 타임아웃, 재시도, 호스트별 서킷 브레이커를 갖춘 HTTP 클라이언트입니다."""
+
+    def __init__(
+        self,
+        connect_timeout: float = CONNECT_TIMEOUT,
+        read_timeout: float = READ_TIMEOUT,
+        retries: int = RETRIES,
+        backoff: float = BACKOFF,
+        pool_size: int = POOL_SIZE,
+        failure_threshold: int = FAILURE_THRESHOLD,
+        reset_timeout: float = RESET_TIMEOUT,
+        upstream_override: str = UPSTREAM_OVERRIDE,
+    ):
+        self.timeout = (connect_timeout, read_timeout)
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        retry = Retry(
+            total=retries,
+            backoff_factor=backoff,
+            status_forcelist=(429, 500, 502, 503, 504),
+            allowed_methods=frozenset(["GET"]),
+            raise_on_status=False,
+        )
+        self._adapter_options = dict(pool_connections=pool_size, pool_maxsize=pool_size, max_retries=retry)
+        self.session = requests.Session()
+        if upstream_override:
+            self.redirect_to(upstream_override)
+        else:
+            adapter = HTTPAdapter(**self._adapter_options)
+            self.session.mount("http://", adapter)
+            self.session.mount("https://", adapter)
+        self._breakers = {}
+        self._last_good = {}
+        self._lock = threading.Lock()
+
+    def redirect_to(self, base_url: str):
+        """이후 모든 요청을 base_url로 보냅니다."""
+        adapter = RedirectAdapter(base_url, **self._adapter_options)
+        self.session.mount("http://", adapter)
+        self.session.mount("https://", adapter)
+
+    def breaker(self, url: str) -> CircuitBreaker:
+        host = urlsplit(url).netloc
+        with self._lock:
+            if host not in self._breakers:
+                self._breakers[host] = CircuitBreaker(self.failure_threshold, self.reset_timeout)
+            return self._breakers[host]
+
+    def get(self, url: str, **kwargs) -> requests.Response:
+        """GET 요청. 실패하면 requests.RequestException (서킷이 열려 있으면 CircuitOpenError)."""
+        breaker = self.breaker(url)
+        host = urlsplit(url).netloc
+        if not breaker.allow():
+            metrics.HTTP_REQUESTS.inc(host=host, outcome="circuit_open")
+            raise CircuitOpenError(f"서킷 브레이커가 열려 있습니다: {urlsplit(url).netloc}")
+        kwargs.setdefault("timeout", self.timeout)
+        try:
+            response = self.session.get(url, **kwargs)
+            response.raise_for_status()  # HTTP 오류가 있으면 예외 발생
+        except requests.RequestException:
+            breaker.record_failure()
+            metrics.HTTP_REQUESTS.inc(host=host, outcome="error")
+            raise
+        breaker.record_success()
+        metrics.HTTP_REQUESTS.inc(host=host, outcome="ok")
+        return response
+
+    def get_json(self, url: str, **kwargs):
+        """JSON 응답을 돌려줍니다. 실패하면 같은 URL의 마지막 정상 값을, 그것도 없으면 예외를 냅니다."""
+        try:
+            data = self.get(url, **kwargs).json()
+        except (requests.RequestException, ValueError) as e:
+            if url in self._last_good:
+                logger.warning("%s 호출 실패, 마지막 정상 값을 사용합니다: %s", url, e)
+                return self._last_good[url]
+            raise
+        self._last_good[url] = data
+        return data
+
+
+# 프로세스 전체가 공유하는 기본 클라이언트
+client = HttpClient()
+
+
+def get(url: str, **kwargs) -> requests.Response:
+    return client.get(url, **kwargs)
+
+
+def get_json(url: str, **kwargs):
+    return client.get_json(url, **kwargs)
@@ -0,0 +1,172 @@
+import hashlib
+import json
+import logging
+import os
+import threading
+
+import http_client
+
+# 디스크 이미지 캐시 (내용 주소 방식 + 크기 제한 LRU)
+# 받은 이미지는 내용의 sha256을 파일 이름으로 static/ 아래에 저장하고,
+# Streamlit 정적 파일 서빙(app/static/...)으로 브라우저에 내려줍니다.
+# 같은 원본 URL은 다시 내려받지 않고, 같은 내용은 한 번만 저장됩니다.
+# 원본 URL -> 파일 이름 목록(index)은 정적 서빙 폴더 밖(.cache)에 둡니다. (브라우저에 공개되지 않도록)
+CACHE_DIR = os.path.join("static", "dog_cache")
+STATIC_URL = "app/static/dog_cache"
+INDEX_PATH = os.path.join(".cache", "dog_cache_index.json")
+MAX_BYTES = 200 * 1024 * 1024
+
+logger = logging.getLogger(__name__)
+
+_EXTENSIONS = {"image/jpeg": ".jpg", "image/png": ".png", "image/gif": ".gif", "image/webp": ".webp"}
+
+
+class ImageCache:
+    """원본 URL -> 로컬 파일을 관리하는 디스크 캐시입니다.
+
+    - root: 저장 폴더 (Streamlit 정적 서빙 폴더 아래여야 합니다)
+    - url_prefix: 브라우저에서 root에 접근하는 경로
+    - max_bytes: 이 크기를 넘으면 가장 오래 쓰지 않은 이미지부터 (변형 파일과 함께) 지웁니다.
+    - index_path: 원본 URL -> 파일 이름 목록 (root 밖에 두세요)
+    """
+
+    def __init__(self, root: str = CACHE_DIR, url_prefix: str = STATIC_URL, max_bytes: int = MAX_BYTES,
+                 index_path: str = INDEX_PATH):
+        self.root = root
+        self.url_prefix = url_prefix
+        self.max_bytes = max_bytes
+        self._index_path = index_path
+        self._lock = threading.Lock()
+        os.makedirs(root, exist_ok=True)
+        os.makedirs(os.path.dirname(index_path) or ".", exist_ok=True)
+        self._urls = self._load_index()
+
+    @staticmethod
+    def _read_index(path: str):
+        try:
+            with open(path, encoding="utf-8") as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return None
+
+    def _load_index(self) -> dict:
+        urls = self._read_index(self._index_path)
+        if urls is not None:
+            return urls
+        # 예전 버전은 root/index.json에 저장했습니다. 공개 폴더에 남지 않도록 옮기고 지웁니다.
+        legacy_path = os.path.join(self.root, "index.json")
+        urls = self._read_index(legacy_path)
+        if urls is None:
+            return {}
+        self._urls = urls
+        self._save_index()
+        os.remove(legacy_path)
+        return self._urls
+
+    def _save_index(self, removed=()):
+        """인덱스를 임시 파일에 쓰고 rename으로 바꿔 끼웁니다. (self._lock을 잡은 채로 부릅니다)
+
+        같은 파일을 여러 워커 프로세스가 함께 쓰므로, 쓰기 전에 디스크의 인덱스를 읽어
+        다른 프로세스가 추가한 항목을 합칩니다. 이번에 지운 파일(removed)을 가리키는 항목은 뺍니다.
+        """
+        on_disk = self._read_index(self._index_path) or {}
+        merged = {u: n for u, n in on_disk.items() if n not in removed}
+        merged.update(self._urls)
+        self._urls = merged
+        tmp_path = f"{self._index_path}.{os.getpid()}.tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(merged, f)
+        os.replace(tmp_path, self._index_path)
+
+    def path(self, name: str) -> str:
+        return os.path.join(self.root, name)
+
+    def url(self, name: str) -> str:
+        return f"{self.url_prefix}/{name}"
+
+    def lookup(self, source_url: str):
+        """이미 받아 둔 이미지면 파일 이름을, 아니면 None을 돌려줍니다."""
+        with self._lock:
+            name = self._urls.get(source_url)
+            if not name:
+                return None
+            try:
+                os.utime(self.path(name))  # LRU: 마지막 사용 시각 갱신
+            except OSError:
+                return None  # 다른 프로세스가 이미 지운 파일
+            return name
+
+    def put(self, source_url: str, content: bytes, content_type: str = "") -> str:
+        """이미지 내용을 저장하고 파일 이름(sha256 + 확장자)을 돌려줍니다."""
+        ext = _EXTENSIONS.get(content_type.split(";")[0].strip()) or os.path.splitext(source_url)[1].lower() or ".jpg"
+        name = hashlib.sha256(content).hexdigest() + ext
+        with self._lock:
+            if not os.path.exists(self.path(name)):
+                tmp_path = f"{self.path(name)}.{os.getpid()}.tmp"
+                with open(tmp_path, "wb") as f:
+                    f.write(content)
+                os.replace(tmp_path, self.path(name))
+            else:
+                os.utime(self.path(name))
+            self._urls[source_url] = name
+            self._save_index(self._evict())
+        return name
+
+    def evict(self):
+        """크기 제한을 다시 적용합니다. 이미지 옆에 변형 파일을 쓴 뒤(image_variants.py) 부릅니다."""
+        with self._lock:
+            removed = self._evict()
+            if removed:
+                self._save_index(removed)
+
+    def fetch(self, source_url: str):
+        """캐시에 있으면 그대로, 없으면 내려받아 저장한 뒤 파일 이름을 돌려줍니다. 실패하면 None."""
+        name = self.lookup(source_url)
+        if name:
+            return name
+        try:
+            response = http_client.get(source_url)
+        except Exception as e:
+            logger.warning("이미지 다운로드 실패 (%s): %s", source_url, e)
+            return None
+        return self.put(source_url, response.content, response.headers.get("Content-Type", ""))
+
+    def local_url(self, source_url: str):
+        """원본 URL 대신 브라우저에 줄 로컬 URL. 실패하면 원본 URL을 그대로 돌려줍니다."""
+        name = self.fetch(source_url)
+        return self.url(name) if name else source_url
+
+    def _evict(self) -> set:
+        """전체 크기가 max_bytes 이하가 될 때까지 오래 쓰지 않은 이미지부터 지웁니다.
+
+        원본과 그 변형(<sha256>-<폭>.<포맷>)은 한 묶음으로 세고 함께 지웁니다.
+        묶음의 마지막 사용 시각은 묶음 안 파일 중 가장 최근 수정 시각입니다.
+        인덱스에서 빼야 할 파일 이름들(지운 파일 + 다른 프로세스가 이미 지운 파일)을 돌려줍니다.
+        """
+        groups = {}
+        present = set()
+        total = 0
+        for entry in os.scandir(self.root):
+            if entry.name.endswith(".tmp") or not entry.is_file():
+                continue
+            stat = entry.stat()
+            key = os.path.splitext(entry.name)[0].split("-")[0]
+            mtime, size, names = groups.get(key, (0.0, 0, []))
+            names.append(entry.name)
+            present.add(entry.name)
+            groups[key] = (max(mtime, stat.st_mtime), size + stat.st_size, names)
+            total += stat.st_size
+        removed = {n for n in self._urls.values() if n not in present}
+        for _, size, names in sorted(groups.values(), key=lambda g: g[0]):
+            if total <= self.max_bytes:
+                break
+            for name in names:
+                try:
+                    os.remove(self.path(name))
+                except OSError:
+                    continue
+                removed.add(name)
+            total -= size
+        if removed:
+            self._urls = {u: n for u, n in self._urls.items() if n not in removed}
+        return removed
@@ -0,0 +1,108 @@
+import logging
+import os
+from concurrent.futures import ThreadPoolExecutor
+from typing import NamedTuple
+
+from PIL import Image
+
+# 배경 이미지 반응형 변환 (리사이즈 + 재압축)
+# Dog API 원본은 해상도가 제각각인 JPEG라서, 화면 폭별 변형(640/1280/1920)을
+# WebP와 JPEG로 미리 만들어 두고 CSS 미디어 쿼리로 화면에 맞는 가장 작은 파일을 고르게 합니다.
+# 변환은 피드의 백그라운드 스레드에서 워커 풀로 실행되므로 rerun 경로를 막지 않습니다.
+WIDTHS = (640, 1280, 1920)
+FORMATS = (("webp", "image/webp", 80), ("jpg", "image/jpeg", 82))
+
+logger = logging.getLogger(__name__)
+
+
+class Variant(NamedTuple):
+    width: int
+    mime: str
+    url: str
+
+
+class ResponsiveImage(NamedTuple):
+    """원본 URL과 폭별 변형 목록. 변형이 없으면 원본만 사용합니다."""
+    src: str
+    variants: tuple = ()
+
+
+def _encode(source_path: str, out_path: str, width: int, fmt: str, quality: int):
+    with Image.open(source_path) as img:
+        img = img.convert("RGB")
+        if img.width > width:
+            img = img.resize((width, round(img.height * width / img.width)), Image.LANCZOS)
+        tmp_path = f"{out_path}.{os.getpid()}.tmp"
+        img.save(tmp_path, "WEBP" if fmt == "webp" else "JPEG", quality=quality, optimize=True)
+    os.replace(tmp_path, out_path)
+
+
+class VariantPipeline:
+    """ImageCache에 저장된 원본에서 폭/포맷별 변형을 만드는 워커 풀입니다."""
+
+    def __init__(self, cache, widths=WIDTHS, formats=FORMATS, workers: int = 2):
+        self.cache = cache
+        self.widths = widths
+        self.formats = formats
+        self._pool = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="image-variants")
+
+    def _variant_name(self, name: str, width: int, ext: str) -> str:
+        return f"{os.path.splitext(name)[0]}-{width}.{ext}"
+
+    def build(self, name: str) -> tuple:
+        """원본 파일 이름에 대한 변형을 만들고 (이미 있으면 재사용) Variant 목록을 돌려줍니다."""
+        source_path = self.cache.path(name)
+        jobs = []
+        for width in self.widths:
+            for ext, mime, quality in self.formats:
+                variant = self._variant_name(name, width, ext)
+                out_path = self.cache.path(variant)
+                job = None
+                if not os.path.exists(out_path):
+                    job = self._pool.submit(_encode, source_path, out_path, width, ext, quality)
+                jobs.append((Variant(width, mime, self.cache.url(variant)), job))
+
+        variants = []
+        for variant, job in jobs:
+            try:
+                if job is not None:
+                    job.result()
+                variants.append(variant)
+            except Exception as e:
+                logger.warning("이미지 변환 실패 (%s): %s", variant.url, e)
+        if any(job is not None for _, job in jobs):
+            self.cache.evict()  # 새로 쓴 변형 파일도 크기 제한에 넣습니다.
+        return tuple(variants)
+
+    def resolve(self, source_url: str) -> ResponsiveImage:
+        """DogImageFeed의 resolve 훅: 원본을 캐시에 받고 변형까지 만든 결과를 돌려줍니다."""
+        name = self.cache.fetch(source_url)
+        if not name:
+            return ResponsiveImage(source_url)
+        return ResponsiveImage(self.cache.url(name), self.build(name))
+
+    def shutdown(self):
+        self._pool.shutdown(wait=False)
+
+
+def _image_set(variants) -> str:
+    return "image-set(" + ", ".join(f'url("{v.url}") type("{v.mime}")' for v in variants) + ")"
+
+
+def background_css(image, selector: str = ".stApp") -> str:
+    """화면 폭에 맞는 가장 작은 변형을 쓰는 background-image CSS를 만듭니다."""
+    if isinstance(image, str):
+        image = ResponsiveImage(image)
+    rules = [f'{selector} {{ background-image: url("{image.src}"); }}']
+    by_width = {}
+    for v in image.variants:
+        by_width.setdefault(v.width, []).append(v)
+    widths = sorted(by_width, reverse=True)
+    for i, width in enumerate(widths):
+        rule = f"{selector} {{ background-image: {_image_set(by_width[width])}; }}"
+        if i == 0:
+            rules.append(rule)  # 가장 큰 변형이 기본값
+        else:
+            # 뒤에 오는 (더 좁은) 미디어 쿼리가 앞의 규칙을 덮어씁니다.
+            rules.append(f"@media (max-width: {width}px) {{ {rule} }}")
+    return "\n".join(rules)
@@ -0,0 +1,394 @@
+"""설문 응답 원본 집계 (빌드 단계)
+
+응답 한 줄이 (나라, 유형, 응답 시각)인 큰 CSV/Parquet 파일을 읽어 나라별 유형 수를 세고,
+countriesMBTI_16types.csv와 같은 스키마(Country + 16개 유형 비율)로 저장합니다.
+
+- 파일을 바이트 구간(CSV) 또는 row group(Parquet) 단위로 나눠 프로세스 풀에서 동시에 집계합니다.
+  각 작업은 CHUNK_ROWS행씩만 읽으므로 파일 크기와 상관없이 메모리 사용량이 일정합니다.
+- 집계는 나라/유형 값을 factorize한 뒤 bincount 한 번으로 세고, 이름 정리(대소문자, "INTJ-A",
+  나라 별칭)는 고유값에만 적용합니다. 응답 시각 컬럼은 읽지 않습니다.
+- 나라별 응답 수(정수)는 STATE_PATH에 누적해 두고, 이미 반영한 파일은 건너뜁니다.
+  CSV 파일이 뒤에 덧붙여지기만 했으면(앞부분이 같으면) 늘어난 부분만 읽습니다.
+- 결과 CSV는 임시 파일에 쓴 뒤 교체하므로 실행 중인 서버는 바뀐 데이터를 바로 다시 읽습니다.
+  (mbti_data.IndexStore)
+
+사용법:
+    python ingest.py responses-2025-*.csv             # 새 배치를 더해 countriesMBTI_16types.csv 갱신
+    python ingest.py big.parquet --workers 8 --build-bin
+    python ingest.py all.csv --rebuild                # 누적값을 버리고 처음부터 다시 집계
+"""
+import argparse
+import glob
+import hashlib
+import io
+import json
+import logging
+import os
+import sys
+import time
+from collections import Counter
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+import pandas as pd
+
+import country_codes
+import dataset_bin
+
+# countriesMBTI_16types.csv와 같은 컬럼 순서
+TYPE_COLUMNS = [
+    "INFJ", "ISFJ", "INTP", "ISFP", "ENTP", "INFP", "ENTJ", "ISTP",
+    "INTJ", "ESFP", "ESTJ", "ENFP", "ESTP", "ISTJ", "ENFJ", "ESFJ",
+]
+TYPE_INDEX = {mbti: i for i, mbti in enumerate(TYPE_COLUMNS)}
+COUNTRY_COLUMN = "country"
+TYPE_COLUMN = "type"
+STATE_PATH = os.path.join(".cache", "ingest", "state.json")
+CHUNK_ROWS = 500_000
+TASK_BYTES = 16 << 20  # CSV 작업 하나가 맡는 최소 바이트 수 (작은 파일은 나누지 않음)
+HEAD_BYTES = 64 << 10  # 덧붙이기만 한 파일인지 확인할 때 비교하는 앞부분 크기
+PARQUET_SUFFIXES = (".parquet", ".pq")
+
+logger = logging.getLogger(__name__)
+
+# ISO-3 코드 -> countriesMBTI_16types.csv의 나라 이름 (별칭과 코드 자체도 같은 이름으로 모읍니다)
+# 별칭(country_codes.ALIASES)은 넣지 않고, 한 코드에 이름이 여러 개면 처음 나온 이름을 씁니다.
+CANONICAL_NAMES = {}
+for _name, _code in country_codes.COUNTRY_ISO3.items():
+    CANONICAL_NAMES.setdefault(_code, _name)
+
+
+def normalize_type(value) -> int:
+    """유형 값의 컬럼 번호. "intj", " INTJ-A " 등을 받아들이고 모르는 값은 -1."""
+    if not isinstance(value, str):
+        return -1
+    return TYPE_INDEX.get(value.strip().upper()[:4], -1)
+
+
+def normalize_country(value):
+    """나라 이름을 데이터셋의 이름으로 맞춥니다. ISO-3 코드로 매칭되지 않는 이름이면 None."""
+    name = str(value).strip()
+    code = country_codes.to_iso3(name)
+    if code is None and name.upper() in CANONICAL_NAMES:
+        code = name.upper()
+    return CANONICAL_NAMES.get(code)
+
+
+def count_frame(chunk: pd.DataFrame, country_column: str, type_column: str):
+    """응답 묶음 하나를 (나라 x 16개 유형) 정수 표, 버린 행 수, 매칭되지 않은 나라 이름별 행 수(Counter)로 셉니다.
+
+    매칭되지 않은 나라의 응답은 새 나라로 더하지 않고 버린 행으로 셉니다.
+    (country_codes.py에 이름을 추가한 뒤 --rebuild로 다시 집계하세요)
+    """
+    c_codes, c_uniques = pd.factorize(chunk[country_column])
+    t_codes, t_uniques = pd.factorize(chunk[type_column])
+    names = [normalize_country(u) for u in c_uniques]
+    per_country = np.bincount(c_codes[c_codes >= 0], minlength=len(c_uniques))
+    unknown = Counter()
+    for u, name, n in zip(c_uniques, names, per_country):
+        if name is None:
+            unknown[str(u).strip()] += int(n)
+    # 마지막 칸은 결측값(코드 -1)용
+    t_map = np.array([normalize_type(u) for u in t_uniques] + [-1], dtype=np.int64)
+    c_known = np.array([name is not None for name in names] + [False])
+    types = t_map[t_codes]
+    valid = (types >= 0) & c_known[c_codes]
+    flat = np.bincount(
+        c_codes[valid] * len(TYPE_COLUMNS) + types[valid],
+        minlength=len(c_uniques) * len(TYPE_COLUMNS),
+    )
+    counts = pd.DataFrame(
+        flat.reshape(len(c_uniques), len(TYPE_COLUMNS)),
+        index=[name or "" for name in names],
+        columns=TYPE_COLUMNS,
+    )
+    counts = counts[[name is not None for name in names]]
+    return counts.groupby(level=0).sum(), int((~valid).sum()), unknown
+
+
+class _RangeReader(io.RawIOBase):
+    """파일의 [start, stop) 구간만 읽히는 파일 객체 (pd.read_csv에 넘기기용)."""
+
+    def __init__(self, f, start: int, stop: int):
+        self._f = f
+        self._f.seek(start)
+        self._left = stop - start
+
+    def readable(self):
+        return True
+
+    def readinto(self, buffer):
+        n = min(len(buffer), self._left)
+        if n <= 0:
+            return 0
+        data = self._f.read(n)
+        buffer[:len(data)] = data
+        self._left -= len(data)
+        return len(data)
+
+
+def _line_start(f, offset: int) -> int:
+    """offset 이후 첫 줄의 시작 위치. (offset이 줄 시작이면 그대로)"""
+    if offset == 0:
+        return 0
+    f.seek(offset - 1)
+    f.readline()
+    return f.tell()
+
+
+def _count_csv_range(path: str, start: int, stop: int, country_column: str, type_column: str):
+    """CSV 파일의 바이트 구간 하나를 CHUNK_ROWS행씩 읽어 셉니다. (프로세스 풀 작업)"""
+    total = pd.DataFrame(columns=TYPE_COLUMNS, dtype=np.int64)
+    rows = dropped = 0
+    unknown = Counter()
+    with open(path, "rb") as f:
+        header = pd.read_csv(f, nrows=0).columns.tolist()
+        header_end = _line_start(f, 1) if start == 0 else start
+        reader = pd.read_csv(
+            io.BufferedReader(_RangeReader(f, max(start, header_end), stop)),
+            header=None,
+            names=header,
+            usecols=[country_column, type_column],
+            dtype=str,
+            chunksize=CHUNK_ROWS,
+        )
+        for chunk in reader:
+            counts, bad, names = count_frame(chunk, country_column, type_column)
+            total = total.add(counts, fill_value=0)
+            rows += len(chunk)
+            dropped += bad
+            unknown.update(names)
+    return total.astype(np.int64), rows, dropped, unknown
+
+
+def _count_parquet_groups(path: str, row_groups, country_column: str, type_column: str):
+    """Parquet 파일의 row group 몇 개를 CHUNK_ROWS행씩 읽어 셉니다. (프로세스 풀 작업)"""
+    import pyarrow.parquet as pq
+
+    total = pd.DataFrame(columns=TYPE_COLUMNS, dtype=np.int64)
+    rows = dropped = 0
+    unknown = Counter()
+    batches = pq.ParquetFile(path).iter_batches(
+        batch_size=CHUNK_ROWS, row_groups=row_groups, columns=[country_column, type_column]
+    )
+    for batch in batches:
+        chunk = batch.to_pandas()
+        counts, bad, names = count_frame(chunk, country_column, type_column)
+        total = total.add(counts, fill_value=0)
+        rows += len(chunk)
+        dropped += bad
+        unknown.update(names)
+    return total.astype(np.int64), rows, dropped, unknown
+
+
+def complete_size(path: str) -> int:
+    """CSV에서 마지막 줄바꿈까지의 바이트 수. (아직 쓰는 중인 마지막 줄은 다음 실행 때 읽습니다)"""
+    size = os.path.getsize(path)
+    if path.lower().endswith(PARQUET_SUFFIXES):
+        return size
+    with open(path, "rb") as f:
+        end = size
+        while end > 0:
+            start = max(0, end - HEAD_BYTES)
+            f.seek(start)
+            newline = f.read(end - start).rfind(b"\n")
+            if newline >= 0:
+                return start + newline + 1
+            end = start
+    return 0
+
+
+def plan_tasks(path: str, start: int = 0, stop: int = None, workers: int = 1):
+    """파일 하나를 작업 목록 [(함수, 인자...)]으로 나눕니다. CSV는 [start, stop) 바이트 구간만 읽습니다."""
+    if path.lower().endswith(PARQUET_SUFFIXES):
+        try:
+            import pyarrow.parquet as pq
+        except ImportError:
+            raise RuntimeError("Parquet 파일을 읽으려면 pyarrow가 필요합니다: pip install pyarrow") from None
+        groups = list(range(pq.ParquetFile(path).num_row_groups))
+        step = max(1, -(-len(groups) // (workers * 4)))
+        return [(_count_parquet_groups, path, groups[i:i + step]) for i in range(0, len(groups), step)]
+
+    size = complete_size(path) if stop is None else stop
+    parts = max(1, min(workers * 4, (size - start) // TASK_BYTES))
+    with open(path, "rb") as f:
+        bounds = sorted({min(size, _line_start(f, start + (size - start) * i // parts)) for i in range(parts)} | {size})
+    return [(_count_csv_range, path, a, b) for a, b in zip(bounds, bounds[1:]) if a < b]
+
+
+def _run_task(task, country_column: str, type_column: str):
+    func, *args = task
+    return func(*args, country_column, type_column)
+
+
+def count_tasks(tasks, workers: int, country_column: str = COUNTRY_COLUMN, type_column: str = TYPE_COLUMN):
+    """작업들을 프로세스 풀에서 돌려 (나라 x 유형) 정수 표, 읽은 행 수, 버린 행 수,
+    매칭되지 않은 나라 이름별 행 수({이름: 행 수}, 이름순)를 합칩니다."""
+    total = pd.DataFrame(columns=TYPE_COLUMNS, dtype=np.int64)
+    rows = dropped = 0
+    unknown = Counter()
+    if workers <= 1 or len(tasks) <= 1:
+        results = (_run_task(task, country_column, type_column) for task in tasks)
+        for counts, n, bad, names in results:
+            total = total.add(counts, fill_value=0)
+            rows += n
+            dropped += bad
+            unknown.update(names)
+    else:
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            futures = [pool.submit(_run_task, task, country_column, type_column) for task in tasks]
+            for future in futures:
+                counts, n, bad, names = future.result()
+                total = total.add(counts, fill_value=0)
+                rows += n
+                dropped += bad
+                unknown.update(names)
+    return total.fillna(0).astype(np.int64), rows, dropped, dict(sorted(unknown.items()))
+
+
+# --- 누적 상태 ---
+def _prefix_digest(path: str, size: int) -> str:
+    """파일 앞부분 min(size, HEAD_BYTES)바이트의 체크섬."""
+    with open(path, "rb") as f:
+        return hashlib.sha256(f.read(min(size, HEAD_BYTES))).hexdigest()
+
+
+def load_state(path: str = STATE_PATH) -> dict:
+    if not os.path.exists(path):
+        return {"types": TYPE_COLUMNS, "counts": {}, "sources": {}}
+    with open(path, encoding="utf-8") as f:
+        state = json.load(f)
+    if state.get("types") != TYPE_COLUMNS:
+        raise ValueError(f"{path}의 유형 컬럼이 다릅니다. --rebuild로 처음부터 다시 집계하세요.")
+    return state
+
+
+def save_state(state: dict, path: str = STATE_PATH):
+    os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+    tmp_path = f"{path}.{os.getpid()}.tmp"
+    with open(tmp_path, "w", encoding="utf-8") as f:
+        json.dump(state, f, ensure_ascii=False)
+    os.replace(tmp_path, path)
+
+
+def pending_start(path: str, state: dict):
+    """이 파일에서 아직 반영하지 않은 부분의 시작 바이트. 다 반영했으면 None.
+
+    이미 반영한 CSV가 뒤에 덧붙여지기만 했으면 이전 크기부터, 그 밖에 내용이 바뀌었으면 오류입니다.
+    """
+    source = state["sources"].get(os.path.abspath(path))
+    if source is None:
+        return 0
+    size = complete_size(path)
+    same_head = _prefix_digest(path, source["size"]) == source["prefix"]
+    if same_head and size == source["size"]:
+        return None
+    if same_head and size > source["size"] and not path.lower().endswith(PARQUET_SUFFIXES):
+        return source["size"]
+    raise ValueError(f"이미 반영한 파일의 내용이 바뀌었습니다: {path} (--rebuild로 처음부터 다시 집계하세요)")
+
+
+def ingest(paths, state: dict, workers: int, country_column: str = COUNTRY_COLUMN, type_column: str = TYPE_COLUMN):
+    """새 파일(또는 덧붙여진 부분)만 집계해 state에 더합니다.
+
+    파일별 (행 수, 버린 행 수, 매칭되지 않은 나라 이름별 행 수)를 돌려줍니다. (이미 반영한 파일은 None)
+    버린 행 수에는 유형이나 나라 값이 비어 있거나 알 수 없는 행이 모두 들어가며,
+    나라 이름을 알 수 없어 버린 행은 이름별로 경고 로그도 남깁니다.
+    """
+    report = {}
+    for path in paths:
+        start = pending_start(path, state)
+        if start is None:
+            report[path] = None
+            continue
+        size = complete_size(path)
+        tasks = plan_tasks(path, start, size, workers)
+        counts, rows, dropped, unknown = count_tasks(tasks, workers, country_column, type_column)
+
+        current = pd.DataFrame.from_dict(state["counts"], orient="index", columns=TYPE_COLUMNS)
+        merged = current.add(counts, fill_value=0).fillna(0).astype(np.int64)
+        state["counts"] = {country: row.tolist() for country, row in zip(merged.index, merged.to_numpy())}
+        state["sources"][os.path.abspath(path)] = {
+            "size": size,
+            "prefix": _prefix_digest(path, size),
+            "rows": state["sources"].get(os.path.abspath(path), {}).get("rows", 0) + rows,
+            "ingested_at": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        }
+        if unknown:
+            logger.warning("%s: 나라 이름을 알 수 없어 %d행을 버렸습니다 (%s)", path, sum(unknown.values()),
+                           ", ".join(f"{name} {n}" for name, n in unknown.items()))
+        report[path] = (rows, dropped, unknown)
+    return report
+
+
+def to_ratios(state: dict, min_responses: int = 1) -> pd.DataFrame:
+    """누적 응답 수를 countriesMBTI_16types.csv 스키마(Country + 유형별 비율)로 바꿉니다."""
+    counts = pd.DataFrame.from_dict(state["counts"], orient="index", columns=TYPE_COLUMNS)
+    totals = counts.sum(axis=1)
+    counts = counts[totals >= max(1, min_responses)].sort_index()
+    ratios = counts.div(counts.sum(axis=1), axis=0)
+    ratios.index.name = "Country"
+    return ratios.reset_index()
+
+
+def write_table(df: pd.DataFrame, out_path: str = dataset_bin.CSV_PATH):
+    """다른 프로세스가 반쯤 쓴 파일을 읽지 않도록 임시 파일에 쓴 뒤 교체합니다."""
+    tmp_path = f"{out_path}.{os.getpid()}.tmp"
+    df.to_csv(tmp_path, index=False)
+    os.replace(tmp_path, out_path)
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("inputs", nargs="+", help="응답 CSV/Parquet 파일 (glob 패턴 가능)")
+    parser.add_argument("--out", default=dataset_bin.CSV_PATH, help="나라별 비율 CSV")
+    parser.add_argument("--state", default=STATE_PATH, help="누적 응답 수 파일")
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 1)
+    parser.add_argument("--country-column", default=COUNTRY_COLUMN)
+    parser.add_argument("--type-column", default=TYPE_COLUMN)
+    parser.add_argument("--min-responses", type=int, default=1, help="이보다 응답이 적은 나라는 빼기")
+    parser.add_argument("--rebuild", action="store_true", help="누적값을 버리고 처음부터 다시 집계")
+    parser.add_argument("--build-bin", action="store_true", help="바이너리 데이터셋도 다시 만들기")
+    args = parser.parse_args(argv)
+
+    paths = sorted({p for pattern in args.inputs for p in (glob.glob(pattern) or [pattern])})
+    state = {"types": TYPE_COLUMNS, "counts": {}, "sources": {}} if args.rebuild else load_state(args.state)
+
+    started = time.perf_counter()
+    try:
+        report = ingest(paths, state, args.workers, args.country_column, args.type_column)
+    except (OSError, ValueError, KeyError, RuntimeError) as e:
+        print(f"집계 실패: {e}")
+        return 1
+    for path, result in report.items():
+        if result is None:
+            print(f"{path}: 이미 반영됨")
+        else:
+            rows, dropped, unknown = result
+            print(f"{path}: {rows:,}행 (버린 행 {dropped:,})")
+            if unknown:
+                print(f"  나라를 알 수 없어 버린 행 {sum(unknown.values()):,}: "
+                      + ", ".join(f"{name} {n:,}" for name, n in unknown.items())
+                      + " (country_codes.py에 추가한 뒤 --rebuild로 다시 집계하세요)")
+
+    if any(result is not None for result in report.values()) or args.rebuild:
+        save_state(state, args.state)
+    table = to_ratios(state, args.min_responses)
+    if table.empty:
+        print("집계된 나라가 없어 결과 파일을 쓰지 않았습니다.")
+        return 1
+    write_table(table, args.out)
+    print(f"{args.out}: {len(table)}개 나라 ({time.perf_counter() - started:.1f}s)")
+
+    unknown = [name for name in table["Country"] if country_codes.to_iso3(name) is None]
+    if unknown:
+        print(country_codes.report(unknown))
+    if args.build_bin:
+        bin_path = os.path.splitext(args.out)[0] + ".bin"
+        checksum, _ = dataset_bin.write_dataset(args.out, bin_path)
+        print(f"{args.out} -> {bin_path} (sha256 {checksum})")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,90 @@
+import hashlib
+import json
+import logging
+import os
+import threading
+import time
+from concurrent.futures import Future, ThreadPoolExecutor
+
+import http_client
+import metrics
+
+# Lottie 애니메이션 로더
+# 페이지 맨 위에서 애니메이션 JSON을 순서대로 받느라 첫 화면이 늦게 뜨던 것을,
+# 워커 풀에서 동시에 받고 디스크에 저장해 두는 방식으로 바꿉니다.
+# - 디스크 캐시: 프로세스를 재시작해도 다시 받지 않습니다.
+# - 오프라인 대체: 네트워크가 안 되면 저장소에 포함된 기본 애니메이션을 씁니다.
+# - 실패 캐시: 받지 못한 URL은 FAILURE_TTL초 동안 다시 요청하지 않고 대체 애니메이션을 돌려줍니다.
+CACHE_DIR = os.path.join(".cache", "lottie")
+FALLBACK_PATH = os.path.join("assets", "lottie_fallback.json")
+FAILURE_TTL = 300
+
+logger = logging.getLogger(__name__)
+
+
+def _read_json(path: str):
+    try:
+        with open(path, encoding="utf-8") as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return None
+
+
+class LottieLoader:
+    """URL별 Lottie JSON을 비동기로 불러오는 로더입니다. load()는 바로 Future를 돌려줍니다."""
+
+    def __init__(self, cache_dir: str = CACHE_DIR, fallback_path: str = FALLBACK_PATH, workers: int = 4,
+                 failure_ttl: float = FAILURE_TTL):
+        self.cache_dir = cache_dir
+        self.fallback_path = fallback_path
+        self.failure_ttl = failure_ttl
+        self._pool = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="lottie")
+        self._futures = {}
+        self._failed = {}  # URL -> 실패한 시각
+        self._fallback = None
+        self._lock = threading.Lock()
+        os.makedirs(cache_dir, exist_ok=True)
+
+    def cache_path(self, url: str) -> str:
+        return os.path.join(self.cache_dir, hashlib.sha256(url.encode("utf-8")).hexdigest() + ".json")
+
+    def fallback(self):
+        """저장소에 포함된 대체 애니메이션. (한 번 읽으면 보관)"""
+        if self._fallback is None:
+            self._fallback = _read_json(self.fallback_path)
+        return self._fallback
+
+    @metrics.timed("load_lottie")
+    def _download(self, url: str):
+        try:
+            data = http_client.get_json(url)
+        except Exception as e:
+            logger.warning("Lottie 애니메이션을 받지 못했습니다 (%s): %s", url, e)
+            self._failed[url] = time.monotonic()
+            return self.fallback()
+        tmp_path = self.cache_path(url) + ".tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(data, f)
+        os.replace(tmp_path, self.cache_path(url))
+        return data
+
+    def load(self, url: str) -> Future:
+        """디스크 캐시에 있으면 완료된 Future를, 없으면 다운로드 중인 Future를 돌려줍니다.
+
+        여러 세션이 동시에 불러도 URL마다 다운로드는 하나이고, 모두 같은 Future를 받습니다.
+        """
+        with self._lock:
+            future = self._futures.get(url)
+            # 대체 애니메이션으로 끝난 URL은 FAILURE_TTL초가 지난 뒤의 요청 때 다시 받아 봅니다.
+            failed_at = self._failed.get(url)
+            if future is not None and (failed_at is None or time.monotonic() - failed_at < self.failure_ttl):
+                return future
+            data = _read_json(self.cache_path(url))
+            if data is not None:
+                future = Future()
+                future.set_result(data)
+            else:
+                self._failed.pop(url, None)
+                future = self._pool.submit(self._download, url)
+            self._futures[url] = future
+            return future
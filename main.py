@@ -1,69 +1,108 @@
+import json
 import streamlit as st
-import requests
-import time
-from PIL import Image
-from io import BytesIO
+import metrics
+from dog_feed import DOG_API_URL, DogImageFeed
+from image_cache import ImageCache
+from image_variants import VariantPipeline, background_css
 
 # 1. 페이지 설정 및 강아지 사진 API 정의
 # Dog API: 랜덤 강아지 이미지 URL을 제공합니다.
-DOG_API_URL = "https://dog.ceo/api/breeds/image/random"
+# 이미지 교체 주기(초)와 미리 받아 둘 이미지 개수
+DOG_IMAGE_INTERVAL = 10
+DOG_IMAGE_PREFETCH = 3
 # st.set_page_config(layout="wide") # 전체 화면 사용 시 주석 해제
 
-def fetch_dog_image_url():
-    """Dog API에서 랜덤 강아지 이미지 URL을 가져옵니다."""
-    try:
-        response = requests.get(DOG_API_URL)
-        response.raise_for_status() # HTTP 오류가 있으면 예외 발생
-        data = response.json()
-        return data.get("message")
-    except Exception as e:
-        st.error(f"강아지 이미지 API 호출 중 오류 발생: {e}")
-        return None
+# rerun 전체 시간 측정 시작 (스크립트 맨 끝에서 기록, fragment만 다시 실행될 때는 제외)
+rerun_started = metrics.rerun_started()
+
+@metrics.cached(st.cache_resource)
+def get_dog_feed():
+    """프로세스 전체가 공유하는 강아지 이미지 피드를 시작합니다. (세션마다 API를 부르지 않음)"""
+    # 이미지는 미리 받을 때 디스크 캐시(static/dog_cache)에 저장하고, 브라우저에는 로컬 URL을 줍니다.
+    # 화면 폭별 변형(640/1280/1920, WebP/JPEG)도 이때 워커 풀에서 미리 만들어 둡니다.
+    pipeline = VariantPipeline(ImageCache())
+    feed = DogImageFeed(
+        DOG_API_URL,
+        interval=DOG_IMAGE_INTERVAL,
+        prefetch=DOG_IMAGE_PREFETCH,
+        resolve=pipeline.resolve,
+    ).start()
+    # 첫 세션이 빈 배경을 보지 않도록 첫 이미지를 잠깐 기다립니다.
+    feed.wait_ready(timeout=3)
+    return feed
 
 def set_initial_state():
     """세션 상태를 초기화합니다."""
     if 'dog_image_url' not in st.session_state:
-        st.session_state.dog_image_url = fetch_dog_image_url()
-        st.session_state.last_update_time = time.time()
+        st.session_state.dog_image_url = get_dog_feed().current()
     if 'show_message' not in st.session_state:
         st.session_state.show_message = False
 
 def update_dog_image():
-    """10초마다 강아지 이미지를 업데이트합니다."""
-    current_time = time.time()
-    # 10초가 지났으면 이미지 업데이트
-    if current_time - st.session_state.last_update_time >= 10:
-        new_url = fetch_dog_image_url()
-        if new_url:
-            st.session_state.dog_image_url = new_url
-            st.session_state.last_update_time = current_time
+    """공유 피드에서 현재 강아지 이미지를 읽어옵니다. (피드가 10초마다 교체)"""
+    new_url = get_dog_feed().current()
+    if new_url:
+        st.session_state.dog_image_url = new_url
 
 set_initial_state()
-update_dog_image()
 
 ## 2. 웹앱 스타일 (배경 이미지 설정)
-# 배경에 강아지 이미지를 넣기 위해 st.markdown과 CSS를 사용합니다.
+# 배경에 강아지 이미지를 넣기 위해 CSS를 사용합니다.
 # 이미지를 10초마다 변경하려면 URL을 동적으로 업데이트해야 합니다.
-background_image_url = st.session_state.dog_image_url
-if background_image_url:
-    # CSS를 사용하여 배경 이미지를 설정하고, 새로고침(rerun) 시마다 URL을 업데이트합니다.
-    st.markdown(
-        f"""
-        <style>
-        .stApp {{
-            background-image: url("{background_image_url}");
-            background-size: cover; /* 화면을 채우도록 설정 */
-            background-repeat: no-repeat;
-            background-attachment: fixed; /* 스크롤 시 이미지 고정 */
-            background-position: center;
-        }}
-        </style>
-        """,
-        unsafe_allow_html=True
-    )
+# 전체 스크립트를 1초마다 rerun하던 대신, 이 fragment만 피드의 교체 주기(DOG_IMAGE_INTERVAL초)마다 다시 실행됩니다.
+# (제목, 이름 입력창 등 나머지 화면은 사용자가 조작할 때만 다시 그려집니다)
+# 스타일은 <head>의 <style> 하나에 넣고, 피드의 이미지 번호(version)가 바뀌었을 때만 다시 보냅니다.
+# <head>는 Streamlit 화면 밖이라 fragment가 아무것도 그리지 않는 rerun에도 남아 있지만,
+# 다른 페이지로 이동해도 남으므로 선택자를 이 페이지에만 있는 표시 컨테이너(st-key-...)로 한정합니다.
+BACKGROUND_STYLE_ID = "dog-background-css"
+BACKGROUND_VERSION_KEY = "dog_image_version"
+BACKGROUND_PAGE_KEY = "dog-background-page"
+BACKGROUND_SELECTOR = f".stApp:has(.st-key-{BACKGROUND_PAGE_KEY})"
+
+def background_style(image_url: str) -> str:
+    # background_css는 화면 폭에 맞는 가장 작은 변형을 고르는 미디어 쿼리를 만들어 줍니다.
+    return f"""
+            {background_css(image_url, selector=BACKGROUND_SELECTOR)}
+            {BACKGROUND_SELECTOR} {{
+                background-size: cover; /* 화면을 채우도록 설정 */
+                background-repeat: no-repeat;
+                background-attachment: fixed; /* 스크롤 시 이미지 고정 */
+                background-position: center;
+            }}
+            """
+
+@st.fragment(run_every=DOG_IMAGE_INTERVAL)
+@metrics.timed("background_fragment")
+def background_image():
+    feed = get_dog_feed()
+    version = feed.version()
+    if st.session_state.get(BACKGROUND_VERSION_KEY) == version:
+        return
+    update_dog_image()
+    background_image_url = st.session_state.dog_image_url
+    if background_image_url:
+        st.session_state[BACKGROUND_VERSION_KEY] = version
+        css = json.dumps(background_style(background_image_url))
+        st.html(f"""
+            <script>
+            (function () {{
+                var style = document.getElementById("{BACKGROUND_STYLE_ID}");
+                if (!style) {{
+                    style = document.createElement("style");
+                    style.id = "{BACKGROUND_STYLE_ID}";
+                    document.head.appendChild(style);
+                }}
+                style.textContent = {css};
+            }})();
+            </script>
+            """, unsafe_allow_javascript=True)
+
+background_image()
 
 ## 3. 메인 기능 구현 (이름 입력 및 메시지 출력)
-st.title("🐾 헬로 월드 강아지 앱")
+# 제목을 표시 컨테이너 안에 두어, 배경 스타일이 이 페이지에서만 적용되게 합니다.
+with st.container(key=BACKGROUND_PAGE_KEY):
+    st.title("🐾 헬로 월드 강아지 앱")
 st.subheader("Streamlit으로 만드는 간단한 웹 애플리케이션")
 
 # 사용자 이름 입력 필드
@@ -103,18 +142,7 @@ if st.session_state.show_message:
 if st.session_state.dog_image_url:
     st.markdown("---")
     st.write("### 현재 배경 강아지 이미지 (10초마다 변경)")
-    
-    # 강아지 이미지를 다운로드하여 표시 (배경 이미지는 CSS로 설정됨)
-    try:
-        response = requests.get(st.session_state.dog_image_url)
-        img = Image.open(BytesIO(response.content))
-        # st.image(img, caption="랜덤 강아지 사진", use_column_width=True)
-    except Exception as e:
-        # st.error(f"이미지 표시 오류: {e}")
-        pass
+    # 배경 이미지는 CSS로 설정되고 디스크 캐시에서 내려가므로 여기서 다시 다운로드하지 않습니다.
 
-# Streamlit 앱을 1초마다 다시 실행하여 10초 업데이트 로직이 작동하도록 합니다.
-# 실제 프로덕션 환경에서는 이보다 효율적인 방법을 고려해야 하지만,
-# Streamlit의 간단한 타이머 기능을 구현하는 데 유용합니다.
-time.sleep(1)
-st.rerun()
+metrics.debug_sidebar()  # ?debug=1일 때만 표시
+metrics.rerun_finished("main", rerun_started)
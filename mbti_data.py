@@ -0,0 +1,366 @@
+import logging
+import os
+import threading
+from typing import TYPE_CHECKING
+
+import numpy as np
+import streamlit as st
+
+import country_codes
+import dataset_bin
+import dichotomy
+import metrics
+import similarity
+
+if TYPE_CHECKING:
+    import pandas as pd
+
+# 공용 데이터 모듈
+# 모든 페이지가 같은 CSV를 읽고, 선택할 때마다 sort_values를 두 번씩 돌리던 것을
+# 데이터 로드 시점에 한 번만 정렬해 두고 이후에는 슬라이스만 하도록 바꿉니다.
+DATA_PATH = dataset_bin.CSV_PATH
+BIN_PATH = dataset_bin.BIN_PATH
+# 데이터 파일 변경 확인 주기(초). 서버를 재시작하지 않아도 새 CSV/BIN이 반영됩니다.
+RELOAD_INTERVAL = 5
+API_PORT = os.environ.get("MBTI_API_PORT")
+
+logger = logging.getLogger(__name__)
+
+
+class RankingIndex:
+    """16개 유형 컬럼과 파생 컬럼 전체에 대해 미리 계산해 둔 정렬 인덱스입니다.
+
+    - types / type_values: 원래 유형 컬럼과 그 행렬 (values의 앞부분 뷰)
+    - columns / values: 유형 컬럼 + 성향 축/기질 파생 컬럼 (dichotomy.py)
+    - order: 컬럼별 내림차순 정렬 순서 (argsort 결과)
+    - rank: 나라별 순위 (1위부터, 동률이면 같은 순위)
+    - percentile: 나라별 백분위 (그 유형 비율이 자기보다 낮은 나라의 비율, 0~100)
+    - zscore: 전 세계 평균 대비 표준점수
+    - iso3: 나라별 ISO-3 코드 (매칭 실패 시 "")
+
+    배열들은 dataset_bin.derive_arrays가 만든 값입니다. 바이너리 데이터셋이면 빌드 시점에 계산해
+    파일에 넣어 둔 memmap 뷰를 그대로 쓰므로, 워커마다 행렬을 복사하거나 다시 계산하지 않습니다.
+    인덱스는 NumPy 행렬만으로 만들고, pandas 표(frame, 정렬 테이블 등)는 처음 필요할 때 만듭니다.
+    (바이너리 데이터셋이면 첫 화면을 그릴 때까지 pandas를 import하지 않습니다)
+    """
+
+    def __init__(self, countries, types, arrays: dict, checksum: str = "", iso3=None):
+        self.countries = np.asarray(countries, dtype=object)
+        self.types = list(types)
+        self.columns = list(arrays["columns"])
+        self.values = arrays["values"]
+        self.type_values = self.values[:, :len(self.types)]
+        self.order = arrays["order"]
+        self.rank = arrays["rank"]
+        self.percentile = arrays["percentile"]
+        self.zscore = arrays["zscore"]
+        self.means = arrays["means"]
+        self.stds = arrays["stds"]
+        self.type_means = self.means[:len(self.types)]
+        self.checksum = checksum
+        if iso3 is None:
+            iso3, self.unmatched = country_codes.resolve(self.countries)
+        else:
+            self.unmatched = [c for c, code in zip(self.countries, iso3) if not code]
+        self.iso3 = np.asarray(iso3, dtype=object)
+        self._frame = None
+
+        # 나라 프로필(나라 하나의 16개 유형 순위/백분위/표준점수)은 이 행렬들의 한 행입니다.
+        self._col = {c: j for j, c in enumerate(self.columns)}
+        self._row = {c: i for i, c in enumerate(self.countries)}
+        self._profiles = {}
+
+        # 거리 종류별 유사도 인덱스는 처음 쓸 때 만듭니다. (similarity.py)
+        self._similarity = {}
+        self._similarity_lock = threading.Lock()
+
+        # 유형별 정렬 테이블은 유형마다 처음 쓸 때 한 번만 만듭니다. (Country, 유형, Percentage)
+        self._tables = {}
+
+    @classmethod
+    def from_values(cls, countries, types, values, checksum: str = None, iso3=None) -> "RankingIndex":
+        """유형 행렬(rows x 유형)에서 바로 만듭니다. (CSV 경로) 체크섬을 주지 않으면 dataset_checksum으로 계산합니다."""
+        values = np.asarray(values, dtype=np.float32)
+        if iso3 is None:
+            iso3, _ = country_codes.resolve(countries)
+        if checksum is None:
+            checksum = dataset_bin.dataset_checksum(countries, types, values, iso3)
+        return cls(countries, types, dataset_bin.derive_arrays(values, types), checksum, iso3)
+
+    @classmethod
+    def from_dataset(cls, dataset: dict) -> "RankingIndex":
+        """dataset_bin.open_dataset의 결과(memmap 뷰)로 만듭니다."""
+        return cls(dataset["countries"], dataset["types"], dataset, dataset["checksum"], dataset["iso3"])
+
+    @property
+    def frame(self) -> "pd.DataFrame":
+        """Country, ISO3 + 전체 컬럼 표 (지도 그림용)."""
+        if self._frame is None:
+            import pandas as pd
+
+            frame = pd.DataFrame(self.values, columns=self.columns)
+            frame.insert(0, "Country", self.countries)
+            frame.insert(1, "ISO3", self.iso3)
+            self._frame = frame
+        return self._frame
+
+    @classmethod
+    def from_frame(cls, df: "pd.DataFrame", checksum: str = None) -> "RankingIndex":
+        # 바이너리 데이터셋과 같은 정밀도(float32)로 맞춰 정렬 결과가 같도록 합니다.
+        # frame을 다시 넣는 경우를 위해 파생 컬럼은 빼고 원래 유형 컬럼만 씁니다.
+        columns = [c for c in df.columns if c not in ("Country", "ISO3") and c not in dichotomy.LABELS]
+        return cls.from_values(df["Country"].tolist(), columns, df[columns].to_numpy(dtype=np.float32), checksum)
+
+    def column(self, mbti: str) -> int:
+        """유형 이름에 해당하는 컬럼 번호를 돌려줍니다. 없으면 KeyError."""
+        return self._col[mbti]
+
+    def table(self, mbti: str) -> "pd.DataFrame":
+        """해당 유형 기준 내림차순으로 정렬된 전체 테이블."""
+        table = self._tables.get(mbti)
+        if table is None:
+            import pandas as pd
+
+            j = self._col[mbti]
+            idx = self.order[:, j]
+            table = pd.DataFrame({
+                "Country": self.countries[idx],
+                mbti: np.asarray(self.values[idx, j], dtype=np.float64),
+                "Percentage": np.asarray(self.values[idx, j] * 100, dtype=np.float64),
+            })
+            self._tables[mbti] = table
+        return table
+
+    def top_k(self, mbti: str, k: int = 5) -> "pd.DataFrame":
+        """해당 유형 비율이 높은 상위 k개 나라 (정렬 테이블의 앞부분 슬라이스)."""
+        with metrics.timed("top_k"):
+            return self.table(mbti).iloc[:k]
+
+    def mean(self, mbti: str) -> float:
+        """해당 유형의 전 세계 평균 비율."""
+        return float(self.means[self._col[mbti]])
+
+    def top_k_many(self, mbtis, k: int = 5) -> "pd.DataFrame":
+        """여러 유형의 상위 k개 나라를 한 번에 (Type, Rank, Country, Ratio, Mean 긴 표).
+
+        미리 정렬해 둔 order 행렬의 앞 k행을 선택한 컬럼만큼 한 번에 잘라 오므로
+        유형 수가 늘어도 정렬은 다시 하지 않습니다.
+        """
+        import pandas as pd
+
+        with metrics.timed("top_k_many"):
+            cols = np.array([self._col[m] for m in mbtis], dtype=np.intp)
+            k = min(k, len(self.countries))
+            rows = self.order[:k, cols]  # (k x 유형 수)
+            ratios = np.asarray(self.values[rows, cols[None, :]], dtype=np.float64)
+            return pd.DataFrame({
+                "Type": np.repeat(np.asarray(self.columns, dtype=object)[cols], k),
+                "Rank": np.tile(np.arange(1, k + 1), len(cols)),
+                "Country": self.countries[rows.T.ravel()],
+                "Ratio": ratios.T.ravel(),
+                "Mean": np.repeat(self.means[cols], k),
+            })
+
+    def combined(self, mbtis) -> np.ndarray:
+        """여러 유형 비율의 나라별 합. 예) NT 전체 = INTJ + INTP + ENTJ + ENTP"""
+        cols = [self._col[m] for m in mbtis]
+        return np.asarray(self.values[:, cols], dtype=np.float64).sum(axis=1)
+
+    def combined_top_k(self, mbtis, k: int = 5) -> "pd.DataFrame":
+        """유형들을 합친 비율의 상위 k개 나라 (Country, Ratio). 전체 정렬 대신 argpartition으로 고릅니다."""
+        import pandas as pd
+
+        with metrics.timed("combined_top_k"):
+            total = self.combined(mbtis)
+            k = min(k, len(total))
+            part = np.argpartition(-total, k - 1)[:k]
+            # 동률이면 원래 순서(행 번호)가 앞인 나라가 먼저 오도록 정렬합니다. (stable 정렬과 같은 결과)
+            part = part[np.lexsort((part, -total[part]))]
+            return pd.DataFrame({"Country": self.countries[part], "Ratio": total[part]})
+
+    def row(self, country: str) -> int:
+        """나라 이름에 해당하는 행 번호를 돌려줍니다. 없으면 KeyError."""
+        return self._row[country]
+
+    def profile(self, country: str) -> "pd.DataFrame":
+        """나라 하나의 유형별 비율, 순위, 백분위, 평균 대비 차이, 표준점수 (16개 유형 컬럼 순서).
+
+        미리 계산한 행렬의 한 행을 표로 옮길 뿐이며, 만든 표는 나라별로 보관합니다.
+        """
+        with metrics.timed("profile"):
+            table = self._profiles.get(country)
+            if table is None:
+                import pandas as pd
+
+                i = self._row[country]
+                t = len(self.types)
+                values = np.asarray(self.type_values[i], dtype=np.float64)
+                table = pd.DataFrame({
+                    "Type": self.types,
+                    "Ratio": values,
+                    "Rank": self.rank[i, :t],
+                    "Percentile": self.percentile[i, :t],
+                    "Deviation": values - self.type_means,
+                    "ZScore": self.zscore[i, :t],
+                })
+                self._profiles[country] = table
+            return table
+
+    def similarity(self, metric: str = "euclidean") -> similarity.SimilarityIndex:
+        """16개 유형 분포 벡터에 대한 유사도 인덱스 (거리 종류별로 하나, 파생 컬럼 제외)."""
+        index = self._similarity.get(metric)
+        if index is None:
+            with self._similarity_lock:
+                index = self._similarity.get(metric)
+                if index is None:
+                    index = similarity.SimilarityIndex(self.type_values, metric)
+                    self._similarity[metric] = index
+        return index
+
+    def similar(self, country: str, k: int = 5, metric: str = "euclidean") -> "pd.DataFrame":
+        """country와 유형 분포가 가장 비슷한 k개 나라 (가까운 순, Country / ISO3 / Distance)."""
+        import pandas as pd
+
+        with metrics.timed("similar"):
+            rows, distance = self.similarity(metric).neighbours(self._row[country], k)
+            return pd.DataFrame({
+                "Country": self.countries[rows],
+                "ISO3": self.iso3[rows],
+                "Distance": np.asarray(distance, dtype=np.float64),
+            })
+
+
+def build_index(path: str = DATA_PATH, bin_path: str = BIN_PATH) -> RankingIndex:
+    """데이터를 읽어 RankingIndex를 만듭니다. (Streamlit 없이도 사용 가능)
+
+    `python dataset_bin.py`로 만든 바이너리 파일이 지금의 CSV로 빌드되었으면(dataset_bin.is_fresh) memmap으로 열고,
+    없거나 손상되었으면 CSV를 읽습니다. 체크섬은 두 경로가 같은 정의(dataset_bin.dataset_checksum)입니다.
+    """
+    if bin_path and dataset_bin.is_fresh(bin_path, path):
+        try:
+            return RankingIndex.from_dataset(dataset_bin.open_dataset(bin_path))
+        except (OSError, ValueError):
+            pass  # CSV로 대체 (DatasetFormatError는 ValueError)
+    countries, columns, values, iso3, _ = dataset_bin.read_csv(path)
+    return RankingIndex.from_values(countries, columns, values, iso3=iso3)
+
+
+def source_checksum(path: str = DATA_PATH, bin_path: str = BIN_PATH) -> str:
+    """build_index가 지금 읽을 원본의 체크섬. 바이너리 파일은 헤더만 읽고, CSV는 읽어서 같은 정의로 계산합니다."""
+    if bin_path and dataset_bin.is_fresh(bin_path, path):
+        try:
+            return dataset_bin.read_checksum(bin_path)
+        except (OSError, dataset_bin.DatasetFormatError):
+            pass
+    countries, columns, values, iso3, _ = dataset_bin.read_csv(path)
+    return dataset_bin.dataset_checksum(countries, columns, values, iso3)
+
+
+class IndexStore:
+    """데이터 파일을 지켜보다가 내용이 바뀌면 새 RankingIndex로 통째로 바꿔 끼우는 저장소입니다.
+
+    - 백그라운드 스레드가 interval초마다 파일의 (수정 시각, 크기)를 확인하고,
+      두 번 연속 같은 값일 때(복사가 끝났을 때)만 체크섬을 계산합니다.
+    - 체크섬이 다르면 새 인덱스를 스레드에서 다 만든 뒤 참조 하나만 바꿉니다.
+      세션은 current()로 그 순간의 완성된 인덱스를 받으므로 반쯤 만든 상태를 보거나 기다리지 않습니다.
+    - 바이너리 파일이 지금의 CSV와 맞지 않으면(헤더의 CSV 크기/sha256) 다시 빌드해 다른 워커가 memmap으로 공유하게 합니다.
+      (수정 시각은 변경 감지에만 쓰므로, 더 오래된 수정 시각으로 바뀐 CSV도 다시 읽습니다)
+    - 새 파일을 읽지 못하면(형식 오류 등) 이전 인덱스를 계속 씁니다.
+    """
+
+    def __init__(self, path: str = DATA_PATH, bin_path: str = BIN_PATH,
+                 interval: float = RELOAD_INTERVAL, rebuild_bin: bool = True):
+        self.path = path
+        self.bin_path = bin_path
+        self.interval = interval
+        self.rebuild_bin = rebuild_bin
+        try:
+            self._refresh_bin()  # 바이너리 파일이 없거나 예전 포맷이면 처음에 한 번 만들어 다른 워커와 memmap으로 공유
+        except Exception as e:
+            logger.warning("바이너리 데이터셋을 만들지 못해 CSV를 읽습니다: %s", e)
+        self._loaded_stat = self._file_stat()
+        self._seen_stat = self._loaded_stat
+        self.index = build_index(path, bin_path)
+        self._stop = threading.Event()
+        self._thread = None
+
+    def current(self) -> RankingIndex:
+        return self.index
+
+    def _file_stat(self):
+        stat = []
+        for p in (self.path, self.bin_path):
+            try:
+                s = os.stat(p)
+                stat.append((s.st_mtime_ns, s.st_size))
+            except (OSError, TypeError):
+                stat.append(None)
+        return tuple(stat)
+
+    def _refresh_bin(self) -> bool:
+        """바이너리 파일이 지금의 CSV로 빌드되지 않았으면(또는 없거나 예전 포맷이면) 다시 빌드합니다."""
+        if not (self.rebuild_bin and self.bin_path and os.path.exists(self.path)):
+            return False
+        if dataset_bin.is_fresh(self.bin_path, self.path):
+            return False
+        dataset_bin.write_dataset(self.path, self.bin_path)
+        return True
+
+    def check(self) -> bool:
+        """한 번 확인합니다. 새 인덱스로 바꿨으면 True."""
+        stat = self._file_stat()
+        if stat == self._loaded_stat:
+            return False
+        if stat != self._seen_stat:
+            self._seen_stat = stat  # 아직 쓰는 중일 수 있으니 다음 확인까지 기다립니다.
+            return False
+        self._loaded_stat = stat
+        try:
+            if self._refresh_bin():
+                self._loaded_stat = self._seen_stat = self._file_stat()
+            if source_checksum(self.path, self.bin_path) == self.index.checksum:
+                return False  # 수정 시각만 바뀌고 내용은 그대로
+            with metrics.timed("reload_index"):
+                index = build_index(self.path, self.bin_path)
+        except Exception as e:
+            metrics.DATA_RELOADS.inc(result="error")
+            logger.warning("데이터 파일을 다시 읽지 못해 이전 데이터를 계속 씁니다: %s", e)
+            return False
+        self.index = index  # 참조 하나만 바꾸므로 읽는 쪽은 이전 또는 새 인덱스 중 하나를 봅니다.
+        metrics.DATA_RELOADS.inc(result="ok")
+        logger.info("데이터가 바뀌어 인덱스를 교체했습니다 (checksum %s)", index.checksum[:12])
+        return True
+
+    def start(self):
+        if self._thread is None:
+            self._thread = threading.Thread(target=self._run, name="data-watcher", daemon=True)
+            self._thread.start()
+        return self
+
+    def stop(self):
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+
+    def _run(self):
+        while not self._stop.wait(self.interval):
+            self.check()
+
+
+# 인덱스는 읽기 전용이므로 세션마다 복사하는 cache_data 대신 cache_resource로 공유합니다.
+# 저장소는 프로세스에 하나이고, 데이터가 바뀌면 저장소 안의 인덱스만 교체됩니다.
+# 그림/군집 캐시는 index.checksum을 키로 쓰므로 교체되면 새 데이터로 다시 만들어집니다.
+# MBTI_API_PORT를 주면 같은 저장소의 인덱스를 읽는 조회 API(api_server.py)도 이 프로세스에서 엽니다.
+@metrics.cached(st.cache_resource, show_spinner=False)
+def get_store(path: str = DATA_PATH, bin_path: str = BIN_PATH) -> IndexStore:
+    store = IndexStore(path, bin_path).start()
+    if API_PORT:
+        import api_server
+
+        api_server.serve(store.current, API_PORT)
+    return store
+
+
+def load_index(path: str = DATA_PATH, bin_path: str = BIN_PATH) -> RankingIndex:
+    return get_store(path, bin_path).current()
@@ -0,0 +1,86 @@
+import dichotomy
+
+# MBTI 유형 설명 (모든 페이지가 공유)
+# 페이지마다 따로 들고 있던 설명 딕셔너리를 한곳에 모았습니다. 순서는 기질 그룹(NT, NF, SJ, SP) 순입니다. (03의 카드 순서)
+# - role: 역할 이름, name: 별명, icon: 아이콘
+# - summary: 한 줄 설명 (mbti.py, 01, 02), desc: 카드용 설명 (03)
+TYPES = {
+    "INTJ": {"role": "전략가", "name": "용의주도한 전략가", "icon": "♟️",
+             "summary": "상상력이 풍부하며 철두철미한 계획을 세웁니다.",
+             "desc": "상상력이 풍부하며 철두철미한 계획을 세우는 전략가형입니다."},
+    "INTP": {"role": "논리술사", "name": "논리적인 사색가", "icon": "🧪",
+             "summary": "끊임없이 새로운 지식에 목말라하는 혁신가입니다.",
+             "desc": "끊임없이 새로운 지식에 목말라하는 혁신가형입니다."},
+    "ENTJ": {"role": "통솔자", "name": "대담한 통솔자", "icon": "🦁",
+             "summary": "대담하고 상상력이 풍부하며 강한 의지의 지도자입니다.",
+             "desc": "대담하고 상상력이 풍부하며 강한 의지의 지도자형입니다."},
+    "ENTP": {"role": "변론가", "name": "뜨거운 논쟁을 즐기는 변론가", "icon": "🔥",
+             "summary": "지적인 도전을 두려워하지 않는 똑똑한 호기심 대장입니다.",
+             "desc": "지적인 도전을 두려워하지 않는 똑똑한 호기심형입니다."},
+    "INFJ": {"role": "옹호자", "name": "선의의 옹호자", "icon": "🧙‍♂️",
+             "summary": "조용하고 신비로우며 샘솟는 영감으로 타인을 돕습니다.",
+             "desc": "조용하고 신비로우며 샘솟는 영감으로 타인을 돕는 이상주의자입니다."},
+    "INFP": {"role": "중재자", "name": "열정적인 중재자", "icon": "🌿",
+             "summary": "상냥하고 이타적이며 낭만적인 이상주의자입니다.",
+             "desc": "상냥하고 이타적이며 낭만적인 성향을 가진 중재자형입니다."},
+    "ENFJ": {"role": "선도자", "name": "정의로운 사회운동가", "icon": "🗣️",
+             "summary": "청중을 사로잡고 의욕을 불어넣는 카리스마 넘치는 리더입니다.",
+             "desc": "넘치는 카리스마와 영향력으로 청중을 압도하는 리더형입니다."},
+    "ENFP": {"role": "활동가", "name": "재기발랄한 활동가", "icon": "🎉",
+             "summary": "창의적이고 항상 웃을 거리를 찾아내는 활발한 사람입니다.",
+             "desc": "창의적이며 항상 웃을 거리를 찾아다니는 활발한 활동가형입니다."},
+    "ISTJ": {"role": "현실주의자", "name": "청렴결백한 논리주의자", "icon": "📊",
+             "summary": "사실에 근거하여 사고하며 행동합니다.",
+             "desc": "사실에 근거하여 사고하며 현실 감각이 뛰어난 모범생형입니다."},
+    "ISFJ": {"role": "수호자", "name": "용감한 수호자", "icon": "🛡️",
+             "summary": "소중한 이들을 지키고 헌신하는 방어자입니다.",
+             "desc": "소중한 이들을 지키기 위해 헌신하는 성실한 방어자형입니다."},
+    "ESTJ": {"role": "경영자", "name": "엄격한 관리자", "icon": "⚖️",
+             "summary": "사물과 사람을 관리하는 데 뛰어난 능력을 보입니다.",
+             "desc": "사물과 사람을 관리하는 데 타의 추종을 불허하는 관리자형입니다."},
+    "ESFJ": {"role": "집정관", "name": "사교적인 외교관", "icon": "🤝",
+             "summary": "타인을 돕는 데 열성적인 세심하고 사교적인 사람입니다.",
+             "desc": "타인을 향한 세심한 관심과 사교적인 성향을 가진 마당발형입니다."},
+    "ISTP": {"role": "장인", "name": "만능 재주꾼", "icon": "🛠️",
+             "summary": "대담하고 현실적인 성향으로 도구 사용에 능숙합니다.",
+             "desc": "대담하고 현실적인 성향으로 다양한 도구 사용에 능숙한 탐험가형입니다."},
+    "ISFP": {"role": "모험가", "name": "호기심 많은 예술가", "icon": "🎨",
+             "summary": "항시 새로운 경험을 추구하는 유연하고 매력적인 예술가입니다.",
+             "desc": "항상 새로운 것을 찾아 시도하거나 도전할 준비가 된 융통성 있는 성향입니다."},
+    "ESTP": {"role": "사업가", "name": "모험을 즐기는 사업가", "icon": "🚀",
+             "summary": "영리하고 에너지 넘치며 관찰력이 뛰어납니다.",
+             "desc": "위험을 기꺼이 감수하며 영리하고 에너지 넘치는 사업가형입니다."},
+    "ESFP": {"role": "연예인", "name": "자유로운 영혼의 연예인", "icon": "💃",
+             "summary": "주위에 있으면 인생이 지루할 틈이 없습니다.",
+             "desc": "주위에 있으면 인생이 지루할 새가 없을 정도로 즉흥적인 연예인형입니다."},
+}
+
+# mbti.py, 01, 02의 선택지 순서 (I/E, S/N, F/T 순서로 된 16유형 표 순서)
+SELECT_ORDER = (
+    "ISTJ", "ISFJ", "INFJ", "INTJ", "ISTP", "ISFP", "INFP", "INTP",
+    "ESTP", "ESFP", "ENFP", "ENTP", "ESTJ", "ESFJ", "ENFJ", "ENTJ",
+)
+
+
+def descriptions(nickname: bool = False) -> dict:
+    """선택지 -> 한 줄 설명. 예) "전략가 - ..." (nickname=True면 "전략가 (용의주도한 전략가) - ...")
+
+    성향 축(E/I, S/N, T/F, J/P)과 기질 그룹(NT, NF, SJ, SP)도 유형처럼 고를 수 있습니다. (dichotomy.py)
+    """
+    info = {}
+    for mbti in SELECT_ORDER:
+        t = TYPES[mbti]
+        role = f"{t['role']} ({t['name']})" if nickname else t["role"]
+        info[mbti] = f"{role} - {t['summary']}"
+    info.update(dichotomy.DESCRIPTIONS)
+    return info
+
+
+def cards() -> dict:
+    """선택지 -> {"name", "icon", "desc"} (결과 화면 헤더용). 파생 컬럼도 포함합니다."""
+    info = {mbti: {"name": t["name"], "icon": t["icon"], "desc": t["desc"]} for mbti, t in TYPES.items()}
+    info.update({
+        c: {"name": dichotomy.LABELS[c], "icon": dichotomy.ICONS[c], "desc": dichotomy.DESCRIPTIONS[c]}
+        for c in dichotomy.FEATURES
+    })
+    return info
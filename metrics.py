@@ -0,0 +1,291 @@
+"""가벼운 성능 지표 수집 (Prometheus 텍스트 포맷)
+
+각 페이지의 비싼 단계(데이터 로드, 상위 k 슬라이스, 차트 생성, 외부 호출 등)에
+타이머를 달아 단계별 히스토그램을 모으고, 캐시 적중/미스와 외부 호출 횟수를 셉니다.
+프로세스 하나의 값이며, 추가 패키지 없이 표준 라이브러리만 사용합니다.
+
+- MBTI_METRICS_PORT 환경 변수를 주면 그 포트에서 /metrics를 내보냅니다.
+  (Streamlit 서버에는 임의 경로를 달 수 없어 별도 스레드의 작은 HTTP 서버를 씁니다)
+- 페이지 주소에 ?debug=1을 붙이거나 MBTI_DEBUG=1이면 사이드바에 지표 패널이 나옵니다.
+
+사용 예:
+    with metrics.timed("top_k"):
+        ...
+
+    @metrics.timed("fetch_dog_image_url")
+    def fetch(...): ...
+
+    @metrics.cached(st.cache_resource, show_spinner=False)
+    def load_index(...): ...
+"""
+import bisect
+import functools
+import logging
+import os
+import threading
+import time
+from collections import deque
+from contextlib import contextmanager
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+METRICS_PORT = os.environ.get("MBTI_METRICS_PORT")
+DEBUG = os.environ.get("MBTI_DEBUG") == "1"
+# 히스토그램 구간(초): 1ms ~ 10s
+BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+RECENT_SAMPLES = 512  # 디버그 패널의 백분위 계산용으로 최근 값만 보관
+
+logger = logging.getLogger(__name__)
+
+
+def _label_text(names, values) -> str:
+    if not names:
+        return ""
+    pairs = []
+    for name, value in zip(names, values):
+        value = str(value).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+        pairs.append(f'{name}="{value}"')
+    return "{" + ",".join(pairs) + "}"
+
+
+class Counter:
+    """라벨별로 증가만 하는 카운터."""
+
+    kind = "counter"
+
+    def __init__(self, name: str, help_text: str, labels=()):
+        self.name = name
+        self.help = help_text
+        self.labels = tuple(labels)
+        self._values = {}
+        self._lock = threading.Lock()
+
+    def inc(self, amount: float = 1, **labels):
+        key = tuple(labels[name] for name in self.labels)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0) + amount
+
+    def items(self):
+        with self._lock:
+            return sorted(self._values.items())
+
+    def render(self):
+        for key, value in self.items():
+            yield f"{self.name}{_label_text(self.labels, key)} {value:g}"
+
+
+class Histogram:
+    """라벨별 누적 구간 히스토그램. 최근 값 RECENT_SAMPLES개도 함께 보관합니다."""
+
+    kind = "histogram"
+
+    def __init__(self, name: str, help_text: str, labels=(), buckets=BUCKETS):
+        self.name = name
+        self.help = help_text
+        self.labels = tuple(labels)
+        self.buckets = tuple(buckets)
+        self._series = {}
+        self._lock = threading.Lock()
+
+    def observe(self, value: float, **labels):
+        key = tuple(labels[name] for name in self.labels)
+        with self._lock:
+            series = self._series.get(key)
+            if series is None:
+                series = self._series[key] = {
+                    "counts": [0] * (len(self.buckets) + 1),
+                    "sum": 0.0,
+                    "max": 0.0,
+                    "recent": deque(maxlen=RECENT_SAMPLES),
+                }
+            series["counts"][bisect.bisect_left(self.buckets, value)] += 1
+            series["sum"] += value
+            series["max"] = max(series["max"], value)
+            series["recent"].append(value)
+
+    def summary(self):
+        """라벨별 (횟수, p50, p95, 최대) - 백분위는 최근 값 기준."""
+        with self._lock:
+            rows = []
+            for key, series in sorted(self._series.items()):
+                recent = sorted(series["recent"])
+                rows.append({
+                    "labels": dict(zip(self.labels, key)),
+                    "count": sum(series["counts"]),
+                    "p50": recent[int(0.50 * (len(recent) - 1))],
+                    "p95": recent[int(0.95 * (len(recent) - 1))],
+                    "max": series["max"],
+                })
+            return rows
+
+    def render(self):
+        with self._lock:
+            series_items = sorted((key, list(s["counts"]), s["sum"]) for key, s in self._series.items())
+        for key, counts, total in series_items:
+            cumulative = 0
+            for bound, count in zip(self.buckets + (float("inf"),), counts):
+                cumulative += count
+                le = "+Inf" if bound == float("inf") else f"{bound:g}"
+                yield f"{self.name}_bucket{_label_text(self.labels + ('le',), key + (le,))} {cumulative}"
+            yield f"{self.name}_sum{_label_text(self.labels, key)} {total:.6f}"
+            yield f"{self.name}_count{_label_text(self.labels, key)} {cumulative}"
+
+
+STEP_SECONDS = Histogram("mbti_step_seconds", "페이지 단계별 실행 시간(초)", ["step"])
+RERUN_SECONDS = Histogram("mbti_rerun_seconds", "페이지 스크립트 한 번 실행(rerun) 시간(초)", ["page"])
+CACHE_REQUESTS = Counter("mbti_cache_requests_total", "st.cache_* 함수 호출 수 (적중/미스)", ["function", "result"])
+HTTP_REQUESTS = Counter("mbti_http_requests_total", "외부 HTTP 호출 수", ["host", "outcome"])
+DATA_RELOADS = Counter("mbti_data_reloads_total", "데이터 파일 변경으로 인덱스를 다시 만든 횟수", ["result"])
+API_REQUESTS = Counter("mbti_api_requests_total", "조회 API(api_server.py) 요청 수", ["endpoint", "status"])
+REGISTRY = [STEP_SECONDS, RERUN_SECONDS, CACHE_REQUESTS, HTTP_REQUESTS, DATA_RELOADS, API_REQUESTS]
+
+
+def render() -> str:
+    """모든 지표를 Prometheus 텍스트 포맷(0.0.4)으로 돌려줍니다."""
+    lines = []
+    for metric in REGISTRY:
+        help_text = metric.help.replace("\\", "\\\\").replace("\n", "\\n")
+        lines.append(f"# HELP {metric.name} {help_text}")
+        lines.append(f"# TYPE {metric.name} {metric.kind}")
+        lines.extend(metric.render())
+    return "\n".join(lines) + "\n"
+
+
+@contextmanager
+def timed(step: str):
+    """블록(또는 데코레이터로 감싼 함수) 실행 시간을 STEP_SECONDS에 기록합니다. 예외가 나도 기록합니다."""
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        STEP_SECONDS.observe(time.perf_counter() - start, step=step)
+
+
+def rerun_started() -> float:
+    return time.perf_counter()
+
+
+def rerun_finished(page: str, started: float):
+    RERUN_SECONDS.observe(time.perf_counter() - started, page=page)
+
+
+@contextmanager
+def rerun(page: str):
+    """main() 같은 페이지 본문 전체를 감싸 rerun 시간을 기록합니다. (st.stop()으로 끝나도 기록)"""
+    started = rerun_started()
+    try:
+        yield
+    finally:
+        rerun_finished(page, started)
+
+
+_local = threading.local()
+
+
+def cached(cache, name: str = None, **options):
+    """cache(**options)로 감싼 함수를 만들면서 호출마다 적중/미스를 셉니다.
+
+    원래 함수 본문이 실행되면 미스, 캐시에서 바로 돌아오면 적중입니다.
+    예) @metrics.cached(st.cache_resource, show_spinner=False)
+    """
+    def decorate(func):
+        label = name or func.__name__
+
+        @functools.wraps(func)
+        def compute(*args, **kwargs):
+            _local.misses = getattr(_local, "misses", 0) + 1
+            return func(*args, **kwargs)
+
+        cached_func = cache(**options)(compute)
+
+        @functools.wraps(func)
+        def call(*args, **kwargs):
+            before = getattr(_local, "misses", 0)
+            result = cached_func(*args, **kwargs)
+            missed = getattr(_local, "misses", 0) != before
+            CACHE_REQUESTS.inc(function=label, result="miss" if missed else "hit")
+            return result
+
+        call.clear = cached_func.clear
+        return call
+
+    return decorate
+
+
+# --- /metrics HTTP 서버 ---
+class _MetricsHandler(BaseHTTPRequestHandler):
+    def do_GET(self):
+        if self.path.split("?")[0] != "/metrics":
+            self.send_error(404)
+            return
+        body = render().encode("utf-8")
+        self.send_response(200)
+        self.send_header("Content-Type", "text/plain; version=0.0.4; charset=utf-8")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        pass  # 스크랩 요청마다 로그를 남기지 않습니다.
+
+
+_server = None
+_server_lock = threading.Lock()
+
+
+def serve(port: int, host: str = "0.0.0.0"):
+    """백그라운드 스레드에서 /metrics를 엽니다. 이미 열려 있으면 그 서버를 돌려줍니다."""
+    global _server
+    with _server_lock:
+        if _server is None:
+            try:
+                _server = ThreadingHTTPServer((host, int(port)), _MetricsHandler)
+            except OSError as e:
+                # 같은 포트를 다른 워커 프로세스가 이미 쓰는 경우 등
+                logger.warning("지표 서버를 열지 못했습니다 (포트 %s): %s", port, e)
+                return None
+            _server.daemon_threads = True
+            threading.Thread(target=_server.serve_forever, name="metrics-server", daemon=True).start()
+        return _server
+
+
+# --- 디버그 패널 ---
+def debug_enabled() -> bool:
+    import streamlit as st
+
+    return DEBUG or st.query_params.get("debug") == "1"
+
+
+def debug_sidebar():
+    """?debug=1일 때 사이드바에 단계별 시간, 캐시 적중률, 외부 호출 수를 보여줍니다."""
+    import streamlit as st
+
+    if not debug_enabled():
+        return
+    with st.sidebar.expander("🛠️ 성능 지표 (debug)", expanded=False):
+        def ms(seconds):
+            return round(seconds * 1000, 2)
+
+        steps = [
+            {"단계": r["labels"]["step"], "횟수": r["count"], "p50 ms": ms(r["p50"]), "p95 ms": ms(r["p95"]), "최대 ms": ms(r["max"])}
+            for r in STEP_SECONDS.summary()
+        ]
+        steps += [
+            {"단계": f"rerun:{r['labels']['page']}", "횟수": r["count"], "p50 ms": ms(r["p50"]), "p95 ms": ms(r["p95"]), "최대 ms": ms(r["max"])}
+            for r in RERUN_SECONDS.summary()
+        ]
+        st.dataframe(steps, hide_index=True, use_container_width=True)
+
+        caches = {}
+        for (function, result), value in CACHE_REQUESTS.items():
+            caches.setdefault(function, {"함수": function, "hit": 0, "miss": 0})[result] = int(value)
+        if caches:
+            st.dataframe(list(caches.values()), hide_index=True, use_container_width=True)
+
+        calls = [{"호스트": host, "결과": outcome, "횟수": int(value)} for (host, outcome), value in HTTP_REQUESTS.items()]
+        if calls:
+            st.dataframe(calls, hide_index=True, use_container_width=True)
+        st.caption("프로세스 전체 누적값입니다. Prometheus: MBTI_METRICS_PORT를 설정하면 /metrics")
+
+
+if METRICS_PORT:
+    serve(METRICS_PORT)
@@ -1,5 +1,8 @@
 import streamlit as st
-import pandas as pd
+import metrics
+import mbti_data
+import mbti_types
+import dichotomy
 
 # 1. 페이지 기본 설정
 st.set_page_config(
@@ -9,44 +12,28 @@ st.set_page_config(
 )
 
 # 2. 데이터 로드 함수 (캐싱을 사용하여 성능 최적화)
-@st.cache_data
+# 정렬 인덱스는 mbti_data 모듈에서 한 번만 만들어 모든 페이지가 공유합니다.
+@metrics.timed("load_data")
 def load_data():
     # CSV 파일 로드 (파일 이름이 정확해야 합니다)
     try:
-        df = pd.read_csv('countriesMBTI_16types.csv')
-        return df
+        return mbti_data.load_index()
     except FileNotFoundError:
         st.error("데이터 파일을 찾을 수 없습니다. 'countriesMBTI_16types.csv' 파일을 같은 폴더에 위치시켜주세요.")
         return None
 
-# 3. MBTI 설명 딕셔너리
-mbti_info = {
-    "ISTJ": "현실주의자 (청렴결백한 논리주의자) - 사실에 근거하여 사고하며 행동합니다.",
-    "ISFJ": "수호자 (용감한 수호자) - 소중한 이들을 지키고 헌신하는 방어자입니다.",
-    "INFJ": "옹호자 (선의의 옹호자) - 조용하고 신비로우며 샘솟는 영감으로 타인을 돕습니다.",
-    "INTJ": "전략가 (용의주도한 전략가) - 상상력이 풍부하며 철두철미한 계획을 세웁니다.",
-    "ISTP": "장인 (만능 재주꾼) - 대담하고 현실적인 성향으로 도구 사용에 능숙합니다.",
-    "ISFP": "모험가 (호기심 많은 예술가) - 항시 새로운 경험을 추구하는 유연하고 매력적인 예술가입니다.",
-    "INFP": "중재자 (열정적인 중재자) - 상냥하고 이타적이며 낭만적인 이상주의자입니다.",
-    "INTP": "논리술사 (논리적인 사색가) - 끊임없이 새로운 지식에 목말라하는 혁신가입니다.",
-    "ESTP": "사업가 (모험을 즐기는 사업가) - 영리하고 에너지 넘치며 관찰력이 뛰어납니다.",
-    "ESFP": "연예인 (자유로운 영혼의 연예인) - 주위에 있으면 인생이 지루할 틈이 없습니다.",
-    "ENFP": "활동가 (재기발랄한 활동가) - 창의적이고 항상 웃을 거리를 찾아내는 활발한 사람입니다.",
-    "ENTP": "변론가 (뜨거운 논쟁을 즐기는 변론가) - 지적인 도전을 두려워하지 않는 똑똑한 호기심 대장입니다.",
-    "ESTJ": "경영자 (엄격한 관리자) - 사물과 사람을 관리하는 데 뛰어난 능력을 보입니다.",
-    "ESFJ": "집정관 (사교적인 외교관) - 타인을 돕는 데 열성적인 세심하고 사교적인 사람입니다.",
-    "ENFJ": "선도자 (정의로운 사회운동가) - 청중을 사로잡고 의욕을 불어넣는 카리스마 넘치는 리더입니다.",
-    "ENTJ": "통솔자 (대담한 통솔자) - 대담하고 상상력이 풍부하며 강한 의지의 지도자입니다."
-}
+# 3. MBTI 설명 딕셔너리 (모든 페이지 공유, 성향 축/기질 그룹 포함: mbti_types.py)
+mbti_info = mbti_types.descriptions(nickname=True)
 
 # 4. 메인 앱 로직
 def main():
     st.title("🌏 당신의 MBTI는 어디서 가장 인기가 많을까요?")
     st.markdown("---")
+    metrics.debug_sidebar()  # ?debug=1일 때만 표시
 
-    df = load_data()
+    index = load_data()
 
-    if df is not None:
+    if index is not None:
         # 사이드바 혹은 메인 상단에 선택지 배치
         st.subheader("1️⃣ 당신의 MBTI를 선택해주세요")
         
@@ -54,7 +41,7 @@ def main():
         mbti_options = ["선택해주세요"] + list(mbti_info.keys())
         
         # selectbox 생성
-        selected_mbti = st.selectbox("MBTI 유형", mbti_options)
+        selected_mbti = st.selectbox("MBTI 유형", mbti_options, format_func=dichotomy.label)
 
         # 조건부 렌더링: MBTI가 선택되지 않았을 때
         if selected_mbti == "선택해주세요":
@@ -71,19 +58,18 @@ def main():
             st.subheader(f"2️⃣ {selected_mbti} 비율이 높은 나라 Top 5")
 
             # 4-2. 통계 정보 처리
-            # 해당 MBTI 컬럼 기준으로 내림차순 정렬하여 상위 5개국 추출
+            # 미리 정렬해 둔 인덱스에서 상위 5개국을 슬라이스로 가져옵니다.
+            # (Percentage 컬럼은 인덱스 생성 시 0.05 -> 5.0% 로 변환되어 있습니다)
             try:
-                top_countries = df[['Country', selected_mbti]].sort_values(by=selected_mbti, ascending=False).head(5)
-                
-                # 데이터 가독성을 위해 퍼센트로 변환 (0.05 -> 5.0%)
-                top_countries['Percentage'] = top_countries[selected_mbti].apply(lambda x: x * 100)
+                top_countries = index.top_k(selected_mbti, 5)
                 
                 # 컬럼 2개로 나누어 배치 (왼쪽: 차트, 오른쪽: 멘트 및 1위 국가)
                 col1, col2 = st.columns([2, 1])
                 
                 with col1:
                     # 막대 차트 그리기 (Streamlit 내장 차트)
-                    st.bar_chart(top_countries.set_index('Country')['Percentage'])
+                    with metrics.timed("bar_chart"):
+                        st.bar_chart(top_countries.set_index('Country')['Percentage'])
                     st.caption("단위: 전체 인구 대비 비율(%)")
 
                 with col2:
@@ -104,10 +90,12 @@ def main():
                 
                 # 전체 데이터 보기 (옵션)
                 with st.expander("📊 전체 통계 데이터 보기"):
-                    st.dataframe(df[['Country', selected_mbti]].sort_values(by=selected_mbti, ascending=False))
+                    st.dataframe(index.table(selected_mbti)[['Country', selected_mbti]])
 
             except KeyError:
                 st.error("데이터 파일에서 해당 MBTI 컬럼을 찾을 수 없습니다. CSV 파일 형식을 확인해주세요.")
 
 if __name__ == "__main__":
-    main()
+    # rerun 전체 시간 기록 (st.stop()으로 끝나도 기록됩니다)
+    with metrics.rerun("01-first"):
+        main()
@@ -1,10 +1,14 @@
 import streamlit as st
-import pandas as pd
-import plotly.express as px
-import plotly.graph_objects as go
-import requests
-from streamlit_lottie import st_lottie
-import time
+import metrics
+import mbti_data
+import mbti_types
+import dichotomy
+from clustering import ClusterStore, K_RANGE
+from geo_assets import geometry_url
+from lottie_assets import LottieLoader
+
+# plotly.express, pandas, streamlit_lottie는 그 화면을 실제로 그릴 때 import합니다.
+# (워커가 새로 뜬 뒤 첫 화면이 무거운 의존성을 기다리지 않도록, bench/import_report.py로 확인)
 
 # --- 1. 페이지 설정 & 스타일링 (삐까번쩍 모드) ---
 st.set_page_config(
@@ -13,6 +17,8 @@ st.set_page_config(
     layout="wide",
     initial_sidebar_state="expanded"
 )
+# rerun 전체 시간 측정 시작 (스크립트 맨 끝에서 기록)
+rerun_started = metrics.rerun_started()
 
 # 커스텀 CSS: 그라디언트, 폰트, 카드 스타일링
 st.markdown("""
@@ -52,61 +58,223 @@ st.markdown("""
     """, unsafe_allow_html=True)
 
 # --- 2. 데이터 로드 및 전처리 ---
-@st.cache_data
+# 정렬 인덱스는 mbti_data 모듈에서 한 번만 만들어 모든 페이지가 공유합니다.
+@metrics.timed("load_data")
 def load_data():
-    df = pd.read_csv('countriesMBTI_16types.csv')
-    return df
-
-@st.cache_data
-def load_lottieurl(url: str):
-    r = requests.get(url)
-    if r.status_code != 200:
-        return None
-    return r.json()
-
-df = load_data()
-
-# --- 3. MBTI 데이터 사전 (설명 및 별명) ---
-mbti_info = {
-    "INTJ": {"name": "용의주도한 전략가", "icon": "♟️", "desc": "상상력이 풍부하며 철두철미한 계획을 세우는 전략가형입니다."},
-    "INTP": {"name": "논리적인 사색가", "icon": "🧪", "desc": "끊임없이 새로운 지식에 목말라하는 혁신가형입니다."},
-    "ENTJ": {"name": "대담한 통솔자", "icon": "🦁", "desc": "대담하고 상상력이 풍부하며 강한 의지의 지도자형입니다."},
-    "ENTP": {"name": "뜨거운 논쟁을 즐기는 변론가", "icon": "🔥", "desc": "지적인 도전을 두려워하지 않는 똑똑한 호기심형입니다."},
-    "INFJ": {"name": "선의의 옹호자", "icon": "🧙‍♂️", "desc": "조용하고 신비로우며 샘솟는 영감으로 타인을 돕는 이상주의자입니다."},
-    "INFP": {"name": "열정적인 중재자", "icon": "🌿", "desc": "상냥하고 이타적이며 낭만적인 성향을 가진 중재자형입니다."},
-    "ENFJ": {"name": "정의로운 사회운동가", "icon": "🗣️", "desc": "넘치는 카리스마와 영향력으로 청중을 압도하는 리더형입니다."},
-    "ENFP": {"name": "재기발랄한 활동가", "icon": "🎉", "desc": "창의적이며 항상 웃을 거리를 찾아다니는 활발한 활동가형입니다."},
-    "ISTJ": {"name": "청렴결백한 논리주의자", "icon": "📊", "desc": "사실에 근거하여 사고하며 현실 감각이 뛰어난 모범생형입니다."},
-    "ISFJ": {"name": "용감한 수호자", "icon": "🛡️", "desc": "소중한 이들을 지키기 위해 헌신하는 성실한 방어자형입니다."},
-    "ESTJ": {"name": "엄격한 관리자", "icon": "⚖️", "desc": "사물과 사람을 관리하는 데 타의 추종을 불허하는 관리자형입니다."},
-    "ESFJ": {"name": "사교적인 외교관", "icon": "🤝", "desc": "타인을 향한 세심한 관심과 사교적인 성향을 가진 마당발형입니다."},
-    "ISTP": {"name": "만능 재주꾼", "icon": "🛠️", "desc": "대담하고 현실적인 성향으로 다양한 도구 사용에 능숙한 탐험가형입니다."},
-    "ISFP": {"name": "호기심 많은 예술가", "icon": "🎨", "desc": "항상 새로운 것을 찾아 시도하거나 도전할 준비가 된 융통성 있는 성향입니다."},
-    "ESTP": {"name": "모험을 즐기는 사업가", "icon": "🚀", "desc": "위험을 기꺼이 감수하며 영리하고 에너지 넘치는 사업가형입니다."},
-    "ESFP": {"name": "자유로운 영혼의 연예인", "icon": "💃", "desc": "주위에 있으면 인생이 지루할 새가 없을 정도로 즉흥적인 연예인형입니다."}
-}
+    return mbti_data.load_index()
+
+# Lottie 로더는 프로세스 전체가 공유합니다. (워커 풀 + 디스크 캐시 + 오프라인 대체 애니메이션)
+@metrics.cached(st.cache_resource)
+def get_lottie_loader():
+    return LottieLoader()
+
+def render_lottie(slot, future, height: int, key: str):
+    """미리 요청해 둔 애니메이션을 자리(slot)에 채워 넣습니다.
+
+    LOTTIE_TIMEOUT초 안에 준비되지 않으면 rerun을 막지 않고 대체 애니메이션을 바로 보여줍니다.
+    (다운로드는 계속되고, 다음 rerun부터 받아 둔 애니메이션을 씁니다)
+    """
+    try:
+        data = future.result(timeout=LOTTIE_TIMEOUT)
+    except Exception:
+        data = get_lottie_loader().fallback()
+    if data:
+        from streamlit_lottie import st_lottie
+
+        with slot:
+            st_lottie(data, height=height, key=key)
+
+# 유형별 지도/막대 그림 캐시 (데이터 체크섬별로 하나). 서버 시작 시 16개 유형을 미리 그려 둡니다.
+FIGURE_WARM_UP = True
+# 로컬 지도 geometry 단순화 단계 (low / medium / high). static/geo에 파일이 없으면 Plotly 기본 지도 사용
+MAP_GEOMETRY_LEVEL = "medium"
+# 데이터 파일이 바뀌면(mbti_data.IndexStore) 새 체크섬으로 캐시가 새로 만들어지므로, 이전 데이터의 캐시는 이 개수만 남깁니다.
+CACHE_VERSIONS = 2
+
+@metrics.cached(st.cache_resource, max_entries=CACHE_VERSIONS)
+def get_figure_cache(_index, checksum: str):
+    from figure_cache import FigureCache
+
+    figures = FigureCache(_index, geometry_url=geometry_url(MAP_GEOMETRY_LEVEL))
+    if FIGURE_WARM_UP:
+        figures.warm_up()
+    return figures
+
+# 나라 성향 군집(k-means) 저장소. 결과는 (데이터 체크섬, k)별로 .cache/clusters에 저장되어
+# rerun이나 서버 재시작 때 다시 계산하지 않고, 데이터가 바뀌면 이전 중심점에서 이어서 계산합니다.
+CLUSTER_K_DEFAULT = 4
+
+@metrics.cached(st.cache_resource)
+def get_cluster_store():
+    return ClusterStore()
+
+@metrics.cached(st.cache_resource, max_entries=CACHE_VERSIONS * (K_RANGE[1] - K_RANGE[0] + 1))
+def get_clusters(_index, checksum: str, k: int):
+    return get_cluster_store().get(_index.type_values, checksum, k, _index.types)
+
+index = load_data()
+
+# --- 3. MBTI 데이터 사전 (설명 및 별명, 모든 페이지 공유: mbti_types.py) ---
+mbti_info = mbti_types.cards()
 
 # Lottie 애니메이션 URL
-lottie_welcome = load_lottieurl("https://assets5.lottiefiles.com/packages/lf20_puciaact.json")
-lottie_analysis = load_lottieurl("https://assets9.lottiefiles.com/packages/lf20_w51pcehl.json")
+LOTTIE_WELCOME_URL = "https://assets5.lottiefiles.com/packages/lf20_puciaact.json"
+LOTTIE_ANALYSIS_URL = "https://assets9.lottiefiles.com/packages/lf20_w51pcehl.json"
+LOTTIE_TIMEOUT = 0.3  # 스크립트 끝에서 애니메이션을 기다리는 최대 시간(초)
+
+# 두 애니메이션을 동시에 요청만 해 두고(기다리지 않음), 지표와 지도를 먼저 그린 뒤
+# 스크립트 마지막에 준비된 애니메이션을 빈 자리에 채웁니다.
+lottie_loader = get_lottie_loader()
+lottie_welcome = lottie_loader.load(LOTTIE_WELCOME_URL)
+lottie_analysis = lottie_loader.load(LOTTIE_ANALYSIS_URL)
+lottie_slots = []
 
 # --- 4. 사이드바 UI ---
+TYPE_VIEW = "유형별 분포"
+COMPARE_VIEW = "유형 비교"
+CLUSTER_VIEW = "성향 군집"
+# 유형 비교 화면의 기본 선택과 유형별로 보여줄 나라 수
+COMPARE_DEFAULT = ["INTJ", "INTP", "ENTJ", "ENTP"]
+COMPARE_TOP_K = 5
+
 with st.sidebar:
     st.image("https://upload.wikimedia.org/wikipedia/commons/thumb/c/c3/Python-logo-notext.svg/1200px-Python-logo-notext.svg.png", width=50)
     st.title("MBTI Selector")
     st.markdown("---")
-    
-    # 초기 상태: 선택 안됨
-    options = ["선택해주세요"] + list(mbti_info.keys())
-    selected_mbti = st.selectbox("당신의 MBTI를 선택하세요:", options)
+
+    # 보기 방식: 유형 하나의 분포 / 여러 유형 비교 / 16개 유형 전체로 나눈 나라 군집
+    view = st.radio("보기 방식", [TYPE_VIEW, COMPARE_VIEW, CLUSTER_VIEW])
+
+    if view == CLUSTER_VIEW:
+        selected_mbti = None
+        cluster_k = st.slider("군집 수 (k)", K_RANGE[0], K_RANGE[1], CLUSTER_K_DEFAULT)
+    elif view == COMPARE_VIEW:
+        selected_mbti = None
+        compare_types = st.multiselect("비교할 유형을 고르세요:", list(mbti_info.keys()), default=COMPARE_DEFAULT, format_func=dichotomy.label)
+        compare_sum = st.checkbox("선택한 유형 합쳐서 보기", help="예) INTJ, INTP, ENTJ, ENTP를 고르면 NT 전체 비율")
+    else:
+        # 초기 상태: 선택 안됨
+        options = ["선택해주세요"] + list(mbti_info.keys())
+        selected_mbti = st.selectbox("당신의 MBTI를 선택하세요:", options, format_func=dichotomy.label)
     
     st.markdown("---")
     st.info("💡 이 앱은 전 세계 MBTI 분포 데이터를 기반으로 분석합니다.")
     st.caption("Created with Streamlit & Plotly")
 
+metrics.debug_sidebar()  # ?debug=1일 때만 표시
+
 # --- 5. 메인 로직 ---
 
-if selected_mbti == "선택해주세요":
+if view == CLUSTER_VIEW:
+    # --- 성향 군집 화면 ---
+    import pandas as pd
+
+    figures = get_figure_cache(index, index.checksum)
+    clusters = get_clusters(index, index.checksum, cluster_k)
+    names = clusters.names(index.type_means)
+
+    st.title("🧩 MBTI 분포가 닮은 나라들")
+    st.write("> 16개 유형 비율 전체를 기준으로 나라들을 k개 군집으로 묶었습니다. (k-means)")
+
+    with metrics.timed("map_chart"):
+        st.plotly_chart(figures.cluster_figure(clusters), use_container_width=True)
+
+    # 군집별 나라 수와 대표 유형 (군집 중심점이 전체 평균보다 높은 유형)
+    sizes = clusters.sizes()
+    members = [index.countries[clusters.labels == c] for c in range(clusters.k)]
+    summary = pd.DataFrame({
+        "군집": names,
+        "나라 수": sizes,
+        "나라 예시": [", ".join(m[:5]) + (" ..." if len(m) > 5 else "") for m in members],
+    })
+    st.markdown("### 📋 군집 요약")
+    st.dataframe(summary, hide_index=True, use_container_width=True)
+
+    with st.expander("📊 군집 중심점 (유형별 평균 비율)"):
+        centroids = pd.DataFrame(clusters.centroids * 100, columns=index.types, index=names).round(2)
+        st.dataframe(centroids, use_container_width=True)
+
+    st.markdown("---")
+    st.caption("Data Source: World MBTI Stats | Visualization by Streamlit")
+
+elif view == COMPARE_VIEW:
+    # --- 유형 비교 화면 ---
+    import plotly.express as px
+    import plotly.graph_objects as go
+
+    st.title("⚖️ MBTI 유형 비교")
+
+    if not compare_types:
+        st.info("👈 **왼쪽 사이드바**에서 비교할 유형을 하나 이상 골라주세요.")
+    else:
+        # 선택한 모든 유형의 상위 나라와 평균을 한 번에 가져옵니다. (유형 수와 무관하게 정렬 없음)
+        top = index.top_k_many(compare_types, COMPARE_TOP_K)
+        leaders = top[top["Rank"] == 1]
+
+        st.markdown(f"### 🏆 유형별 Top {COMPARE_TOP_K} 국가")
+        fig_compare = px.bar(
+            top.assign(Rank=top["Rank"].astype(str) + "위"),
+            x="Type",
+            y="Ratio",
+            color="Rank",
+            text="Country",
+            barmode="group",
+            color_discrete_sequence=px.colors.sequential.Plasma_r,
+        )
+        fig_compare.add_trace(go.Scatter(
+            x=leaders["Type"],
+            y=leaders["Mean"],
+            mode="markers",
+            marker=dict(symbol="line-ew-open", size=40, color="white", line=dict(width=3)),
+            name="전 세계 평균",
+        ))
+        fig_compare.update_layout(
+            paper_bgcolor="rgba(0,0,0,0)",
+            plot_bgcolor="rgba(0,0,0,0)",
+            font=dict(color="white"),
+            xaxis_title="",
+            yaxis_title="비율",
+            yaxis_tickformat=".0%",
+            legend_title_text="",
+        )
+        fig_compare.update_traces(textposition="inside", selector=dict(type="bar"))
+        with metrics.timed("bar_chart"):
+            st.plotly_chart(fig_compare, use_container_width=True)
+
+        # 순위별로 나란히 보는 표 (행: 순위, 열: 유형)
+        st.dataframe(top.pivot(index="Rank", columns="Type", values="Country")[compare_types], use_container_width=True)
+
+        if compare_sum:
+            label = " + ".join(compare_types)
+            combined_top = index.combined_top_k(compare_types, COMPARE_TOP_K)
+            combined_avg = float(sum(index.mean(t) for t in compare_types))
+            st.markdown(f"### ➕ 합계: {label}")
+            m1, m2 = st.columns(2)
+            with m1:
+                st.metric(label="전 세계 평균 비율 (합계)", value=f"{combined_avg:.2%}")
+            with m2:
+                best = combined_top.iloc[0]
+                st.metric(
+                    label="합계 비율이 가장 높은 나라",
+                    value=best["Country"],
+                    delta=f"{best['Ratio']:.2%} (+{best['Ratio'] - combined_avg:.2%}p)",
+                )
+            fig_sum = px.bar(combined_top, x="Country", y="Ratio", color="Ratio", color_continuous_scale="Viridis", text_auto=".2%")
+            fig_sum.update_layout(
+                paper_bgcolor="rgba(0,0,0,0)",
+                plot_bgcolor="rgba(0,0,0,0)",
+                font=dict(color="white"),
+                xaxis_title="",
+                yaxis_title="비율",
+                showlegend=False,
+            )
+            with metrics.timed("bar_chart"):
+                st.plotly_chart(fig_sum, use_container_width=True)
+
+    st.markdown("---")
+    st.caption("Data Source: World MBTI Stats | Visualization by Streamlit")
+
+elif selected_mbti == "선택해주세요":
     # --- 초기 화면 (Landing Page) ---
     col1, col2 = st.columns([1, 1])
     
@@ -118,8 +286,7 @@ if selected_mbti == "선택해주세요":
         st.success("✨ 준비되셨나요? 바로 시작해보세요!")
     
     with col2:
-        if lottie_welcome:
-            st_lottie(lottie_welcome, height=400, key="welcome")
+        lottie_slots.append((st.empty(), lottie_welcome, 400, "welcome"))
 
 else:
     # --- 분석 결과 화면 ---
@@ -134,22 +301,22 @@ else:
         st.subheader(f"**{info['name']}**")
         st.write(f"> *{info['desc']}*")
     with col_h2:
-        if lottie_analysis:
-            st_lottie(lottie_analysis, height=150, key="analysis")
+        lottie_slots.append((st.empty(), lottie_analysis, 150, "analysis"))
 
     st.markdown("---")
 
     # 2. 데이터 분석
-    # 해당 MBTI 컬럼 데이터 추출 및 정렬
+    figures = get_figure_cache(index, index.checksum)
+    # 해당 MBTI 컬럼 (정렬은 인덱스 생성 시 미리 해 두었습니다)
     target_col = selected_mbti
     
     # 상위 5개 국가 추출
-    top_countries = df[['Country', target_col]].sort_values(by=target_col, ascending=False).head(5)
+    top_countries = index.top_k(target_col, 5)
     top_country_name = top_countries.iloc[0]['Country']
     top_country_val = top_countries.iloc[0][target_col]
     
-    # 평균 계산
-    global_avg = df[target_col].mean()
+    # 평균 (인덱스에 미리 계산된 값)
+    global_avg = index.mean(target_col)
 
     # 3. 핵심 지표 (Metrics)
     m1, m2, m3 = st.columns(3)
@@ -163,46 +330,19 @@ else:
     st.markdown("### 🗺️ Global Distribution Map")
     
     # 4. 지도 시각화 (Plotly Choropleth) - 삐까번쩍 포인트
-    fig_map = px.choropleth(
-        df,
-        locations="Country",
-        locationmode='country names',
-        color=target_col,
-        hover_name="Country",
-        color_continuous_scale=px.colors.sequential.Plasma, # 화려한 컬러 스케일
-        title=f"전 세계 {selected_mbti} 분포도",
-        projection="natural earth"
-    )
-    fig_map.update_layout(
-        paper_bgcolor="#0e1117", # 스트림릿 다크모드 배경색 일치
-        geo=dict(bgcolor="#0e1117"),
-        font=dict(color="white"),
-        margin={"r":0,"t":40,"l":0,"b":0}
-    )
-    st.plotly_chart(fig_map, use_container_width=True)
+    # 기본 지도에 유형별 색상만 바꿔 끼운 그림을 캐시에서 가져옵니다.
+    fig_map = figures.map_figure(target_col)
+    with metrics.timed("map_chart"):
+        st.plotly_chart(fig_map, use_container_width=True)
 
     # 5. 상위 국가 바 차트 & 맞춤형 멘트
     c1, c2 = st.columns([1, 1])
     
     with c1:
         st.markdown("### 🏆 Top 5 Countries")
-        fig_bar = px.bar(
-            top_countries, 
-            x='Country', 
-            y=target_col,
-            color=target_col,
-            color_continuous_scale='Viridis',
-            text_auto='.2%'
-        )
-        fig_bar.update_layout(
-            paper_bgcolor="rgba(0,0,0,0)",
-            plot_bgcolor="rgba(0,0,0,0)",
-            font=dict(color="white"),
-            xaxis_title="",
-            yaxis_title="비율",
-            showlegend=False
-        )
-        st.plotly_chart(fig_bar, use_container_width=True)
+        fig_bar = figures.bar_figure(target_col)
+        with metrics.timed("bar_chart"):
+            st.plotly_chart(fig_bar, use_container_width=True)
 
     with c2:
         st.markdown(f"### 💌 To. {selected_mbti}")
@@ -222,3 +362,9 @@ else:
     # Footer
     st.markdown("---")
     st.caption("Data Source: World MBTI Stats | Visualization by Streamlit")
+
+# --- 6. 애니메이션 채우기 (나머지 화면을 다 그린 뒤) ---
+for slot, future, height, key in lottie_slots:
+    render_lottie(slot, future, height, key)
+
+metrics.rerun_finished("03-finally", rerun_started)
@@ -0,0 +1,145 @@
+import streamlit as st
+import pandas as pd
+import plotly.express as px
+import metrics
+import mbti_data
+from similarity import METRIC_LABELS
+
+# --- 1. 페이지 설정 ---
+st.set_page_config(
+    page_title="나라별 MBTI 프로필",
+    page_icon="🧭",
+    layout="wide",
+    initial_sidebar_state="expanded"
+)
+# rerun 전체 시간 측정 시작 (스크립트 맨 끝에서 기록)
+rerun_started = metrics.rerun_started()
+
+# --- 2. 데이터 로드 ---
+# 정렬/순위 인덱스와 유사도 인덱스는 mbti_data 모듈에서 한 번만 만들어 모든 페이지가 공유합니다.
+@metrics.timed("load_data")
+def load_data():
+    return mbti_data.load_index()
+
+index = load_data()
+
+# 보여줄 이웃 수 범위
+NEIGHBOURS_DEFAULT = 5
+NEIGHBOURS_MAX = 20
+
+CHART_LAYOUT = dict(
+    paper_bgcolor="rgba(0,0,0,0)",
+    plot_bgcolor="rgba(0,0,0,0)",
+    xaxis_title="",
+    legend_title_text="",
+)
+# 나라별 그림 캐시 크기 (가장 많이 보는 화면이라 그림을 매번 새로 만들지 않습니다)
+FIGURE_CACHE_ENTRIES = 512
+
+@metrics.cached(st.cache_resource, max_entries=FIGURE_CACHE_ENTRIES)
+def profile_figure(_index, checksum: str, country: str):
+    """전 세계 평균 대비 표준점수 막대 그림."""
+    fig = px.bar(
+        _index.profile(country).sort_values("ZScore", ascending=False),
+        x="Type",
+        y="ZScore",
+        color="ZScore",
+        color_continuous_scale="RdBu",
+        color_continuous_midpoint=0,
+    )
+    fig.update_layout(**CHART_LAYOUT, yaxis_title="표준점수 (z)", coloraxis_showscale=False)
+    return fig
+
+@metrics.cached(st.cache_resource, max_entries=FIGURE_CACHE_ENTRIES)
+def comparison_figure(_index, checksum: str, country: str, other: str):
+    """두 나라의 16개 유형 비율 비교 막대 그림."""
+    comparison = pd.DataFrame({
+        "Type": _index.types,
+        country: _index.type_values[_index.row(country)],
+        other: _index.type_values[_index.row(other)],
+    }).melt(id_vars="Type", var_name="Country", value_name="Ratio")
+    fig = px.bar(comparison, x="Type", y="Ratio", color="Country", barmode="group")
+    fig.update_layout(**CHART_LAYOUT, yaxis_tickformat=".0%", yaxis_title="비율")
+    return fig
+
+# --- 3. 사이드바 UI ---
+with st.sidebar:
+    st.title("Country Explorer")
+    st.markdown("---")
+    country = st.selectbox("나라를 선택하세요:", sorted(index.countries))
+    st.markdown("---")
+    st.subheader("🧭 닮은 나라 찾기")
+    metric = st.radio(
+        "거리 계산 방식",
+        list(METRIC_LABELS),
+        format_func=METRIC_LABELS.get,
+        help="16개 유형 비율을 하나의 분포 벡터로 보고 나라 사이의 거리를 잽니다.",
+    )
+    k = st.slider("비슷한 나라 수", 1, NEIGHBOURS_MAX, NEIGHBOURS_DEFAULT)
+    st.caption("거리가 작을수록 MBTI 분포가 비슷한 나라입니다.")
+
+metrics.debug_sidebar()  # ?debug=1일 때만 표시
+
+# --- 4. 메인 로직 ---
+st.title(f"🧭 {country}")
+
+tab_profile, tab_similar = st.tabs(["📇 유형별 프로필", "🤝 닮은 나라"])
+
+with tab_profile:
+    # 순위/백분위/표준점수는 데이터 로드 시 한 번 계산해 둔 행렬에서 이 나라의 행만 읽습니다.
+    profile = index.profile(country)
+    n = len(index.countries)
+    best = profile.loc[profile["Rank"].idxmin()]
+    most = profile.loc[profile["Ratio"].idxmax()]
+
+    m1, m2, m3 = st.columns(3)
+    with m1:
+        st.metric(label="가장 흔한 유형", value=most["Type"], delta=f"{most['Ratio']:.2%}", delta_color="off")
+    with m2:
+        st.metric(label="세계 순위가 가장 높은 유형", value=best["Type"], delta=f"{int(best['Rank'])}위 / {n}개국", delta_color="off")
+    with m3:
+        st.metric(label="평균보다 높은 유형 수", value=f"{int((profile['Deviation'] > 0).sum())} / {len(profile)}")
+
+    st.markdown("### 📈 전 세계 평균 대비 (표준점수)")
+    with metrics.timed("bar_chart"):
+        st.plotly_chart(profile_figure(index, index.checksum, country), use_container_width=True)
+
+    st.dataframe(
+        profile.sort_values("Rank"),
+        hide_index=True,
+        use_container_width=True,
+        column_config={
+            "Type": "유형",
+            "Ratio": st.column_config.NumberColumn("비율", format="percent"),
+            "Rank": st.column_config.NumberColumn("세계 순위"),
+            "Percentile": st.column_config.ProgressColumn("백분위", format="%.0f", min_value=0, max_value=100),
+            "Deviation": st.column_config.NumberColumn("평균 대비", format="percent"),
+            "ZScore": st.column_config.NumberColumn("표준점수", format="%.2f"),
+        },
+    )
+
+with tab_similar:
+    st.write(f"> 16개 유형 분포 전체를 비교했습니다. ({METRIC_LABELS[metric]})")
+    neighbours = index.similar(country, k, metric)
+
+    c1, c2 = st.columns([1, 1])
+    with c1:
+        st.markdown(f"### 🤝 가장 비슷한 {k}개 나라")
+        st.dataframe(
+            neighbours[["Country", "Distance"]],
+            hide_index=True,
+            use_container_width=True,
+            column_config={"Distance": st.column_config.NumberColumn("거리", format="%.4f")},
+        )
+
+    with c2:
+        # 기준 나라와 가장 비슷한 나라의 16개 유형 비율 비교
+        closest = neighbours.iloc[0]["Country"]
+        st.markdown(f"### 📊 {country} vs {closest}")
+        with metrics.timed("bar_chart"):
+            st.plotly_chart(comparison_figure(index, index.checksum, country, closest), use_container_width=True)
+
+st.markdown("---")
+st.caption("Data Source: World MBTI Stats | Visualization by Streamlit")
+
+metrics.rerun_finished("04-country", rerun_started)
@@ -0,0 +1,123 @@
+import threading
+from collections import namedtuple
+
+import streamlit as st
+
+import metrics
+import mbti_types
+
+# 유형별 결과 화면 캐시 (mbti.py, pages/02-second.py)
+# 결과 화면(설명 카드, 1위 국가 통계/여행 추천 메시지, 상위 5개 막대 차트 데이터, 전체 표)은
+# 선택한 유형과 데이터 버전(체크섬)에만 달려 있으므로, 완성된 HTML 조각과 차트 데이터를
+# (유형, 체크섬)별로 한 번만 만들어 두고 모든 세션이 같이 씁니다.
+# 캐시가 처음 만들어질 때 백그라운드 스레드에서 전체 유형을 미리 만들어 두므로
+# 첫 사용자가 유형을 고를 때도 기다리지 않습니다.
+TOP_K = 5
+WARM_UP = True
+# 데이터 파일이 바뀌면(mbti_data.IndexStore) 새 체크섬으로 캐시가 새로 만들어지므로, 이전 데이터의 캐시는 이 개수만 남깁니다.
+CACHE_VERSIONS = 2
+
+# card_html / stats_html: st.markdown에 그대로 넘길 HTML
+# top: 상위 k개 나라 (Country, 유형, Percentage), chart: 막대 차트용 Percentage 시리즈 (Country 인덱스)
+# table: 전체 나라 표 (Country, 유형)
+ResultView = namedtuple("ResultView", ["card_html", "stats_html", "top", "chart", "table"])
+
+
+def card_html(mbti: str, description: str) -> str:
+    return f"""
+                <div class="ui centered card fluid">
+                    <div class="content">
+                        <div class="header" style="font-size: 1.5em;">{mbti}</div>
+                        <div class="meta">Type Description</div>
+                        <div class="description">
+                            <p style="font-size: 1.2em;">{description}</p>
+                        </div>
+                    </div>
+                </div>
+            """
+
+
+def stats_html(mbti: str, country: str, percentage: float) -> str:
+    return f"""
+                    <div class="ui segment">
+                        <h4 class="ui header">🏆 1위 국가 정보</h4>
+                        <div class="ui center aligned huge statistic">
+                            <div class="value">
+                                {country}
+                            </div>
+                            <div class="label">
+                                전체 인구의 {percentage:.2f}%
+                            </div>
+                        </div>
+                    </div>
+
+                    <div class="ui positive icon message">
+                        <i class="plane departure icon"></i>
+                        <div class="content">
+                            <div class="header">
+                                여행 추천
+                            </div>
+                            <p><b>{mbti}</b> 성향이 가장 많은 나라는 <b>{country}</b>입니다.<br>
+                            비슷한 친구들을 만나러 떠나보세요!</p>
+                        </div>
+                    </div>
+                """
+
+
+class ResultViewCache:
+    """RankingIndex 하나에 대한 유형별 결과 화면 캐시입니다."""
+
+    def __init__(self, index, top_k: int = TOP_K, descriptions: dict = None):
+        self.index = index
+        self.top_k = top_k
+        self.descriptions = descriptions if descriptions is not None else mbti_types.descriptions()
+        self._views = {}
+        self._lock = threading.Lock()
+
+    def view(self, mbti: str) -> ResultView:
+        """유형별 결과 화면. 처음 한 번만 만들고 이후에는 보관한 값을 돌려줍니다."""
+        view = self._views.get(mbti)
+        if view is not None:
+            return view
+        with self._lock:
+            if mbti in self._views:
+                return self._views[mbti]
+            with metrics.timed("result_view"):
+                top = self.index.top_k(mbti, self.top_k)
+                best = top.iloc[0]
+                view = ResultView(
+                    card_html=card_html(mbti, self.descriptions[mbti]),
+                    stats_html=stats_html(mbti, best["Country"], best["Percentage"]),
+                    top=top,
+                    chart=top.set_index("Country")["Percentage"],
+                    table=self.index.table(mbti)[["Country", mbti]],
+                )
+            self._views[mbti] = view
+            return view
+
+    def warm_up(self, background: bool = True):
+        """선택지에 있는 모든 유형의 결과 화면을 미리 만들어 둡니다. background=True면 별도 스레드에서 실행합니다."""
+        def run():
+            for mbti in self.descriptions:
+                if mbti in self.index.columns:
+                    self.view(mbti)
+
+        if not background:
+            run()
+            return None
+        thread = threading.Thread(target=run, name="result-view-warm-up", daemon=True)
+        thread.start()
+        return thread
+
+
+@metrics.cached(st.cache_resource, max_entries=CACHE_VERSIONS)
+def get_cache(_index, checksum: str) -> ResultViewCache:
+    views = ResultViewCache(_index)
+    if WARM_UP:
+        views.warm_up()
+    return views
+
+
+def load(index) -> ResultViewCache:
+    """현재 인덱스의 결과 화면 캐시. 페이지가 데이터를 읽자마자 불러 두면 그때부터 미리 만들기 시작합니다."""
+    return get_cache(index, index.checksum)
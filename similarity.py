@@ -0,0 +1,130 @@
+import threading
+
+import numpy as np
+
+# 나라 간 유사도 검색 (16개 유형 분포 벡터의 최근접 이웃)
+# 나라 하나는 16차원 분포 벡터입니다. 거리 계산은 모두 NumPy 행렬 연산이며
+# 행(나라) 단위 파이썬 반복문이 없습니다. 행 묶음(block) 단위로만 나눠 계산해
+# 지역 단위 데이터(수만 행)에서도 메모리가 n x n으로 커지지 않게 합니다.
+# - 행 수가 PRECOMPUTE_LIMIT 이하면 처음 쓸 때 나라별 상위 NEIGHBOUR_K개 이웃 표를 미리 만들어
+#   질의는 표의 슬라이스(마이크로초)로 끝납니다.
+# - 그보다 크면 질의마다 한 행 대 전체 거리를 벡터 연산으로 구하고 argpartition으로 고릅니다.
+METRICS = ("euclidean", "cosine", "jensenshannon")
+METRIC_LABELS = {
+    "euclidean": "유클리드 거리",
+    "cosine": "코사인 거리",
+    "jensenshannon": "젠슨-섀넌 거리",
+}
+NEIGHBOUR_K = 32
+PRECOMPUTE_LIMIT = 5000
+BLOCK_ELEMENTS = 1 << 22  # 블록 하나에서 만드는 중간 배열 원소 수 상한 (약 32MB, float64)
+
+
+def _entropy_terms(p: np.ndarray) -> np.ndarray:
+    """p * log2(p) (p == 0이면 0)."""
+    with np.errstate(divide="ignore", invalid="ignore"):
+        return np.where(p > 0, p * np.log2(p), 0.0)
+
+
+class SimilarityIndex:
+    """(rows x dims) 행렬 하나에 대한 거리 계산과 k-최근접 이웃 질의.
+
+    metric: "euclidean", "cosine", "jensenshannon"
+    젠슨-섀넌은 행을 합이 1인 분포로 정규화한 뒤 밑이 2인 JS 발산의 제곱근(0~1)을 씁니다.
+    """
+
+    def __init__(self, values, metric: str = "euclidean", neighbour_k: int = NEIGHBOUR_K,
+                 precompute_limit: int = PRECOMPUTE_LIMIT):
+        if metric not in METRICS:
+            raise ValueError(f"지원하지 않는 거리입니다: {metric} (가능: {', '.join(METRICS)})")
+        self.metric = metric
+        x = np.asarray(values, dtype=np.float64)
+        self.rows = x.shape[0]
+        self.neighbour_k = min(neighbour_k, max(0, self.rows - 1))
+        self.precompute_limit = precompute_limit
+
+        # 거리별로 필요한 전처리를 한 번만 해 둡니다.
+        if metric == "euclidean":
+            self._x = x
+            self._sq = np.einsum("ij,ij->i", x, x)
+        elif metric == "cosine":
+            norms = np.linalg.norm(x, axis=1, keepdims=True)
+            self._x = x / np.where(norms > 0, norms, 1)
+        else:
+            p = np.clip(x, 0, None)
+            sums = p.sum(axis=1, keepdims=True)
+            self._x = p / np.where(sums > 0, sums, 1)
+            self._h = _entropy_terms(self._x).sum(axis=1)  # -엔트로피
+
+        self._nn_index = None
+        self._nn_distance = None
+        self._lock = threading.Lock()
+
+    # --- 거리 계산 ---
+    def block_distances(self, start: int, stop: int) -> np.ndarray:
+        """행 start:stop 대 전체 행의 거리 행렬 (stop-start x rows)."""
+        xb = self._x[start:stop]
+        if self.metric == "euclidean":
+            d2 = self._sq[start:stop, None] + self._sq[None, :] - 2 * (xb @ self._x.T)
+            return np.sqrt(np.clip(d2, 0, None))
+        if self.metric == "cosine":
+            return np.clip(1 - xb @ self._x.T, 0, 2)
+        # JS(p, q) = H(m) - (H(p) + H(q)) / 2,  m = (p + q) / 2
+        m = 0.5 * (xb[:, None, :] + self._x[None, :, :])
+        js = 0.5 * (self._h[start:stop, None] + self._h[None, :]) - _entropy_terms(m).sum(axis=2)
+        return np.sqrt(np.clip(js, 0, 1))
+
+    def distances(self, i: int) -> np.ndarray:
+        """행 i에서 모든 행까지의 거리."""
+        return self.block_distances(i, i + 1)[0]
+
+    def _block_size(self) -> int:
+        per_row = self.rows * (self._x.shape[1] if self.metric == "jensenshannon" else 1)
+        return max(1, BLOCK_ELEMENTS // max(1, per_row))
+
+    def pairwise(self) -> np.ndarray:
+        """전체 거리 행렬 (rows x rows). 작은 데이터에서만 쓰세요."""
+        step = self._block_size()
+        return np.vstack([self.block_distances(s, min(s + step, self.rows)) for s in range(0, self.rows, step)])
+
+    # --- 이웃 표 ---
+    def _top_k(self, d: np.ndarray, k: int):
+        """거리 행렬 d(b x rows)의 행마다 가까운 k개의 (번호, 거리)를 가까운 순으로 돌려줍니다."""
+        part = np.argpartition(d, k - 1, axis=1)[:, :k]
+        part_d = np.take_along_axis(d, part, axis=1)
+        order = np.argsort(part_d, axis=1, kind="stable")
+        return np.take_along_axis(part, order, axis=1), np.take_along_axis(part_d, order, axis=1)
+
+    def _build_table(self):
+        k = self.neighbour_k
+        index = np.empty((self.rows, k), dtype=np.int32)
+        distance = np.empty((self.rows, k), dtype=np.float32)
+        step = self._block_size()
+        for start in range(0, self.rows, step):
+            stop = min(start + step, self.rows)
+            d = self.block_distances(start, stop)
+            d[np.arange(stop - start), np.arange(start, stop)] = np.inf  # 자기 자신 제외
+            index[start:stop], distance[start:stop] = self._top_k(d, k)
+        self._nn_index, self._nn_distance = index, distance
+
+    def precomputed(self) -> bool:
+        """이웃 표를 (필요하면 지금 만들어) 쓸 수 있으면 True."""
+        if self._nn_index is None:
+            if self.rows > self.precompute_limit or self.neighbour_k == 0:
+                return False
+            with self._lock:
+                if self._nn_index is None:
+                    self._build_table()
+        return True
+
+    def neighbours(self, i: int, k: int = 5):
+        """행 i와 가장 가까운 k개 행의 (번호 배열, 거리 배열). 자기 자신은 빠집니다."""
+        k = min(k, self.rows - 1)
+        if k <= 0:
+            return np.empty(0, dtype=np.int32), np.empty(0, dtype=np.float32)
+        if k <= self.neighbour_k and self.precomputed():
+            return self._nn_index[i, :k], self._nn_distance[i, :k]
+        d = self.distances(i)
+        d[i] = np.inf
+        index, distance = self._top_k(d[None, :], k)
+        return index[0], distance[0]
@@ -0,0 +1,405 @@
+"""유형별 결과 화면 정적 내보내기 (빌드 단계)
+
+익명 사용자가 보는 유형별 결과 화면(pages/03-finally.py의 지표, 세계 지도, 상위 5개 막대 그림과
+mbti.py의 설명 카드, 1위 국가 통계, 전체 표)을 정적 HTML로 만들어 파일 서버나 CDN에 올릴 수 있게 합니다.
+Streamlit 서버는 직접 조작하는 사용자만 받게 됩니다.
+
+    export/
+        index.html              유형 목록 (미리보기 이미지가 있으면 함께)
+        INTJ/index.html         유형별 화면 (그림 JSON을 페이지에 넣고 plotly.js로 그림)
+        INTJ/preview.png        상위 5개 막대 그림 미리보기 (kaleido가 있을 때만, og:image)
+        assets/                 plotly.min.js, 빌드된 Semantic UI 스타일시트(css_assets.py), 지도 geometry(geo_assets.py)
+        manifest.json           유형별 입력 키와 만든 파일 목록
+
+- 유형마다 프로세스 풀의 작업 하나로 만듭니다. 워커는 처음 한 번 인덱스(바이너리 데이터셋이면 memmap)와
+  그림 캐시(figure_cache.FigureCache), 결과 화면 캐시(result_views.ResultViewCache)를 만들어 둡니다.
+- 입력 키는 데이터 체크섬, 유형, 에셋 경로, 화면을 만드는 코드(CODE_FILES)의 체크섬으로 만듭니다.
+  manifest.json의 키가 같고 파일이 남아 있는 유형은 다시 만들지 않습니다. (--force로 전부 다시)
+- 내용이 같은 파일은 다시 쓰지 않으므로 수정 시각이 그대로 남아 파일 서버의 ETag/Last-Modified도 바뀌지 않습니다.
+
+사용법 (저장소 루트에서):
+    python static_export.py                     # export/에 16개 유형 내보내기 (바뀐 유형만)
+    python static_export.py --types INTJ ENFP --workers 2
+    python static_export.py --types all         # 성향 축/기질 그룹(E, NT 등)까지
+    python static_export.py --out site --force --no-png
+"""
+import argparse
+import hashlib
+import html
+import importlib.util
+import json
+import logging
+import os
+import shutil
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+import css_assets
+import geo_assets
+import mbti_data
+import mbti_types
+
+OUT_DIR = "export"
+ASSETS_DIR = "assets"
+MANIFEST = "manifest.json"
+TOP_K = 5
+# 지도 geometry 단순화 단계 (pages/03-finally.py와 같게). static/geo에 파일이 없으면 Plotly 기본 지도 사용
+MAP_GEOMETRY_LEVEL = "medium"
+PREVIEW_SIZE = (1200, 630)  # og:image 권장 크기
+PREVIEW_BACKGROUND = "#0e1117"
+# 이 파일들이 바뀌면 화면 모양이 바뀔 수 있으므로 입력 키에 넣습니다.
+CODE_FILES = ("static_export.py", "figure_cache.py", "result_views.py", "mbti_types.py", "dichotomy.py")
+PLOTLY_JS = "plotly.min.js"
+
+PAGE_CSS = """
+body { background: #0e1117; color: #fafafa; padding: 2em 0; }
+.ui.container > .ui.header, .ui.statistics .statistic > .value, .ui.statistics .statistic > .label { color: #fafafa; }
+.chart { min-height: 420px; }
+"""
+
+logger = logging.getLogger(__name__)
+
+
+# --- 파일 쓰기 ---
+def _write_if_changed(path: str, data: bytes) -> bool:
+    """내용이 다를 때만 원자적으로 씁니다. 썼으면 True."""
+    try:
+        with open(path, "rb") as f:
+            if f.read() == data:
+                return False
+    except OSError:
+        pass
+    os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+    tmp_path = f"{path}.{os.getpid()}.tmp"
+    with open(tmp_path, "wb") as f:
+        f.write(data)
+    os.replace(tmp_path, path)
+    return True
+
+
+def _copy_if_changed(src: str, dst: str) -> bool:
+    if os.path.exists(dst) and os.path.getsize(dst) == os.path.getsize(src) and os.path.getmtime(dst) >= os.path.getmtime(src):
+        return False
+    os.makedirs(os.path.dirname(dst), exist_ok=True)
+    tmp_path = f"{dst}.{os.getpid()}.tmp"
+    shutil.copy2(src, tmp_path)
+    os.replace(tmp_path, dst)
+    return True
+
+
+# --- 에셋 ---
+def prepare_assets(out_dir: str) -> dict:
+    """plotly.js, 스타일시트, 지도 geometry를 out_dir/assets로 복사하고 유형 페이지 기준 상대 경로를 돌려줍니다."""
+    import plotly
+
+    assets = os.path.join(out_dir, ASSETS_DIR)
+    prefix = f"../{ASSETS_DIR}"
+    _copy_if_changed(os.path.join(os.path.dirname(plotly.__file__), "package_data", PLOTLY_JS),
+                     os.path.join(assets, PLOTLY_JS))
+    urls = {"plotly": f"{prefix}/{PLOTLY_JS}", "stylesheet": css_assets.SEMANTIC_URL, "geometry": None}
+
+    # 빌드된 스타일시트가 있으면 폰트와 함께 복사하고, 없으면 CDN의 전체 스타일시트를 씁니다.
+    stylesheet = css_assets.stylesheet_url(url_prefix=css_assets.CSS_DIR)
+    if stylesheet:
+        name = os.path.basename(stylesheet)
+        _copy_if_changed(stylesheet, os.path.join(assets, "css", name))
+        fonts = os.path.join(css_assets.CSS_DIR, "fonts")
+        if os.path.isdir(fonts):
+            for font in os.listdir(fonts):
+                _copy_if_changed(os.path.join(fonts, font), os.path.join(assets, "css", "fonts", font))
+        urls["stylesheet"] = f"{prefix}/css/{name}"
+
+    if geo_assets.geometry_url(MAP_GEOMETRY_LEVEL):
+        name = f"world_{MAP_GEOMETRY_LEVEL}.geojson"
+        _copy_if_changed(os.path.join(geo_assets.GEO_DIR, name), os.path.join(assets, "geo", name))
+        urls["geometry"] = f"{prefix}/geo/{name}"
+    return urls
+
+
+def code_digest(paths=CODE_FILES) -> str:
+    digest = hashlib.sha256()
+    for path in paths:
+        with open(path, "rb") as f:
+            digest.update(f.read())
+    return digest.hexdigest()
+
+
+def page_key(checksum: str, mbti: str, assets: dict, code: str, preview: bool) -> str:
+    """유형 페이지의 입력 키. 이 값이 같으면 같은 파일이 나옵니다."""
+    payload = json.dumps([checksum, mbti, assets, code, preview, TOP_K], sort_keys=True)
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+def preview_supported() -> bool:
+    """PNG 미리보기에는 kaleido가 필요합니다. (없으면 건너뜀)"""
+    return importlib.util.find_spec("kaleido") is not None
+
+
+# --- 화면 ---
+def _script_json(text: str) -> str:
+    """<script> 안에 그대로 넣을 수 있도록 </script>가 생기지 않게 합니다."""
+    return text.replace("</", "<\\/")
+
+
+def render_table(index, mbti: str) -> str:
+    """전체 나라 표 (mbti.py의 "전체 통계 데이터"와 같은 순서)."""
+    j = index.column(mbti)
+    rows = []
+    for rank, i in enumerate(index.order[:, j], start=1):
+        rows.append(
+            f"<tr><td>{rank}</td><td>{html.escape(str(index.countries[i]))}</td>"
+            f"<td class='right aligned'>{index.values[i, j] * 100:.2f}%</td></tr>"
+        )
+    return (
+        '<table class="ui celled striped compact unstackable table">'
+        f"<thead><tr><th>순위</th><th>Country</th><th class='right aligned'>{mbti}</th></tr></thead>"
+        f"<tbody>{''.join(rows)}</tbody></table>"
+    )
+
+
+def render_page(mbti: str, index, figures, views, assets: dict, preview: bool) -> str:
+    """유형 하나의 정적 HTML."""
+    info = mbti_types.cards()[mbti]
+    view = views.view(mbti)
+    map_json = figures.map_figure(mbti).to_json()
+    bar_json = figures.bar_figure(mbti).to_json()
+    best = view.top.iloc[0]
+    top_val = float(best[mbti])
+    global_avg = index.mean(mbti)
+    title = f"{info['icon']} {mbti} - {info['name']}"
+    preview_meta = '<meta property="og:image" content="preview.png">' if preview else ""
+    return f"""<!DOCTYPE html>
+<html lang="ko">
+<head>
+<meta charset="utf-8">
+<meta name="viewport" content="width=device-width, initial-scale=1">
+<title>{html.escape(title)} | Global MBTI Explorer</title>
+<meta property="og:title" content="{html.escape(title)}">
+<meta property="og:description" content="{html.escape(info['desc'])}">
+{preview_meta}
+<link rel="stylesheet" href="{assets['stylesheet']}">
+<style>{PAGE_CSS}</style>
+<script src="{assets['plotly']}"></script>
+</head>
+<body>
+<div class="ui container">
+    <a href="../index.html">← 전체 유형</a>
+    <h1 class="ui header">{info['icon']} {mbti}<div class="sub header">{html.escape(info['name'])}</div></h1>
+    {view.card_html}
+    <div class="ui three statistics">
+        <div class="statistic"><div class="value">{global_avg:.2%}</div><div class="label">전 세계 평균 비율</div></div>
+        <div class="statistic"><div class="value">{html.escape(str(best['Country']))}</div><div class="label">가장 인기 있는 나라</div></div>
+        <div class="statistic"><div class="value">{top_val:.2%}</div><div class="label">최고 비율 (+{top_val - global_avg:.2%} 평균 대비)</div></div>
+    </div>
+    <h3 class="ui horizontal divider header"><i class="globe icon"></i> Global Distribution Map</h3>
+    <div id="map" class="chart"></div>
+    <h3 class="ui horizontal divider header"><i class="chart bar icon"></i> Top {TOP_K} Countries</h3>
+    <div class="ui two column stackable grid">
+        <div class="column"><div id="bar" class="chart"></div></div>
+        <div class="column">{view.stats_html}</div>
+    </div>
+    <h3 class="ui horizontal divider header"><i class="table icon"></i> 전체 통계 데이터</h3>
+    {render_table(index, mbti)}
+    <p>Data Source: World MBTI Stats (checksum {index.checksum[:12]})</p>
+</div>
+<script>
+const figures = {{"map": {_script_json(map_json)}, "bar": {_script_json(bar_json)}}};
+for (const [id, fig] of Object.entries(figures)) {{
+    Plotly.newPlot(id, fig.data, fig.layout, {{responsive: true}});
+}}
+</script>
+</body>
+</html>
+"""
+
+
+def render_index(index, entries: dict, assets: dict) -> str:
+    """유형 목록 페이지. 미리보기가 있는 유형은 이미지를 함께 보여줍니다."""
+    cards = mbti_types.cards()
+    items = []
+    for mbti in entries:
+        info = cards[mbti]
+        image = (f'<div class="image"><img src="{mbti}/preview.png" alt="{mbti}" loading="lazy"></div>'
+                 if entries[mbti].get("preview") else "")
+        items.append(
+            f'<a class="ui card" href="{mbti}/index.html">{image}<div class="content">'
+            f'<div class="header">{info["icon"]} {mbti}</div>'
+            f'<div class="meta">{html.escape(info["name"])}</div>'
+            f'<div class="description">{html.escape(info["desc"])}</div></div></a>'
+        )
+    stylesheet = assets["stylesheet"].removeprefix("../")
+    return f"""<!DOCTYPE html>
+<html lang="ko">
+<head>
+<meta charset="utf-8">
+<meta name="viewport" content="width=device-width, initial-scale=1">
+<title>Global MBTI Explorer</title>
+<link rel="stylesheet" href="{stylesheet}">
+<style>{PAGE_CSS}</style>
+</head>
+<body>
+<div class="ui container">
+    <h1 class="ui header">🌍 Global MBTI Explorer<div class="sub header">유형별 나라 분포 ({len(index.countries)}개 나라)</div></h1>
+    <div class="ui four stackable cards">{''.join(items)}</div>
+</div>
+</body>
+</html>
+"""
+
+
+# --- 워커 ---
+_worker = {}
+
+
+def _init_worker(data_path: str, bin_path: str, geometry: str):
+    """워커마다 한 번: 인덱스와 그림/결과 화면 캐시를 만듭니다."""
+    from figure_cache import FigureCache
+    from result_views import ResultViewCache
+
+    index = mbti_data.build_index(data_path, bin_path)
+    _worker["index"] = index
+    _worker["figures"] = FigureCache(index, top_k=TOP_K, geometry_url=geometry)
+    _worker["views"] = ResultViewCache(index, top_k=TOP_K)
+
+
+def _write_preview(figures, mbti: str, path: str) -> bool:
+    """상위 k개 막대 그림을 PNG로 저장합니다. kaleido(또는 브라우저)가 없어 실패하면 False."""
+    import plotly.graph_objects as go
+
+    fig = go.Figure(figures.bar_figure(mbti))
+    fig.update_layout(title_text=f"{mbti} Top {TOP_K}", paper_bgcolor=PREVIEW_BACKGROUND, plot_bgcolor=PREVIEW_BACKGROUND)
+    width, height = PREVIEW_SIZE
+    try:
+        data = fig.to_image(format="png", width=width, height=height)
+    except Exception as e:
+        logger.warning("%s 미리보기를 만들지 못했습니다: %s", mbti, e)
+        return False
+    _write_if_changed(path, data)
+    return True
+
+
+def export_type(mbti: str, out_dir: str, assets: dict, preview: bool) -> dict:
+    """(워커 안에서) 유형 하나를 내보내고 manifest 항목을 돌려줍니다."""
+    index, figures, views = _worker["index"], _worker["figures"], _worker["views"]
+    start = time.perf_counter()
+    page_dir = os.path.join(out_dir, mbti)
+    files = [f"{mbti}/index.html"]
+    written = _write_if_changed(
+        os.path.join(page_dir, "index.html"),
+        render_page(mbti, index, figures, views, assets, preview).encode("utf-8"),
+    )
+    made_preview = preview and _write_preview(figures, mbti, os.path.join(page_dir, "preview.png"))
+    if made_preview:
+        files.append(f"{mbti}/preview.png")
+    return {
+        "files": files,
+        "preview": bool(made_preview),
+        "written": written,
+        "seconds": round(time.perf_counter() - start, 3),
+    }
+
+
+# --- 내보내기 ---
+def load_manifest(out_dir: str) -> dict:
+    path = os.path.join(out_dir, MANIFEST)
+    if not os.path.exists(path):
+        return {"pages": {}}
+    with open(path, encoding="utf-8") as f:
+        return json.load(f)
+
+
+def _is_current(entry: dict, key: str, out_dir: str, preview: bool) -> bool:
+    if not entry or entry.get("key") != key:
+        return False
+    if preview and not entry.get("preview"):
+        return False  # 지난번에 미리보기를 못 만들었으면 다시 시도합니다.
+    return all(os.path.exists(os.path.join(out_dir, name)) for name in entry.get("files", []))
+
+
+def export(out_dir: str = OUT_DIR, types=None, workers: int = None, force: bool = False, preview: bool = True,
+           data_path: str = mbti_data.DATA_PATH, bin_path: str = mbti_data.BIN_PATH) -> dict:
+    """유형 페이지를 내보내고 {"exported": [...], "skipped": [...], "removed": [...]}를 돌려줍니다."""
+    index = mbti_data.build_index(data_path, bin_path)
+    types = list(types or mbti_types.TYPES)
+    unknown = [t for t in types if t not in index.columns]
+    if unknown:
+        raise ValueError(f"알 수 없는 유형: {', '.join(unknown)}")
+    preview = preview and preview_supported()
+    os.makedirs(out_dir, exist_ok=True)
+    assets = prepare_assets(out_dir)
+    code = code_digest()
+    manifest = load_manifest(out_dir)
+    pages = manifest.get("pages", {})
+
+    keys = {mbti: page_key(index.checksum, mbti, assets, code, preview) for mbti in types}
+    pending = [m for m in types if force or not _is_current(pages.get(m), keys[m], out_dir, preview)]
+    skipped = [m for m in types if m not in pending]
+
+    workers = min(workers or os.cpu_count() or 1, len(pending)) if pending else 0
+    results = {}
+    if workers == 1:
+        _init_worker(data_path, bin_path, assets["geometry"])
+        results = {m: export_type(m, out_dir, assets, preview) for m in pending}
+    elif workers > 1:
+        with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker,
+                                 initargs=(data_path, bin_path, assets["geometry"])) as pool:
+            futures = {m: pool.submit(export_type, m, out_dir, assets, preview) for m in pending}
+            results = {m: future.result() for m, future in futures.items()}
+
+    now = time.strftime("%Y-%m-%dT%H:%M:%S")
+    for mbti, result in results.items():
+        pages[mbti] = {"key": keys[mbti], "files": result["files"], "preview": result["preview"], "exported_at": now}
+
+    # 데이터에서 사라진 유형의 페이지는 지웁니다.
+    removed = [m for m in pages if m not in index.columns]
+    for mbti in removed:
+        shutil.rmtree(os.path.join(out_dir, mbti), ignore_errors=True)
+        del pages[mbti]
+
+    # 목록에는 이번 데이터/코드로 만든 페이지만 올립니다. (이번에 고르지 않아 이전 데이터로 남은 유형은 빼고)
+    listed = {
+        m: pages[m] for m in index.columns
+        if m in pages and pages[m]["key"] == page_key(index.checksum, m, assets, code, preview)
+    }
+    _write_if_changed(os.path.join(out_dir, "index.html"), render_index(index, listed, assets).encode("utf-8"))
+    manifest = {"checksum": index.checksum, "pages": pages}
+    _write_if_changed(os.path.join(out_dir, MANIFEST),
+                      json.dumps(manifest, indent=2, ensure_ascii=False).encode("utf-8"))
+    return {"exported": list(results), "skipped": skipped, "removed": removed, "results": results}
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--out", default=OUT_DIR, help="출력 폴더")
+    parser.add_argument("--types", nargs="+", help="내보낼 유형 (기본: 16개 유형, all이면 성향 축/기질 그룹 포함)")
+    parser.add_argument("--workers", type=int, default=None, help="프로세스 수 (기본: CPU 수)")
+    parser.add_argument("--force", action="store_true", help="바뀌지 않은 유형도 다시 만듭니다")
+    parser.add_argument("--no-png", action="store_true", help="PNG 미리보기를 만들지 않습니다")
+    parser.add_argument("--data", default=mbti_data.DATA_PATH, help="CSV 경로")
+    parser.add_argument("--bin", default=mbti_data.BIN_PATH, help="바이너리 데이터셋 경로")
+    args = parser.parse_args(argv)
+
+    logging.basicConfig(level=logging.INFO, format="%(levelname)s %(name)s: %(message)s")
+    types = args.types
+    if types == ["all"]:
+        types = mbti_data.build_index(args.data, args.bin).columns
+    if not args.no_png and not preview_supported():
+        print("kaleido가 없어 PNG 미리보기는 건너뜁니다. (pip install -r requirements-export.txt)")
+    start = time.perf_counter()
+    try:
+        summary = export(args.out, types, args.workers, args.force, not args.no_png, args.data, args.bin)
+    except ValueError as e:
+        print(e)
+        return 1
+    for mbti, result in summary["results"].items():
+        state = "갱신" if result["written"] else "변경 없음"
+        print(f"{mbti:<5} {state:<6} {result['seconds']:.2f}s  {', '.join(result['files'])}")
+    print(f"{len(summary['exported'])}개 내보냄, {len(summary['skipped'])}개는 바뀌지 않아 건너뜀"
+          + (f", {len(summary['removed'])}개 삭제" if summary["removed"] else "")
+          + f" ({time.perf_counter() - start:.1f}s) -> {args.out}/index.html")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
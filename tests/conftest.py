@@ -0,0 +1,48 @@
+import os
+import sys
+
+import numpy as np
+import pytest
+
+# 저장소 루트의 모듈(mbti_data.py 등)과 bench/stubs.py를 그대로 import합니다.
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if ROOT not in sys.path:
+    sys.path.insert(0, ROOT)
+
+# 동률을 일부러 넣은 작은 데이터셋 (행 합은 1)
+TYPES = ["INTJ", "INTP", "ENTJ", "ENFP"]
+COUNTRIES = ["Japan", "France", "Brazil", "Kenya", "Norway"]
+VALUES = [
+    [0.25, 0.25, 0.25, 0.25],
+    [0.40, 0.10, 0.25, 0.25],
+    [0.40, 0.20, 0.10, 0.30],
+    [0.10, 0.40, 0.40, 0.10],
+    [0.25, 0.30, 0.05, 0.40],
+]
+
+
+@pytest.fixture
+def small_index():
+    import mbti_data
+
+    return mbti_data.RankingIndex.from_values(COUNTRIES, TYPES, np.array(VALUES, dtype=np.float32))
+
+
+@pytest.fixture
+def dataset_csv(tmp_path):
+    """countriesMBTI_16types.csv와 같은 스키마의 작은 CSV 파일."""
+    import pandas as pd
+
+    path = tmp_path / "countries.csv"
+    frame = pd.DataFrame(VALUES, columns=TYPES)
+    frame.insert(0, "Country", COUNTRIES)
+    frame.to_csv(path, index=False)
+    return str(path)
+
+
+@pytest.fixture
+def stub():
+    from bench.stubs import StubServer
+
+    with StubServer(images=3) as server:
+        yield server
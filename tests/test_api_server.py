@@ -0,0 +1,150 @@
+import gzip
+import http.client
+import json
+import threading
+
+import numpy as np
+import pytest
+
+import api_server
+import mbti_data
+from conftest import COUNTRIES, TYPES, VALUES
+
+
+def body(response) -> dict:
+    return json.loads(response.body)
+
+
+@pytest.fixture
+def app(small_index):
+    return api_server.ApiApp(lambda: small_index)
+
+
+@pytest.fixture
+def server(small_index):
+    server = api_server.make_server(lambda: small_index, port=0, host="127.0.0.1")
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    yield server
+    server.shutdown()
+    server.server_close()
+
+
+def request(server, path: str, headers: dict = None):
+    conn = http.client.HTTPConnection("127.0.0.1", server.server_port, timeout=5)
+    conn.request("GET", path, headers=headers or {})
+    response = conn.getresponse()
+    data = response.read()
+    conn.close()
+    return response, data
+
+
+def test_meta(app, small_index):
+    payload = body(app.respond("/v1/meta"))
+    assert payload["checksum"] == small_index.checksum
+    assert payload["types"] == TYPES
+    assert payload["countries"] == len(COUNTRIES)
+
+
+def test_top_matches_index(app, small_index):
+    payload = body(app.respond("/v1/top?types=INTJ,ENFP&k=3"))
+    assert payload["k"] == 3
+    for mbti in ("INTJ", "ENFP"):
+        result = payload["results"][mbti]
+        assert [row["country"] for row in result["top"]] == small_index.top_k(mbti, 3)["Country"].tolist()
+        assert [row["rank"] for row in result["top"]] == [1, 2, 3]
+        assert result["mean"] == round(small_index.mean(mbti), api_server.RATIO_DIGITS)
+    assert payload["results"]["INTJ"]["top"][0]["ratio"] == 0.4
+
+
+def test_type_and_types_params_combine(app):
+    payload = body(app.respond("/v1/top?type=INTJ&type=NT&k=100"))
+    assert list(payload["results"]) == ["INTJ", "NT"]
+    assert payload["k"] == len(COUNTRIES)
+
+
+def test_mean_defaults_to_all_columns(app, small_index):
+    payload = body(app.respond("/v1/mean"))
+    assert list(payload["means"]) == small_index.columns
+
+
+def test_profile_by_name_or_code(app, small_index):
+    by_name = body(app.respond("/v1/profile?country=japan"))["profiles"]["Japan"]
+    by_code = body(app.respond("/v1/profile?country=JPN"))["profiles"]["Japan"]
+    assert by_name == by_code
+    expected = small_index.profile("Japan")
+    assert [t["type"] for t in by_name["types"]] == TYPES
+    assert [t["rank"] for t in by_name["types"]] == expected["Rank"].tolist()
+    np.testing.assert_allclose([t["zscore"] for t in by_name["types"]], expected["ZScore"])
+
+
+@pytest.mark.parametrize("target, status", [
+    ("/v1/top", 400),
+    ("/v1/top?types=XXXX", 400),
+    ("/v1/top?types=INTJ&k=0", 400),
+    ("/v1/top?types=INTJ&k=abc", 400),
+    ("/v1/profile?country=Narnia", 400),
+    ("/v1/nothing", 404),
+])
+def test_errors(app, target, status):
+    response = app.respond(target)
+    assert response.status == status
+    assert "error" in body(response)
+
+
+def test_responses_cached_per_checksum():
+    index = mbti_data.RankingIndex.from_values(COUNTRIES, TYPES, np.array(VALUES, dtype=np.float32))
+    current = {"index": index}
+    app = api_server.ApiApp(lambda: current["index"], cache_size=2)
+    first = app.respond("/v1/top?types=INTJ")
+    assert app.respond("/v1/top?types=INTJ") is first
+
+    # 데이터가 바뀌면 새 체크섬으로 다시 만듭니다.
+    changed = np.array(VALUES, dtype=np.float32)[::-1]
+    current["index"] = mbti_data.RankingIndex.from_values(COUNTRIES, TYPES, changed)
+    second = app.respond("/v1/top?types=INTJ")
+    assert second is not first
+    assert second.etag != first.etag
+    assert body(second)["results"]["INTJ"]["top"][0]["country"] == "Brazil"
+
+
+def test_http_etag_and_gzip(server, small_index):
+    path = "/v1/profile?country=Japan"
+    response, data = request(server, path)
+    assert response.status == 200
+    etag = response.getheader("ETag")
+    assert etag == f'"{small_index.checksum[:32]}"'
+    assert json.loads(data)["checksum"] == small_index.checksum
+
+    response, data = request(server, path, {"If-None-Match": etag})
+    assert response.status == 304 and data == b""
+
+    response, data = request(server, path, {"Accept-Encoding": "gzip"})
+    assert len(data) < len(json.dumps(json.loads(gzip.decompress(data))))
+    assert response.getheader("Content-Encoding") == "gzip"
+    assert response.getheader("ETag") == etag[:-1] + '-gz"'
+    assert json.loads(gzip.decompress(data))["checksum"] == small_index.checksum
+
+    # 작은 본문은 압축하지 않습니다.
+    response, _ = request(server, "/v1/meta", {"Accept-Encoding": "gzip"})
+    assert response.getheader("Content-Encoding") is None
+
+
+def test_http_health_and_errors(server):
+    response, data = request(server, "/healthz")
+    assert response.status == 200 and data == b"ok"
+    response, _ = request(server, "/v1/top?types=XXXX")
+    assert response.status == 400
+    assert response.getheader("ETag") is None
+
+
+def test_docstring_examples_resolve():
+    # 모듈 설명의 엔드포인트 예시는 실제 데이터셋에서 그대로 동작해야 합니다.
+    app = api_server.ApiApp(lambda: mbti_data.build_index())
+    examples = [line.split()[0] for line in api_server.__doc__.splitlines() if line.strip().startswith("/v1/")]
+    assert "/v1/profile?country=KOR&country=Japan" in examples
+    for target in examples:
+        response = app.respond(target)
+        assert response.status == 200, (target, body(response))
+    profiles = body(app.respond("/v1/profile?country=KOR&country=Japan"))["profiles"]
+    assert list(profiles) == ["South Korea", "Japan"]
+    assert body(app.respond("/v1/profile?country=South%20Korea"))["profiles"] == {"South Korea": profiles["South Korea"]}
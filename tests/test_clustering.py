@@ -0,0 +1,70 @@
+import os
+
+import numpy as np
+import pytest
+
+from clustering import ClusterStore, kmeans
+
+
+@pytest.fixture
+def blobs():
+    """중심이 뚜렷이 다른 세 묶음 (크기 12, 8, 5)."""
+    rng = np.random.default_rng(3)
+    centers = np.eye(3, 16)
+    sizes = (12, 8, 5)
+    x = np.vstack([c + rng.normal(0, 0.01, (n, 16)) for c, n in zip(centers, sizes)])
+    truth = np.repeat(np.arange(3), sizes)
+    return x, truth
+
+
+def test_kmeans_recovers_separated_groups(blobs):
+    x, truth = blobs
+    labels, centroids, inertia, iterations = kmeans(x, 3)
+    # 군집 번호는 임의이므로 같은 묶음끼리 같은 번호인지만 봅니다.
+    for group in range(3):
+        assert len(set(labels[truth == group])) == 1
+    assert len(set(labels)) == 3
+    assert centroids.shape == (3, 16)
+    assert inertia < 0.1
+    assert iterations < 100
+
+
+def test_kmeans_warm_start_converges_immediately(blobs):
+    x, _ = blobs
+    labels, centroids, inertia, _ = kmeans(x, 3)
+    warm_labels, _, warm_inertia, iterations = kmeans(x, 3, init=centroids)
+    np.testing.assert_array_equal(labels, warm_labels)
+    assert warm_inertia == pytest.approx(inertia)
+    assert iterations <= 2
+
+
+def test_kmeans_refills_empty_clusters():
+    x = np.column_stack([np.arange(10.0), np.zeros(10)])
+    labels, centroids, _, _ = kmeans(x, 3, init=[[0, 0], [1, 0], [50, 50]])  # 세 번째 중심점은 처음에 비어 있음
+    assert np.bincount(labels, minlength=3).min() > 0
+
+
+def test_store_orders_by_size_and_caches_on_disk(blobs, tmp_path):
+    x, _ = blobs
+    columns = [f"T{j}" for j in range(16)]
+    store = ClusterStore(str(tmp_path))
+    result = store.get(x, "a" * 64, 3, columns)
+    assert result.sizes().tolist() == [12, 8, 5]  # 큰 군집부터 0, 1, 2
+    assert os.path.exists(store.path("a" * 64, 3))
+
+    reloaded = ClusterStore(str(tmp_path)).get(x, "a" * 64, 3, columns)
+    np.testing.assert_array_equal(reloaded.labels, result.labels)
+    assert reloaded.iterations == result.iterations
+
+    # 데이터가 바뀌면(새 체크섬) 이전 중심점에서 이어서 계산합니다.
+    changed = ClusterStore(str(tmp_path)).get(x + 1e-4, "b" * 64, 3, columns)
+    assert changed.iterations <= 2
+    assert changed.sizes().tolist() == [12, 8, 5]
+
+
+def test_cluster_names(blobs, tmp_path):
+    x, _ = blobs
+    columns = [f"T{j}" for j in range(16)]
+    result = ClusterStore(str(tmp_path)).get(x, "c" * 64, 3, columns)
+    names = result.names(x.mean(axis=0), top=1)
+    assert names == ["1. T0 우세", "2. T1 우세", "3. T2 우세"]
@@ -0,0 +1,24 @@
+import re
+
+import pandas as pd
+
+import country_codes
+import mbti_data
+
+
+def test_every_dataset_country_has_an_iso_code():
+    names = pd.read_csv(mbti_data.DATA_PATH)["Country"].tolist()
+    assert len(names) == 158
+    codes, unmatched = country_codes.resolve(names)
+    assert unmatched == []
+    assert all(re.fullmatch(r"[A-Z]{3}", code) for code in codes)
+    assert len(set(codes)) == len(names)  # 서로 다른 나라가 같은 코드로 합쳐지지 않습니다.
+    assert list(mbti_data.build_index().iso3) == codes  # 지도에 쓰는 인덱스의 코드도 같습니다.
+
+
+def test_aliases_point_to_known_codes():
+    known = set(country_codes.COUNTRY_ISO3.values())
+    assert set(country_codes.ALIASES.values()) <= known
+    assert country_codes.to_iso3(" Republic of Korea ") == country_codes.to_iso3("South Korea") == "KOR"
+    assert country_codes.to_iso3("Narnia") is None
+    assert country_codes.resolve(["Japan", "Narnia"]) == (["JPN", ""], ["Narnia"])
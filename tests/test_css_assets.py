@@ -0,0 +1,128 @@
+import os
+
+import pytest
+from streamlit.testing.v1 import AppTest
+
+import css_assets
+import result_views
+
+# semantic.min.css에서 결과 화면(result_views.py)이 쓰는 규칙과 쓰지 않는 규칙을 골라 만든 축소판
+SEMANTIC_CSS = """
+@import url(https://fonts.googleapis.com/css?family=Lato:400,700);
+body{margin:0;padding:0}
+h1{font-size:2rem}
+.ui.card,.ui.cards>.card{max-width:100%;display:flex}
+.ui.centered.card{margin-left:auto;margin-right:auto}
+.ui.fluid.card{width:100%}
+.ui.card>.content>.header{font-weight:700}
+.ui.card .meta{color:rgba(0,0,0,.4)}
+.ui.card>.content>.description{clear:both}
+.ui.segment{position:relative;padding:1em}
+.ui.header{font-family:Lato}
+.ui.statistic>.value{font-weight:400}
+.ui.statistic>.label{text-transform:uppercase}
+.ui.huge.statistic>.value{font-size:4rem}
+.ui.center.aligned.statistic{justify-content:center}
+.ui.message{padding:1em 1.5em}
+.ui.positive.message{background-color:#fcfff5}
+.ui.icon.message>.icon:not(.close){font-size:3em}
+i.icon{font-family:Icons}
+i.icon.plane:before{content:"\\f072"}
+.ui.modal{display:none}
+.ui.accordion .title{cursor:pointer}
+.ui.card .ui.dimmer{display:none}
+@media only screen and (max-width:767px){.ui.card{width:100%}.ui.modal{width:95%}}
+@font-face{font-family:Icons;src:url(themes/default/assets/fonts/icons.eot);src:url(themes/default/assets/fonts/icons.woff2) format('woff2'),url(themes/default/assets/fonts/icons.ttf) format('truetype')}
+@font-face{font-family:outline-icons;src:url(themes/default/assets/fonts/outline-icons.woff2) format('woff2')}
+@keyframes loader{from{transform:rotate(0)}to{transform:rotate(360deg)}}
+"""
+
+USED = [
+    ".ui.card", ".ui.centered.card", ".ui.fluid.card", ".ui.card>.content>.header", ".ui.card .meta",
+    ".ui.card>.content>.description", ".ui.segment", ".ui.header", ".ui.statistic>.value",
+    ".ui.statistic>.label", ".ui.huge.statistic>.value", ".ui.center.aligned.statistic", ".ui.message",
+    ".ui.positive.message", ".ui.icon.message>.icon:not(.close)", "i.icon", "i.icon.plane:before",
+    ".ui.cards>.card",  # 정적 내보내기의 유형 목록
+]
+UNUSED = [".ui.modal", ".ui.accordion", ".ui.dimmer", "body{margin", "h1{", "@import",
+          "outline-icons", "@keyframes", "icons.ttf", "icons.eot"]
+
+
+@pytest.fixture
+def built(tmp_path):
+    source = tmp_path / "semantic.min.css"
+    source.write_text(SEMANTIC_CSS, encoding="utf-8")
+    fonts = tmp_path / "themes" / "default" / "assets" / "fonts"
+    fonts.mkdir(parents=True)
+    for name in ("icons.woff2", "icons.eot", "icons.ttf", "outline-icons.woff2"):
+        (fonts / name).write_bytes(b"font")
+    out = tmp_path / "css"
+    path, before, after = css_assets.build_stylesheet(str(source), str(out))
+    with open(path, encoding="utf-8") as f:
+        return path, f.read(), before, after
+
+
+def test_result_view_classes_are_collected():
+    classes = css_assets.used_classes()
+    page = result_views.card_html("INTJ", "설명") + result_views.stats_html("INTJ", "Japan", 3.2)
+    for _, value in css_assets.CLASS_ATTR.findall(page):
+        assert set(value.split()) <= classes
+
+
+def test_subset_keeps_selectors_result_views_uses(built):
+    path, css, before, after = built
+    for selector in USED:
+        assert selector in css, selector
+    for text in UNUSED:
+        assert text not in css, text
+    assert after < before
+    assert css.endswith(css_assets.PAGE_CSS + "\n")
+    # @media 안에서도 쓰는 선택자만 남습니다.
+    assert "@media only screen and (max-width:767px){.ui.card{width:100%}}" in css
+
+
+def test_icon_font_copied_and_file_name_is_content_hash(built, tmp_path):
+    path, css, _, _ = built
+    assert 'url("fonts/icons.woff2") format("woff2")' in css
+    assert os.listdir(tmp_path / "css" / "fonts") == ["icons.woff2"]
+    assert os.path.basename(path).startswith("semantic-")
+    # 같은 입력이면 같은 파일, 이전 빌드는 지웁니다.
+    again, _, _ = css_assets.build_stylesheet(str(tmp_path / "semantic.min.css"), str(tmp_path / "css"))
+    assert again == path
+    assert css_assets.stylesheet_url(str(tmp_path / "css"), "app/static/css") == f"app/static/css/{os.path.basename(path)}"
+    assert css_assets.stylesheet_url(str(tmp_path / "missing")) is None
+
+
+def load_twice():
+    import css_assets
+
+    css_assets.load_semantic_ui()
+    css_assets.load_semantic_ui()
+
+
+def test_link_injected_once_per_session(monkeypatch):
+    url = {"current": "app/static/css/semantic-aaaa.css"}
+    monkeypatch.setattr(css_assets, "stylesheet_url", lambda: url["current"])
+    at = AppTest.from_function(load_twice).run()
+    assert len(at.get("html")) == 1
+    assert "semantic-aaaa.css" in at.get("html")[0].proto.body
+    assert at.session_state[css_assets.SESSION_KEY] == url["current"]
+
+    at.run()
+    assert len(at.get("html")) == 0  # 같은 세션의 다음 rerun에서는 보내지 않습니다.
+
+    # 스타일시트를 다시 빌드하면(새 해시) 한 번 더 보내 링크를 바꿉니다.
+    url["current"] = "app/static/css/semantic-bbbb.css"
+    at.run()
+    assert len(at.get("html")) == 1
+    assert "semantic-bbbb.css" in at.get("html")[0].proto.body
+
+    # 새 세션은 처음 한 번 다시 보냅니다.
+    assert len(AppTest.from_function(load_twice).run().get("html")) == 1
+
+
+def test_cdn_fallback_without_built_stylesheet(monkeypatch):
+    monkeypatch.setattr(css_assets, "stylesheet_url", lambda: None)
+    at = AppTest.from_function(load_twice).run()
+    assert len(at.get("html")) == 0
+    assert css_assets.SEMANTIC_URL in at.markdown[0].value
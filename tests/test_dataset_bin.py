@@ -0,0 +1,88 @@
+import os
+
+import numpy as np
+import pytest
+
+import dataset_bin
+import mbti_data
+
+
+def test_bin_and_csv_share_checksum_and_results(dataset_csv, tmp_path):
+    bin_path = str(tmp_path / "countries.bin")
+    checksum, _ = dataset_bin.write_dataset(dataset_csv, bin_path)
+
+    from_csv = mbti_data.build_index(dataset_csv, bin_path="")
+    from_bin = mbti_data.build_index(dataset_csv, bin_path)
+    assert from_csv.checksum == from_bin.checksum == checksum
+    assert mbti_data.source_checksum(dataset_csv, bin_path="") == mbti_data.source_checksum(dataset_csv, bin_path)
+    assert from_csv.columns == from_bin.columns
+    for name in ("values", "order", "rank", "percentile", "zscore", "means", "stds"):
+        np.testing.assert_array_equal(np.asarray(getattr(from_csv, name)), np.asarray(getattr(from_bin, name)))
+
+
+def test_open_dataset_is_memory_mapped(dataset_csv, tmp_path):
+    bin_path = str(tmp_path / "countries.bin")
+    dataset_bin.write_dataset(dataset_csv, bin_path)
+    index = mbti_data.build_index(dataset_csv, bin_path)
+    assert isinstance(index.values, np.memmap)
+    assert isinstance(index.order, np.memmap)
+    assert np.shares_memory(index.values, index.type_values)
+
+
+def test_open_dataset_rejects_truncated_file(dataset_csv, tmp_path):
+    bin_path = str(tmp_path / "countries.bin")
+    dataset_bin.write_dataset(dataset_csv, bin_path)
+    with open(bin_path, "r+b") as f:
+        f.truncate(os.path.getsize(bin_path) - 8)
+    with pytest.raises(dataset_bin.DatasetFormatError):
+        dataset_bin.open_dataset(bin_path)
+    # 바이너리 파일을 못 읽으면 CSV로 돌아갑니다.
+    assert mbti_data.build_index(dataset_csv, bin_path).checksum == mbti_data.source_checksum(dataset_csv, "")
+
+
+def replace_with_older_file(csv_path: str, ratio_change: float = 0.01):
+    """내용을 바꾼 CSV로 교체하고 수정 시각은 예전 값보다 앞으로 돌립니다. (rsync -a, tar, git checkout)"""
+    import pandas as pd
+
+    stat = os.stat(csv_path)
+    frame = pd.read_csv(csv_path)
+    frame.loc[0, "INTJ"] += ratio_change
+    frame.loc[0, "ENFP"] -= ratio_change
+    frame.to_csv(csv_path, index=False)
+    os.utime(csv_path, ns=(stat.st_atime_ns, stat.st_mtime_ns - 3_600 * 10**9))
+
+
+def test_is_fresh_follows_csv_content_not_mtime(dataset_csv, tmp_path):
+    bin_path = str(tmp_path / "countries.bin")
+    assert not dataset_bin.is_fresh(bin_path, dataset_csv)
+    dataset_bin.write_dataset(dataset_csv, bin_path)
+    assert dataset_bin.is_fresh(bin_path, dataset_csv)
+
+    # 내용은 그대로 두고 수정 시각만 바뀌면 그대로 씁니다.
+    stat = os.stat(bin_path)
+    os.utime(dataset_csv, (stat.st_atime, stat.st_mtime + 10))
+    assert dataset_bin.is_fresh(bin_path, dataset_csv)
+
+    # 내용이 바뀌면 수정 시각이 더 오래되었어도 다시 빌드해야 합니다.
+    replace_with_older_file(dataset_csv)
+    assert os.path.getmtime(dataset_csv) < os.path.getmtime(bin_path)
+    assert not dataset_bin.is_fresh(bin_path, dataset_csv)
+    assert mbti_data.source_checksum(dataset_csv, bin_path) == mbti_data.source_checksum(dataset_csv, "")
+
+
+def test_index_store_reloads_csv_with_older_mtime(dataset_csv, tmp_path):
+    bin_path = str(tmp_path / "countries.bin")
+    store = mbti_data.IndexStore(dataset_csv, bin_path)
+    before = store.current()
+    assert dataset_bin.is_fresh(bin_path, dataset_csv)
+
+    replace_with_older_file(dataset_csv)
+    assert not store.check()  # 쓰는 중일 수 있으니 한 번 더 같은 값을 볼 때까지 기다립니다.
+    assert store.check()
+    after = store.current()
+    assert after.checksum != before.checksum
+    assert after.type_values[0, after.column("INTJ")] == pytest.approx(before.type_values[0, 0] + 0.01)
+    assert dataset_bin.read_checksum(bin_path) == after.checksum
+
+    # 재시작해도 새 데이터를 읽습니다.
+    assert mbti_data.build_index(dataset_csv, bin_path).checksum == after.checksum
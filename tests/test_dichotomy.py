@@ -0,0 +1,48 @@
+import numpy as np
+
+import dichotomy
+from conftest import TYPES, VALUES
+
+
+def test_membership_for_all_sixteen_types():
+    import mbti_types
+
+    weights, names = dichotomy.membership(list(mbti_types.TYPES))
+    assert names == dichotomy.FEATURES
+    assert weights.shape == (16, 12)
+    # 축마다 8개 유형, 기질 그룹마다 4개 유형
+    assert weights.sum(axis=0).tolist() == [8] * 8 + [4] * 4
+    # 유형 하나는 축 글자 4개와 기질 그룹 하나에 속합니다.
+    assert weights.sum(axis=1).tolist() == [5] * 16
+
+
+def test_membership_drops_empty_features():
+    weights, names = dichotomy.membership(["INTJ", "INTP"])
+    assert names == ["I", "N", "T", "J", "P", "NT"]
+    assert weights.tolist() == [[1, 1, 1, 1, 0, 1], [1, 1, 1, 0, 1, 1]]
+
+
+def test_derive_sums_member_types():
+    names, derived = dichotomy.derive(np.array(VALUES), TYPES)
+    values = np.array(VALUES)
+    col = {name: j for j, name in enumerate(names)}
+    np.testing.assert_allclose(derived[:, col["E"]], values[:, 2] + values[:, 3])
+    np.testing.assert_allclose(derived[:, col["I"]] + derived[:, col["E"]], values.sum(axis=1))
+    np.testing.assert_allclose(derived[:, col["NT"]], values[:, :3].sum(axis=1))
+
+
+def test_index_ranks_derived_columns_like_types(small_index):
+    assert small_index.columns[:len(TYPES)] == TYPES
+    assert "I" in small_index.columns and "NT" in small_index.columns
+    # I = INTJ + INTP
+    top = small_index.top_k("I", 2)
+    assert top["Country"].tolist() == ["Brazil", "Norway"]
+    assert abs(small_index.mean("I") - small_index.combined(["INTJ", "INTP"]).mean()) < 1e-6
+    # 프로필과 유사도는 원래 유형 컬럼만 씁니다.
+    assert small_index.profile("Japan")["Type"].tolist() == TYPES
+    assert small_index.similarity().pairwise().shape == (len(VALUES), len(VALUES))
+
+
+def test_label():
+    assert dichotomy.label("NT") == "NT (분석가형)"
+    assert dichotomy.label("INTJ") == "INTJ"
@@ -0,0 +1,54 @@
+import time
+
+from dog_feed import DogImageFeed, fetch_dog_image_url
+
+
+def wait_for(condition, timeout: float = 5):
+    deadline = time.monotonic() + timeout
+    while not condition():
+        if time.monotonic() > deadline:
+            return False
+        time.sleep(0.01)
+    return True
+
+
+def test_fetch_dog_image_url(stub):
+    assert fetch_dog_image_url(f"{stub.base_url}/api/breeds/image/random").startswith(f"{stub.base_url}/img/")
+    assert fetch_dog_image_url(f"{stub.base_url}/missing") is None  # 404는 None
+
+
+def test_feed_advances_and_refills(stub):
+    feed = DogImageFeed(f"{stub.base_url}/api/breeds/image/random", interval=0.05, prefetch=2).start()
+    try:
+        assert feed.wait_ready(timeout=5)
+        assert wait_for(lambda: feed.version() >= 4)
+        assert feed.current().startswith(f"{stub.base_url}/img/")
+        # 교체할 때마다 다음 URL을 미리 채워 두므로 API 호출 수는 교체 수보다 prefetch만큼 앞섭니다.
+        assert wait_for(lambda: stub.calls["dog_api"] >= feed.version() + 1)
+        assert len(feed._upcoming) <= feed.prefetch
+    finally:
+        feed.stop()
+
+
+def test_feed_keeps_last_good_image_when_api_fails():
+    urls = iter(["https://images.test/a.jpg", "https://images.test/b.jpg"])
+    feed = DogImageFeed("https://dog.test/api", interval=0.02, prefetch=1, fetch=lambda url: next(urls, None)).start()
+    try:
+        assert wait_for(lambda: feed.version() == 2)
+        time.sleep(0.1)  # 이후 API가 계속 실패해도
+        assert feed.current() == "https://images.test/b.jpg"
+        assert feed.version() == 2
+    finally:
+        feed.stop()
+
+
+def test_feed_applies_resolve_hook():
+    feed = DogImageFeed(
+        "https://dog.test/api", interval=10, prefetch=1,
+        fetch=lambda url: "https://images.test/a.jpg", resolve=lambda url: url.replace("https://images.test", "local"),
+    ).start()
+    try:
+        assert feed.wait_ready(timeout=5)
+        assert feed.current() == "local/a.jpg"
+    finally:
+        feed.stop()
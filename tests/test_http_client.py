@@ -0,0 +1,95 @@
+import time
+
+import pytest
+import requests
+
+from http_client import CircuitBreaker, CircuitOpenError, HttpClient
+
+UPSTREAM = "https://dog.test"
+
+
+@pytest.fixture
+def client(stub):
+    """모든 호출을 스텁 서버로 보내는 클라이언트. (재시도 없음, 짧은 리셋 시간)"""
+    return HttpClient(retries=0, failure_threshold=2, reset_timeout=0.2, upstream_override=stub.base_url)
+
+
+def test_breaker_opens_after_threshold_and_half_opens():
+    breaker = CircuitBreaker(threshold=2, reset_timeout=0.1)
+    assert breaker.state == "closed"
+    breaker.record_failure()
+    assert breaker.state == "closed" and breaker.allow()
+    breaker.record_failure()
+    assert breaker.state == "open"
+    assert not breaker.allow()
+
+    time.sleep(0.12)
+    assert breaker.state == "half-open"
+    assert breaker.allow()  # 시험 호출은 한 번만
+    assert not breaker.allow()
+    breaker.record_success()
+    assert breaker.state == "closed"
+
+
+def test_half_open_failure_reopens():
+    breaker = CircuitBreaker(threshold=1, reset_timeout=0.05)
+    breaker.record_failure()
+    time.sleep(0.06)
+    assert breaker.allow()
+    breaker.record_failure()
+    assert breaker.state == "open"
+    assert not breaker.allow()
+
+
+def test_client_redirects_to_stub(client, stub):
+    data = client.get_json(f"{UPSTREAM}/api/breeds/image/random")
+    assert data["status"] == "success"
+    assert stub.calls["dog_api"] == 1
+
+
+def test_client_circuit_opens_and_recovers(client, stub):
+    for _ in range(2):
+        with pytest.raises(requests.HTTPError):
+            client.get(f"{UPSTREAM}/missing")
+    assert client.breaker(UPSTREAM).state == "open"
+
+    # 열려 있는 동안에는 스텁 서버를 부르지 않습니다.
+    calls = stub.total_calls()
+    with pytest.raises(CircuitOpenError):
+        client.get(f"{UPSTREAM}/api/breeds/image/random")
+    assert stub.total_calls() == calls
+
+    time.sleep(0.25)
+    assert client.get(f"{UPSTREAM}/api/breeds/image/random").status_code == 200
+    assert client.breaker(UPSTREAM).state == "closed"
+
+
+def test_breakers_are_per_host(client):
+    for _ in range(2):
+        with pytest.raises(requests.HTTPError):
+            client.get(f"{UPSTREAM}/missing")
+    assert client.breaker("https://lottie.test/a.json").state == "closed"
+    assert client.get("https://lottie.test/a.json").status_code == 200
+
+
+def test_get_json_falls_back_to_last_good(stub):
+    client = HttpClient(retries=0, failure_threshold=1, reset_timeout=60, upstream_override=stub.base_url)
+    url = f"{UPSTREAM}/animation.json"
+    first = client.get_json(url)
+    client.breaker(url).record_failure()  # 서킷이 열려 호출이 실패해도
+    assert client.get_json(url) == first
+    with pytest.raises(CircuitOpenError):
+        client.get_json(f"{UPSTREAM}/other.json")  # 정상 값이 없던 URL은 예외
+
+
+def test_get_json_falls_back_when_upstream_goes_down():
+    from bench.stubs import StubServer
+
+    server = StubServer(images=1).start()
+    client = HttpClient(retries=0, connect_timeout=0.5, read_timeout=0.5, upstream_override=server.base_url)
+    url = f"{UPSTREAM}/api/breeds/image/random"
+    first = client.get_json(url)
+    server.stop()
+    client.session.close()  # keep-alive 연결은 서버를 멈춰도 남아 있으므로 끊습니다.
+    assert client.get_json(url) == first
+    assert client.breaker(url).failures == 1
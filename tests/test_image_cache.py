@@ -0,0 +1,100 @@
+import json
+import os
+
+import pytest
+
+from image_cache import ImageCache
+
+
+def image(i: int) -> bytes:
+    """서로 다른 100바이트 이미지 내용."""
+    return bytes([i]) * 100
+
+
+@pytest.fixture
+def make_cache(tmp_path):
+    def make(max_bytes: int = 10_000) -> ImageCache:
+        return ImageCache(str(tmp_path / "static"), "app/static", max_bytes, str(tmp_path / ".cache" / "index.json"))
+
+    return make
+
+
+def age(cache: ImageCache, name: str, seconds_ago: float):
+    """파일의 마지막 사용 시각을 과거로 돌립니다."""
+    past = os.path.getmtime(cache.path(name)) - seconds_ago
+    os.utime(cache.path(name), (past, past))
+
+
+def test_put_and_lookup(make_cache):
+    cache = make_cache()
+    name = cache.put("https://images.test/a.jpg", image(1), "image/jpeg")
+    assert name.endswith(".jpg") and os.path.exists(cache.path(name))
+    assert cache.lookup("https://images.test/a.jpg") == name
+    assert cache.lookup("https://images.test/missing.jpg") is None
+    # 같은 내용은 한 번만 저장합니다.
+    assert cache.put("https://images.test/copy.jpg", image(1), "image/jpeg") == name
+    assert len(os.listdir(cache.root)) == 1
+
+
+def test_eviction_removes_least_recently_used_first(make_cache):
+    cache = make_cache(max_bytes=300)
+    names = [cache.put(f"https://images.test/{i}.jpg", image(i), "image/jpeg") for i in range(3)]
+    for seconds_ago, name in zip((30, 20, 10), names):
+        age(cache, name, seconds_ago)
+    # 가장 오래된 0번을 다시 쓰면, 그다음으로 오래된 1번이 먼저 지워집니다.
+    assert cache.lookup("https://images.test/0.jpg") == names[0]
+    cache.put("https://images.test/3.jpg", image(3), "image/jpeg")
+    assert sorted(os.listdir(cache.root)) == sorted([names[0], names[2], cache.lookup("https://images.test/3.jpg")])
+    assert cache.lookup("https://images.test/1.jpg") is None
+
+
+def test_size_cap_counts_variants_and_evicts_whole_groups(make_cache):
+    cache = make_cache(max_bytes=450)
+    first = cache.put("https://images.test/a.jpg", image(1), "image/jpeg")
+    stem = os.path.splitext(first)[0]
+    for variant in (f"{stem}-640.webp", f"{stem}-1280.webp"):
+        with open(cache.path(variant), "wb") as f:
+            f.write(b"v" * 100)
+    age(cache, first, 10)
+    second = cache.put("https://images.test/b.jpg", image(2), "image/jpeg")
+    assert len(os.listdir(cache.root)) == 4  # 400바이트, 아직 제한 이하
+
+    # 변형 파일도 크기에 들어가므로, 넘으면 원본과 변형을 함께 지웁니다.
+    with open(cache.path(f"{os.path.splitext(second)[0]}-640.webp"), "wb") as f:
+        f.write(b"v" * 100)
+    cache.evict()
+    remaining = os.listdir(cache.root)
+    assert sum(os.path.getsize(cache.path(n)) for n in remaining) <= cache.max_bytes
+    assert not any(n.startswith(stem) for n in remaining)
+    assert cache.lookup("https://images.test/a.jpg") is None
+    assert cache.lookup("https://images.test/b.jpg") == second
+
+
+def test_index_merges_entries_from_other_processes(make_cache):
+    # 같은 인덱스 파일을 쓰는 두 워커가 서로의 항목을 덮어쓰지 않습니다.
+    one, two = make_cache(), make_cache()
+    a = one.put("https://images.test/a.jpg", image(1), "image/jpeg")
+    b = two.put("https://images.test/b.jpg", image(2), "image/jpeg")
+    with open(one._index_path, encoding="utf-8") as f:
+        assert json.load(f) == {"https://images.test/a.jpg": a, "https://images.test/b.jpg": b}
+    assert make_cache().lookup("https://images.test/a.jpg") == a
+
+    # 다른 워커가 지운 파일은 다시 인덱스에 살려 내지 않습니다.
+    os.remove(one.path(a))
+    two.put("https://images.test/c.jpg", image(3), "image/jpeg")
+    one.put("https://images.test/d.jpg", image(4), "image/jpeg")
+    with open(one._index_path, encoding="utf-8") as f:
+        assert sorted(json.load(f)) == ["https://images.test/b.jpg", "https://images.test/c.jpg",
+                                        "https://images.test/d.jpg"]
+    assert not [n for n in os.listdir(os.path.dirname(one._index_path)) if n.endswith(".tmp")]
+
+
+def test_legacy_index_moves_out_of_static_folder(tmp_path, make_cache):
+    root = tmp_path / "static"
+    root.mkdir()
+    (root / "index.json").write_text(json.dumps({"https://images.test/a.jpg": "x.jpg"}))
+    (root / "x.jpg").write_bytes(image(1))
+    cache = make_cache()
+    assert cache.lookup("https://images.test/a.jpg") == "x.jpg"
+    assert not (root / "index.json").exists()
+    assert os.path.exists(cache._index_path)
@@ -0,0 +1,73 @@
+import os
+
+import pytest
+from PIL import Image
+
+import image_variants
+from image_cache import ImageCache
+from image_variants import ResponsiveImage, Variant, VariantPipeline, background_css
+
+
+@pytest.fixture
+def pipeline(tmp_path):
+    cache = ImageCache(str(tmp_path / "static"), "app/static", index_path=str(tmp_path / "index.json"))
+    pipeline = VariantPipeline(cache)
+    yield pipeline
+    pipeline.shutdown()
+
+
+def test_resolve_builds_every_width_and_format(pipeline, stub):
+    image = pipeline.resolve(f"{stub.base_url}/img/1.jpg")
+    name = pipeline.cache.lookup(f"{stub.base_url}/img/1.jpg")
+    stem = os.path.splitext(name)[0]
+    assert image.src == f"app/static/{name}"
+    assert [(v.width, v.mime) for v in image.variants] == [
+        (640, "image/webp"), (640, "image/jpeg"),
+        (1280, "image/webp"), (1280, "image/jpeg"),
+        (1920, "image/webp"), (1920, "image/jpeg"),
+    ]
+    for variant in image.variants:
+        ext = "webp" if variant.mime == "image/webp" else "jpg"
+        assert variant.url == f"app/static/{stem}-{variant.width}.{ext}"
+        with Image.open(pipeline.cache.path(os.path.basename(variant.url))) as img:
+            assert img.format == ("WEBP" if ext == "webp" else "JPEG")
+            # 원본(1600x1200)보다 크게 늘리지 않고, 비율을 유지합니다.
+            assert img.width == min(variant.width, 1600)
+            assert img.height == round(1200 * img.width / 1600)
+    assert not [n for n in os.listdir(pipeline.cache.root) if n.endswith(".tmp")]
+
+
+def test_second_request_reuses_cached_original_and_variants(pipeline, stub, monkeypatch):
+    url = f"{stub.base_url}/img/2.jpg"
+    first = pipeline.resolve(url)
+    mtimes = {n: os.stat(pipeline.cache.path(n)).st_mtime_ns for n in os.listdir(pipeline.cache.root)}
+
+    def fail(*args):
+        raise AssertionError("변형을 다시 만들었습니다")
+
+    monkeypatch.setattr(image_variants, "_encode", fail)
+    assert pipeline.resolve(url) == first
+    assert stub.calls["image"] == 1  # 원본도 다시 받지 않습니다.
+    assert {n for n in os.listdir(pipeline.cache.root)} == set(mtimes)
+    variant_files = [os.path.basename(v.url) for v in first.variants]
+    assert all(os.stat(pipeline.cache.path(n)).st_mtime_ns == mtimes[n] for n in variant_files)
+
+
+def test_failed_variants_are_left_out(pipeline, stub):
+    name = pipeline.cache.put("https://images.test/broken.jpg", b"not an image", "image/jpeg")
+    assert pipeline.build(name) == ()
+    # 원본을 받지 못하면 원래 URL을 그대로 씁니다.
+    assert pipeline.resolve(f"{stub.base_url}/missing.jpg") == ResponsiveImage(f"{stub.base_url}/missing.jpg")
+
+
+def test_background_css_prefers_smallest_fitting_variant():
+    image = ResponsiveImage("a.jpg", (
+        Variant(640, "image/webp", "a-640.webp"), Variant(640, "image/jpeg", "a-640.jpg"),
+        Variant(1920, "image/webp", "a-1920.webp"), Variant(1920, "image/jpeg", "a-1920.jpg"),
+    ))
+    rules = background_css(image, selector=".x").splitlines()
+    assert rules[0] == '.x { background-image: url("a.jpg"); }'
+    assert rules[1] == '.x { background-image: image-set(url("a-1920.webp") type("image/webp"), ' \
+                       'url("a-1920.jpg") type("image/jpeg")); }'
+    assert rules[2].startswith("@media (max-width: 640px) { .x { background-image: image-set(url(\"a-640.webp\")")
+    assert background_css("b.jpg") == '.stApp { background-image: url("b.jpg"); }'
@@ -0,0 +1,106 @@
+import pandas as pd
+import pytest
+
+import ingest
+
+HEADER = "country,type,answered_at\n"
+
+
+def run(tmp_path, *paths, extra=()):
+    out = tmp_path / "out.csv"
+    code = ingest.main([*map(str, paths), "--out", str(out), "--state", str(tmp_path / "state.json"),
+                        "--workers", "1", *extra])
+    return code, pd.read_csv(out).set_index("Country") if out.exists() else None
+
+
+def test_normalize_country_uses_dataset_names():
+    assert ingest.normalize_country(" USA ") == "United States"
+    assert ingest.normalize_country("Republic of Korea") == "South Korea"
+    assert ingest.normalize_country("kor") == "South Korea"
+    assert ingest.normalize_country("Narnia") is None
+    assert ingest.CANONICAL_NAMES["USA"] == "United States"
+
+
+def test_normalize_type():
+    assert ingest.normalize_type(" intj-a ") == ingest.TYPE_INDEX["INTJ"]
+    assert ingest.normalize_type("XXXX") == -1
+    assert ingest.normalize_type(None) == -1
+
+
+def test_count_frame_drops_unknown_values():
+    chunk = pd.DataFrame({
+        "country": ["Japan", "japan ", "Narnia", None, "Japan"],
+        "type": ["INTJ", "INTJ", "INTJ", "ENFP", "????"],
+    })
+    counts, dropped, unknown = ingest.count_frame(chunk, "country", "type")
+    assert counts.index.tolist() == ["Japan"]
+    assert counts.loc["Japan", "INTJ"] == 1  # 나라 이름은 대소문자까지 맞아야 합니다. ("japan "은 매칭되지 않음)
+    assert dropped == 4
+    assert unknown == {"japan": 1, "Narnia": 1}  # 이름별 버린 행 수 (나라가 비어 있는 행은 이름 없이 dropped에만)
+
+
+def test_append_only_reads_new_rows(tmp_path, capsys):
+    responses = tmp_path / "responses.csv"
+    responses.write_text(HEADER + "Japan,INTJ,1\nJapan,ENFP,2\nUSA,INTJ,3\n")
+    code, table = run(tmp_path, responses)
+    assert code == 0
+    assert table.loc["Japan", "INTJ"] == pytest.approx(0.5)
+    assert table.loc["United States", "INTJ"] == pytest.approx(1.0)
+
+    # 덧붙인 부분만 읽습니다. (마지막 줄이 아직 쓰는 중이면 다음 실행 때)
+    with open(responses, "a") as f:
+        f.write("Japan,ENFP,4\nJapan,ENFP,5\nUnited States of America,ENTP")
+    capsys.readouterr()
+    code, table = run(tmp_path, responses)
+    assert "2행" in capsys.readouterr().out
+    assert table.loc["Japan", "ENFP"] == pytest.approx(0.75)
+    assert table.loc["United States", "INTJ"] == pytest.approx(1.0)
+
+    with open(responses, "a") as f:
+        f.write(",5\n")
+    code, table = run(tmp_path, responses)
+    assert table.loc["United States", "ENTP"] == pytest.approx(0.5)
+
+    # 이미 반영한 파일은 다시 세지 않습니다.
+    capsys.readouterr()
+    run(tmp_path, responses)
+    assert "이미 반영됨" in capsys.readouterr().out
+
+
+def test_rewritten_file_is_rejected(tmp_path):
+    responses = tmp_path / "responses.csv"
+    responses.write_text(HEADER + "Japan,INTJ,1\n")
+    run(tmp_path, responses)
+    responses.write_text(HEADER + "Japan,ENFP,1\nJapan,ENFP,2\n")
+    code, _ = run(tmp_path, responses)
+    assert code == 1
+    code, table = run(tmp_path, responses, extra=["--rebuild"])
+    assert code == 0 and table.loc["Japan", "ENFP"] == pytest.approx(1.0)
+
+
+def test_unknown_countries_are_reported_not_added(tmp_path, capsys, caplog):
+    responses = tmp_path / "responses.csv"
+    responses.write_text(HEADER + "Japan,INTJ,1\nNarnia,INTJ,2\nNarnia,ENFP,3\nAtlantis,INTJ,4\nJapan,????,5\n")
+    code, table = run(tmp_path, responses)
+    assert code == 0
+    assert table.index.tolist() == ["Japan"]
+    out = capsys.readouterr().out
+    assert "버린 행 4" in out  # 모르는 나라 3행 + 모르는 유형 1행
+    assert "나라를 알 수 없어 버린 행 3: Atlantis 1, Narnia 2" in out
+    assert any(r.levelname == "WARNING" and "Narnia 2" in r.getMessage() for r in caplog.records)
+
+    report = ingest.ingest([str(responses)], {"types": ingest.TYPE_COLUMNS, "counts": {}, "sources": {}}, 1)
+    assert report[str(responses)] == (5, 4, {"Atlantis": 1, "Narnia": 2})
+
+
+def test_parallel_tasks_match_single_task(tmp_path, monkeypatch):
+    responses = tmp_path / "responses.csv"
+    rows = [f"{c},{t},{i}" for i, (c, t) in enumerate(zip(["Japan", "France", "Brazil"] * 200, ["INTJ", "ENFP"] * 300))]
+    responses.write_text(HEADER + "\n".join(rows) + "\n")
+    single, rows_single, _, _ = ingest.count_tasks(ingest.plan_tasks(str(responses)), 1)
+    monkeypatch.setattr(ingest, "TASK_BYTES", 512)
+    tasks = ingest.plan_tasks(str(responses), workers=2)
+    assert len(tasks) > 1
+    split, rows_split, _, _ = ingest.count_tasks(tasks, 2)
+    assert rows_single == rows_split == 600
+    pd.testing.assert_frame_equal(single.sort_index(), split.sort_index())
@@ -0,0 +1,87 @@
+import json
+import os
+import threading
+import time
+
+import pytest
+
+from bench.stubs import LOTTIE_PATH, StubServer
+from lottie_assets import LottieLoader
+
+FALLBACK = {"fallback": True}
+
+
+@pytest.fixture
+def slow_stub():
+    """응답마다 0.2초 늦는 스텁 서버. (동시에 부른 요청이 모두 다운로드 중에 들어오도록)"""
+    with StubServer(latency=0.2, images=1) as server:
+        yield server
+
+
+@pytest.fixture
+def make_loader(tmp_path):
+    fallback = tmp_path / "fallback.json"
+    fallback.write_text(json.dumps(FALLBACK))
+
+    def make(**kwargs) -> LottieLoader:
+        return LottieLoader(str(tmp_path / "cache"), str(fallback), **kwargs)
+
+    return make
+
+
+def expected_animation() -> dict:
+    with open(LOTTIE_PATH, encoding="utf-8") as f:
+        return json.load(f)
+
+
+def test_concurrent_loads_share_one_download(slow_stub, make_loader):
+    loader = make_loader(workers=4)
+    url = f"{slow_stub.base_url}/anim.json"
+    barrier = threading.Barrier(8)
+    futures = []
+
+    def load():
+        barrier.wait()
+        futures.append(loader.load(url))
+
+    threads = [threading.Thread(target=load) for _ in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert len({id(f) for f in futures}) == 1
+    assert futures[0].result(timeout=5) == expected_animation()
+    assert slow_stub.calls["lottie"] == 1
+
+    # 다시 불러도(다른 프로세스가 새로 만든 로더여도) 디스크 캐시에서 바로 돌려줍니다.
+    assert loader.load(url) is futures[0]
+    cached = make_loader().load(url)
+    assert cached.done() and cached.result() == expected_animation()
+    assert slow_stub.calls["lottie"] == 1
+    assert os.path.exists(loader.cache_path(url))
+
+
+def test_failed_url_uses_fallback_until_ttl_expires(slow_stub, make_loader):
+    loader = make_loader(failure_ttl=0.5)
+    url = f"{slow_stub.base_url}/missing"  # 스텁 서버는 404
+    first = loader.load(url)
+    assert first.result(timeout=5) == FALLBACK
+    assert slow_stub.calls["other"] == 1
+    assert not os.path.exists(loader.cache_path(url))  # 대체 애니메이션은 저장하지 않습니다.
+
+    # FAILURE_TTL 동안은 같은 Future(대체 애니메이션)를 돌려주고 다시 요청하지 않습니다.
+    assert loader.load(url) is first
+    assert slow_stub.calls["other"] == 1
+
+    time.sleep(0.55)
+    retry = loader.load(url)
+    assert retry is not first
+    assert retry.result(timeout=5) == FALLBACK
+    assert slow_stub.calls["other"] == 2
+
+
+def test_unreachable_host_falls_back(make_loader):
+    with StubServer(images=1) as stub:
+        url = f"{stub.base_url}/anim.json"
+    # 서버가 닫힌 뒤의 요청 (연결 실패)
+    assert make_loader().load(url).result(timeout=10) == FALLBACK
@@ -0,0 +1,45 @@
+import json
+import subprocess
+import sys
+
+import dataset_bin
+import dichotomy
+import mbti_data
+import mbti_types
+from conftest import ROOT
+
+HEAVY_MODULES = ("pandas", "pyarrow", "plotly.express", "streamlit_lottie")
+
+
+def test_descriptions_keep_select_order():
+    info = mbti_types.descriptions()
+    assert list(info)[:16] == list(mbti_types.SELECT_ORDER)
+    assert list(info)[0] == "ISTJ"
+    assert list(info)[16:] == list(dichotomy.DESCRIPTIONS)  # 성향 축/기질 그룹은 유형 뒤에
+    assert info["INTJ"] == "전략가 - 상상력이 풍부하며 철두철미한 계획을 세웁니다."
+    assert mbti_types.descriptions(nickname=True)["INTJ"].startswith("전략가 (용의주도한 전략가) - ")
+
+
+def test_cards_keep_temperament_order():
+    cards = mbti_types.cards()
+    assert list(cards)[:16] == list(mbti_types.TYPES)
+    assert list(cards)[:4] == ["INTJ", "INTP", "ENTJ", "ENTP"]
+    assert set(cards) == set(mbti_types.TYPES) | set(dichotomy.FEATURES)
+    assert cards["ESFP"]["icon"] == "💃"
+    assert sorted(mbti_types.SELECT_ORDER) == sorted(mbti_types.TYPES)
+
+
+def test_shared_modules_do_not_import_heavy_dependencies(tmp_path):
+    # 바이너리 데이터셋을 여는 경로(선택 전 첫 화면)에서는 pandas/plotly.express를 불러오지 않습니다.
+    bin_path = str(tmp_path / "dataset.bin")
+    dataset_bin.write_dataset(mbti_data.DATA_PATH, bin_path)
+    script = f"""
+import json, sys
+import mbti_data, mbti_types, dichotomy, dataset_bin, result_views, css_assets
+index = mbti_data.build_index({mbti_data.DATA_PATH!r}, {bin_path!r})
+index.mean("INTJ"), index.rank, mbti_types.descriptions(), mbti_types.cards()
+print(json.dumps(sorted(m for m in {HEAVY_MODULES!r} if m in sys.modules)))
+"""
+    result = subprocess.run([sys.executable, "-c", script], cwd=ROOT, capture_output=True, text=True, timeout=120)
+    assert result.returncode == 0, result.stderr
+    assert json.loads(result.stdout.splitlines()[-1]) == []
@@ -0,0 +1,150 @@
+import http.client
+import re
+
+import pytest
+
+import metrics
+
+SAMPLE = re.compile(r'^([a-zA-Z_:][\w:]*)(\{(?:[a-zA-Z_]\w*="(?:[^"\\\n]|\\[\\"n])*",?)*\})? (\S+)$')
+
+
+def parse(text: str) -> dict:
+    """Prometheus 텍스트 포맷을 검사하며 {이름: (종류, HELP, [(샘플 이름, 라벨, 값)])}로 읽습니다."""
+    assert text.endswith("\n")
+    families, current = {}, None
+    for line in text.splitlines():
+        if line.startswith("# HELP "):
+            name, help_text = line[7:].split(" ", 1)
+            families[name] = [None, help_text, []]
+            current = name
+        elif line.startswith("# TYPE "):
+            name, kind = line[7:].split(" ")
+            assert name == current and kind in ("counter", "histogram")
+            families[name][0] = kind
+        else:
+            match = SAMPLE.match(line)
+            assert match, line
+            sample, labels, value = match.groups()
+            # 샘플은 바로 앞에 선언한 지표의 것이어야 합니다. (히스토그램은 _bucket/_sum/_count)
+            assert sample == current or sample in {f"{current}_{s}" for s in ("bucket", "sum", "count")}, line
+            families[current][2].append((sample, labels or "", float(value)))
+    return {name: tuple(family) for name, family in families.items()}
+
+
+def test_counter_increments_per_label_set():
+    counter = metrics.Counter("test_total", "테스트", ["host", "outcome"])
+    counter.inc(host="a", outcome="ok")
+    counter.inc(host="a", outcome="ok")
+    counter.inc(2.5, host="b", outcome="error")
+    assert counter.items() == [(("a", "ok"), 2), (("b", "error"), 2.5)]
+    assert list(counter.render()) == ['test_total{host="a",outcome="ok"} 2',
+                                      'test_total{host="b",outcome="error"} 2.5']
+    with pytest.raises(KeyError):
+        counter.inc(host="a")  # 라벨이 빠지면 오류
+
+
+def test_label_values_are_escaped():
+    counter = metrics.Counter("test_total", "테스트", ["path"])
+    counter.inc(path='C:\\dir "x"\nnext')
+    assert list(counter.render()) == ['test_total{path="C:\\\\dir \\"x\\"\\nnext"} 1']
+    assert parse(f"# HELP test_total h\n# TYPE test_total counter\n{next(counter.render())}\n")
+
+
+def test_histogram_buckets_are_cumulative():
+    histogram = metrics.Histogram("test_seconds", "테스트", ["step"], buckets=(0.1, 1.0))
+    for value in (0.05, 0.1, 0.5, 3.0):
+        histogram.observe(value, step="load")
+    lines = list(histogram.render())
+    assert lines == [
+        'test_seconds_bucket{step="load",le="0.1"} 2',  # 구간 경계값(0.1)은 그 구간에 들어갑니다. (le)
+        'test_seconds_bucket{step="load",le="1"} 3',
+        'test_seconds_bucket{step="load",le="+Inf"} 4',
+        'test_seconds_sum{step="load"} 3.650000',
+        'test_seconds_count{step="load"} 4',
+    ]
+    (row,) = histogram.summary()
+    assert row["labels"] == {"step": "load"} and row["count"] == 4 and row["max"] == 3.0
+    assert row["p50"] == 0.1
+
+
+def test_render_exposition_format(monkeypatch):
+    counter = metrics.Counter("test_requests_total", "요청 수", ["endpoint"])
+    histogram = metrics.Histogram("test_step_seconds", "단계 시간", ["step"])
+    empty = metrics.Counter("test_empty_total", "아직 값 없음")
+    monkeypatch.setattr(metrics, "REGISTRY", [counter, histogram, empty])
+    counter.inc(endpoint="top")
+    histogram.observe(0.002, step="top_k")
+
+    families = parse(metrics.render())
+    assert list(families) == ["test_requests_total", "test_step_seconds", "test_empty_total"]
+    assert families["test_requests_total"] == ("counter", "요청 수", [("test_requests_total", '{endpoint="top"}', 1)])
+    kind, _, samples = families["test_step_seconds"]
+    assert kind == "histogram"
+    assert len([s for s in samples if s[0] == "test_step_seconds_bucket"]) == len(metrics.BUCKETS) + 1
+    assert ("test_step_seconds_count", '{step="top_k"}', 1) in samples
+    assert families["test_empty_total"] == ("counter", "아직 값 없음", [])
+
+
+def test_help_text_is_escaped(monkeypatch):
+    monkeypatch.setattr(metrics, "REGISTRY", [metrics.Counter("test_total", "첫 줄\n둘째 줄 C:\\x")])
+    assert metrics.render() == "# HELP test_total 첫 줄\\n둘째 줄 C:\\\\x\n# TYPE test_total counter\n"
+
+
+def test_registry_renders_valid_text():
+    metrics.API_REQUESTS.inc(endpoint="/v1/top", status="200")
+    families = parse(metrics.render())
+    assert set(families) == {m.name for m in metrics.REGISTRY}
+    assert all(families[m.name][0] == m.kind for m in metrics.REGISTRY)
+
+
+def test_timed_records_even_on_error(monkeypatch):
+    histogram = metrics.Histogram("test_step_seconds", "단계 시간", ["step"])
+    monkeypatch.setattr(metrics, "STEP_SECONDS", histogram)
+
+    @metrics.timed("decorated")
+    def work():
+        return 1
+
+    assert work() == 1 and work() == 1
+    with pytest.raises(ValueError):
+        with metrics.timed("failing"):
+            raise ValueError
+    counts = {row["labels"]["step"]: row["count"] for row in histogram.summary()}
+    assert counts == {"decorated": 2, "failing": 1}
+
+
+def test_cached_counts_hits_and_misses(monkeypatch):
+    import streamlit as st
+
+    counter = metrics.Counter("test_cache_total", "캐시", ["function", "result"])
+    monkeypatch.setattr(metrics, "CACHE_REQUESTS", counter)
+
+    @metrics.cached(st.cache_resource, name="square", show_spinner=False)
+    def square(x):
+        return x * x
+
+    square.clear()
+    assert [square(2), square(2), square(3), square(2)] == [4, 4, 9, 4]
+    assert dict(counter.items()) == {("square", "hit"): 2, ("square", "miss"): 2}
+    square.clear()
+
+
+def test_metrics_endpoint(monkeypatch):
+    monkeypatch.setattr(metrics, "_server", None)
+    server = metrics.serve(0, host="127.0.0.1")
+    try:
+        assert metrics.serve(0) is server  # 이미 열려 있으면 같은 서버
+        conn = http.client.HTTPConnection("127.0.0.1", server.server_port, timeout=5)
+        conn.request("GET", "/metrics")
+        response = conn.getresponse()
+        assert response.status == 200
+        assert response.getheader("Content-Type").startswith("text/plain; version=0.0.4")
+        assert parse(response.read().decode("utf-8"))
+        conn.request("GET", "/other")
+        response = conn.getresponse()
+        response.read()
+        assert response.status == 404
+        conn.close()
+    finally:
+        server.shutdown()
+        server.server_close()
@@ -0,0 +1,27 @@
+import os
+
+import pytest
+from streamlit.testing.v1 import AppTest
+
+import mbti_data
+import mbti_types
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+@pytest.mark.parametrize("page", ["mbti.py", os.path.join("pages", "02-second.py")])
+def test_result_page_renders_every_type(page):
+    index = mbti_data.build_index()
+    at = AppTest.from_file(os.path.join(ROOT, page), default_timeout=60).run()
+    assert not at.exception
+    assert "MBTI를 선택하시면" in at.markdown[-1].value  # 선택 전 안내 화면
+
+    for mbti in mbti_types.TYPES:
+        at.selectbox[0].select(mbti).run()
+        assert not at.exception, mbti
+        html = "".join(m.value for m in at.markdown)
+        top = index.top_k(mbti, 5)
+        assert f">{mbti}</div>" in html  # 설명 카드
+        assert top["Country"].iloc[0] in html  # 1위 국가 통계
+        assert len(at.dataframe) == 1
+        assert at.dataframe[0].value[mbti].max() == pytest.approx(top[mbti].iloc[0])
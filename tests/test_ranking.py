@@ -0,0 +1,88 @@
+import numpy as np
+
+from conftest import COUNTRIES, TYPES, VALUES
+
+
+def test_table_sorted_descending(small_index):
+    for j, mbti in enumerate(TYPES):
+        table = small_index.table(mbti)
+        assert list(table.columns) == ["Country", mbti, "Percentage"]
+        assert table[mbti].is_monotonic_decreasing
+        assert sorted(table["Country"]) == sorted(COUNTRIES)
+        np.testing.assert_allclose(table["Percentage"], table[mbti] * 100, rtol=1e-6)
+
+
+def test_top_k_ties_keep_row_order(small_index):
+    # INTJ: France와 Brazil이 0.40으로 동률, Japan과 Norway가 0.25로 동률
+    top = small_index.top_k("INTJ", 4)
+    assert top["Country"].tolist() == ["France", "Brazil", "Japan", "Norway"]
+
+
+def test_top_k_matches_stable_sort(small_index):
+    import pandas as pd
+
+    frame = pd.DataFrame(np.array(VALUES, dtype=np.float32), columns=TYPES)
+    frame.insert(0, "Country", COUNTRIES)
+    for mbti in TYPES:
+        expected = frame.sort_values(mbti, ascending=False, kind="stable")["Country"].head(3).tolist()
+        assert small_index.top_k(mbti, 3)["Country"].tolist() == expected
+
+
+def test_top_k_larger_than_rows(small_index):
+    assert len(small_index.top_k("ENFP", 50)) == len(COUNTRIES)
+
+
+def test_mean(small_index):
+    assert abs(small_index.mean("INTP") - np.mean([row[1] for row in VALUES])) < 1e-6
+
+
+def test_top_k_many_matches_top_k(small_index):
+    many = small_index.top_k_many(["INTJ", "ENFP"], 3)
+    for mbti in ("INTJ", "ENFP"):
+        part = many[many["Type"] == mbti]
+        assert part["Country"].tolist() == small_index.top_k(mbti, 3)["Country"].tolist()
+        assert part["Rank"].tolist() == [1, 2, 3]
+        assert part["Mean"].iloc[0] == small_index.mean(mbti)
+
+
+def test_combined_top_k(small_index):
+    # INTJ + INTP: Brazil 0.60, Norway 0.55, 나머지 세 나라는 0.50
+    top = small_index.combined_top_k(["INTJ", "INTP"], 3)
+    assert top["Country"].tolist()[:2] == ["Brazil", "Norway"]
+    np.testing.assert_allclose(top["Ratio"], [0.60, 0.55, 0.50], atol=1e-6)
+    np.testing.assert_allclose(small_index.combined(["INTJ", "INTP"]), [0.50, 0.50, 0.60, 0.50, 0.55], atol=1e-6)
+
+
+def test_combined_top_k_ties_keep_row_order(small_index):
+    # ENTJ: Japan과 France가 0.25로 동률이면 행 순서대로 (top_k와 같은 순서)
+    top = small_index.combined_top_k(["ENTJ"], 5)
+    assert top["Country"].tolist() == ["Kenya", "Japan", "France", "Brazil", "Norway"]
+    assert top["Country"].tolist() == small_index.top_k("ENTJ", 5)["Country"].tolist()
+    assert len(small_index.combined_top_k(["INTJ"], 50)) == len(COUNTRIES)
+
+
+def test_ties_share_rank_and_percentile(small_index):
+    # INTJ: France와 Brazil이 0.40, Japan과 Norway가 0.25로 동률 (competition 순위: 1, 1, 3, 3, 5)
+    j = TYPES.index("INTJ")
+    rank = dict(zip(COUNTRIES, small_index.rank[:, j].tolist()))
+    percentile = dict(zip(COUNTRIES, small_index.percentile[:, j].tolist()))
+    assert rank == {"France": 1, "Brazil": 1, "Japan": 3, "Norway": 3, "Kenya": 5}
+    assert percentile == {"France": 75.0, "Brazil": 75.0, "Japan": 25.0, "Norway": 25.0, "Kenya": 0.0}
+
+
+def test_rank_and_percentile_match_pandas(small_index):
+    import pandas as pd
+
+    frame = pd.DataFrame(np.asarray(small_index.values, dtype=np.float64), columns=small_index.columns)
+    n = len(COUNTRIES)
+    expected_rank = frame.rank(method="min", ascending=False).to_numpy()
+    expected_percentile = (frame.rank(method="min").to_numpy() - 1) / (n - 1) * 100
+    np.testing.assert_array_equal(small_index.rank, expected_rank)
+    np.testing.assert_allclose(small_index.percentile, expected_percentile)
+
+
+def test_profile_percentile(small_index):
+    profile = small_index.profile("Japan")
+    assert profile["Type"].tolist() == TYPES
+    assert profile["Rank"].tolist() == [3, 3, 2, 3]
+    assert profile["Percentile"].tolist() == [25.0, 50.0, 50.0, 25.0]
@@ -0,0 +1,74 @@
+import numpy as np
+import pytest
+
+from similarity import METRICS, SimilarityIndex
+
+
+def brute_force(x: np.ndarray, metric: str) -> np.ndarray:
+    """행 쌍마다 직접 계산한 거리 행렬."""
+    n = len(x)
+    d = np.zeros((n, n))
+    for i in range(n):
+        for j in range(n):
+            p, q = x[i], x[j]
+            if metric == "euclidean":
+                d[i, j] = np.linalg.norm(p - q)
+            elif metric == "cosine":
+                d[i, j] = 1 - p @ q / (np.linalg.norm(p) * np.linalg.norm(q))
+            else:
+                p, q = p / p.sum(), q / q.sum()
+                m = (p + q) / 2
+
+                def kl(a, b):
+                    mask = a > 0
+                    return np.sum(a[mask] * np.log2(a[mask] / b[mask]))
+
+                d[i, j] = np.sqrt(max(0.0, (kl(p, m) + kl(q, m)) / 2))
+    return d
+
+
+@pytest.fixture
+def distributions():
+    rng = np.random.default_rng(7)
+    x = rng.dirichlet(np.ones(16), size=40)
+    x[3, :4] = 0  # 0 비율이 있는 행 (JS 거리의 0 * log 0)
+    return x / x.sum(axis=1, keepdims=True)
+
+
+@pytest.mark.parametrize("metric", METRICS)
+def test_pairwise_matches_brute_force(distributions, metric):
+    index = SimilarityIndex(distributions, metric)
+    np.testing.assert_allclose(index.pairwise(), brute_force(distributions, metric), atol=1e-6)
+
+
+@pytest.mark.parametrize("metric", METRICS)
+def test_neighbours_precomputed_and_on_the_fly_agree(distributions, metric):
+    table = SimilarityIndex(distributions, metric, neighbour_k=8)
+    scan = SimilarityIndex(distributions, metric, precompute_limit=0)
+    expected = brute_force(distributions, metric)
+    for i in range(len(distributions)):
+        rows, distance = table.neighbours(i, 5)
+        scan_rows, scan_distance = scan.neighbours(i, 5)
+        assert i not in rows
+        np.testing.assert_allclose(distance, np.sort(np.delete(expected[i], i))[:5], atol=1e-5)
+        np.testing.assert_allclose(distance, scan_distance, atol=1e-5)
+        assert table.precomputed() and not scan.precomputed()
+
+
+def test_neighbours_beyond_table_size(distributions):
+    index = SimilarityIndex(distributions, neighbour_k=4)
+    rows, distance = index.neighbours(0, 10)
+    assert len(rows) == 10 and np.all(np.diff(distance) >= 0)
+
+
+def test_small_and_invalid_inputs():
+    assert len(SimilarityIndex(np.ones((1, 16))).neighbours(0, 5)[0]) == 0
+    with pytest.raises(ValueError):
+        SimilarityIndex(np.ones((3, 16)), metric="manhattan")
+
+
+def test_similar_countries(small_index):
+    similar = small_index.similar("Japan", 2)
+    assert list(similar.columns) == ["Country", "ISO3", "Distance"]
+    assert "Japan" not in similar["Country"].tolist()
+    assert similar["Distance"].is_monotonic_increasing
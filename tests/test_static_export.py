@@ -0,0 +1,103 @@
+import json
+import os
+import shutil
+
+import pandas as pd
+import pytest
+
+import static_export
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+TYPES = ["INTJ", "ENFP"]
+
+
+@pytest.fixture
+def site(tmp_path, dataset_csv, monkeypatch):
+    """화면 코드(CODE_FILES)만 복사한 작업 폴더에서 내보냅니다. (템플릿을 바꿔 볼 수 있도록)"""
+    work = tmp_path / "work"
+    work.mkdir()
+    for name in static_export.CODE_FILES:
+        shutil.copy(os.path.join(ROOT, name), work / name)
+    monkeypatch.chdir(work)
+    out = str(tmp_path / "export")
+
+    def run(types=TYPES, **kwargs):
+        return static_export.export(out, types, workers=1, preview=False, data_path=dataset_csv,
+                                    bin_path=str(tmp_path / "none.bin"), **kwargs)
+
+    return out, run
+
+
+def snapshot(out: str) -> dict:
+    """출력 폴더의 파일별 수정 시각."""
+    return {
+        os.path.relpath(os.path.join(d, f), out): os.stat(os.path.join(d, f)).st_mtime_ns
+        for d, _, files in os.walk(out) for f in files
+    }
+
+
+def changed(before: dict, after: dict) -> set:
+    return {name for name in after if before.get(name) != after[name]}
+
+
+def test_second_run_skips_everything(site):
+    out, run = site
+    first = run()
+    assert first["exported"] == TYPES and first["skipped"] == []
+    assert {"INTJ/index.html", "ENFP/index.html", "index.html", "manifest.json",
+            f"assets/{static_export.PLOTLY_JS}"} <= set(snapshot(out))
+    with open(os.path.join(out, "manifest.json"), encoding="utf-8") as f:
+        assert set(json.load(f)["pages"]) == set(TYPES)
+
+    before = snapshot(out)
+    second = run()
+    assert second["exported"] == [] and second["skipped"] == TYPES
+    assert changed(before, snapshot(out)) == set()
+
+
+def test_missing_page_rebuilds_only_that_type(site):
+    out, run = site
+    run()
+    os.remove(os.path.join(out, "ENFP", "index.html"))
+    before = snapshot(out)
+    result = run()
+    assert result["exported"] == ["ENFP"] and result["skipped"] == ["INTJ"]
+    assert changed(before, snapshot(out)) == {"ENFP/index.html"}
+
+
+def test_csv_change_rebuilds_pages_not_assets(site, dataset_csv):
+    out, run = site
+    run()
+    frame = pd.read_csv(dataset_csv)
+    frame.loc[0, ["INTJ", "ENFP"]] += [0.01, -0.01]
+    frame.to_csv(dataset_csv, index=False)
+    before = snapshot(out)
+    result = run()
+    # 체크섬이 바뀌면 모든 유형을 다시 만들지만, 에셋과 (데이터 값이 없는) 목록 페이지는 그대로 둡니다.
+    assert result["exported"] == TYPES
+    assert changed(before, snapshot(out)) == {"INTJ/index.html", "ENFP/index.html", "manifest.json"}
+
+
+def test_template_change_rebuilds_pages(site):
+    out, run = site
+    run()
+    with open("result_views.py", "a", encoding="utf-8") as f:
+        f.write("\n# 템플릿 변경\n")
+    before = snapshot(out)
+    result = run()
+    assert result["exported"] == TYPES
+    # 만든 HTML이 같으면 다시 쓰지 않으므로 바뀌는 것은 입력 키를 담은 manifest뿐입니다.
+    assert changed(before, snapshot(out)) == {"manifest.json"}
+    assert all(not r["written"] for r in result["results"].values())
+
+    # 다음 실행은 새 키로 모두 건너뜁니다.
+    assert run()["skipped"] == TYPES
+
+
+def test_force_and_type_selection(site):
+    out, run = site
+    run(types=["INTJ"])
+    result = run(force=True)
+    assert result["exported"] == TYPES and result["skipped"] == []
+    with pytest.raises(ValueError):
+        run(types=["XXXX"])